@@ -0,0 +1,76 @@
+"""
+asyncio variant of the services used in the game loop.
+the calls run in a thread (the session of RESTClient is shared), so the
+event loop (playwright) is not blocked and independent calls can be
+awaited together with asyncio.gather
+"""
+
+# Standard Library
+import asyncio
+from typing import Optional
+
+# Internal
+from apps.api import services
+from apps.api.models import (
+    BetData,
+    CustomerLiveData,
+    Multiplier,
+    MultiplierPositions,
+    Prediction,
+)
+
+
+async def add_multipliers(
+    *, home_bet_game_id: int, multipliers_data: list[Multiplier]
+) -> dict[str, any]:
+    return await asyncio.to_thread(
+        services.add_multipliers,
+        home_bet_game_id=home_bet_game_id,
+        multipliers_data=multipliers_data,
+    )
+
+
+async def request_prediction(
+    *,
+    home_bet_game_id: int,
+    multipliers: list[float],
+    model_home_bet_id: Optional[int] = None,
+) -> list[Prediction]:
+    return await asyncio.to_thread(
+        services.request_prediction,
+        home_bet_game_id=home_bet_game_id,
+        multipliers=multipliers,
+        model_home_bet_id=model_home_bet_id,
+    )
+
+
+async def get_multiplier_positions(
+    *, home_bet_game_id: int
+) -> MultiplierPositions:
+    return await asyncio.to_thread(
+        services.get_multiplier_positions, home_bet_game_id=home_bet_game_id
+    )
+
+
+async def request_customer_live(
+    *,
+    home_bet_id: int,
+    balance: float,
+    currency: Optional[str] = None,
+    closing_session: Optional[bool] = False,
+) -> CustomerLiveData:
+    return await asyncio.to_thread(
+        services.request_customer_live,
+        home_bet_id=home_bet_id,
+        balance=balance,
+        currency=currency,
+        closing_session=closing_session,
+    )
+
+
+async def create_bets(
+    *, home_bet_id: int, bets: list[BetData]
+) -> list[BetData]:
+    return await asyncio.to_thread(
+        services.create_bets, home_bet_id=home_bet_id, bets=bets
+    )
@@ -45,9 +45,12 @@ class BotAPIConnector(metaclass=Singleton):
     def update_token(self):
         token = local_storage.get_token()
         self.client.headers["Authorization"] = f"Token {token}"
+        # the responses of other user are not valid
+        self.client.clear_etags()
 
     def remove_token(self):
         self.client.headers.pop("Authorization", None)
+        self.client.clear_etags()
 
 
 class BotAPIServices:
@@ -195,9 +198,7 @@ class BotAPIServices:
             service = self.GET_BOTS
             if bot_type is not None:
                 service = f"{service}?bot_type={bot_type}"
-            response = self.client.get(
-                service=service,
-            )
+            response = self.client.get(service=service, use_etag=True)
         except Exception as exc:
             logger.exception(f"BotAPIServices :: get_bots :: {exc}")
             raise BotAPIConnectionException(exc)
@@ -209,9 +210,7 @@ class BotAPIServices:
     ) -> Dict[str, Any]:
         service = f"{self.GET_POSITIONS}?home_bet_game_id={home_bet_game_id}"
         try:
-            response = self.client.get(
-                service=service,
-            )
+            response = self.client.get(service=service, use_etag=True)
         except Exception as exc:
             logger.exception(f"BotAPIServices :: get_positions :: {exc}")
             raise BotAPIConnectionException(exc)
@@ -221,7 +220,8 @@ class BotAPIServices:
     def get_me_data(self, *, app_hash_str: str) -> Dict[str, Any]:
         try:
             response = self.client.get(
-                service=f"{self.CUSTOMER_DATA}?app_hash_str={app_hash_str}"
+                service=f"{self.CUSTOMER_DATA}?app_hash_str={app_hash_str}",
+                use_etag=True,
             )
         except Exception as exc:
             logger.exception(f"BotAPIServices :: get_me_data :: {exc}")
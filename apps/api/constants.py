@@ -0,0 +1,7 @@
+# Standard Library
+from enum import Enum
+
+
+class PersistenceKind(str, Enum):
+    BETS = "bets"
+    MULTIPLIERS = "multipliers"
@@ -0,0 +1,418 @@
+"""
+background persistence of the bets and multipliers in the backend,
+the game loop only adds the records to a queue
+"""
+
+# Standard Library
+import json
+import logging
+import queue
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Callable, Iterable, Optional
+
+# Internal
+from apps.api import services as api_services
+from apps.api.constants import PersistenceKind
+from apps.api.exceptions import (
+    BotAPIBadRequestException,
+    BotAPINotFoundException,
+)
+from apps.api.models import BetData, Multiplier
+from apps.utils.sqlite_engine import SQLiteEngine
+
+logger = logging.getLogger(__name__)
+
+# (kind, target id: home_bet_id or home_bet_game_id, record)
+PersistenceRecord = tuple[PersistenceKind, int, BetData | Multiplier]
+# errors of the backend caused by the records (4xx), sending them again
+# fails too (the connection errors and 5xx are retried)
+REJECTED_ERRORS = (BotAPIBadRequestException, BotAPINotFoundException)
+
+
+class PersistenceJournal(SQLiteEngine):
+    """
+    records not saved in the backend (backend unreachable or full queue),
+    they are sent again when the backend is reachable. The records
+    rejected by the backend are moved to the Quarantine table
+    """
+
+    DATABASE = "data/persistence.db"
+
+    def __init__(self, database: Optional[str] = DATABASE):
+        super().__init__(database, check_same_thread=False)
+        self._lock = Lock()
+        self.execute("PRAGMA journal_mode=WAL")
+        self.execute("""CREATE TABLE IF NOT EXISTS Journal(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT,
+                target_id INTEGER,
+                data TEXT)""")
+        self.execute("""CREATE TABLE IF NOT EXISTS Quarantine(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT,
+                target_id INTEGER,
+                data TEXT,
+                error TEXT)""")
+        self.commit()
+
+    @staticmethod
+    def serialize(record: BetData | Multiplier) -> str:
+        if isinstance(record, Multiplier):
+            return json.dumps(record.__dict__())
+        return json.dumps(vars(record))
+
+    @classmethod
+    def deserialize(
+        cls, kind: PersistenceKind, data: str
+    ) -> BetData | Multiplier:
+        data = json.loads(data)
+        if kind == PersistenceKind.MULTIPLIERS:
+            return Multiplier(
+                multiplier=data["multiplier"],
+                multiplier_dt=datetime.strptime(
+                    data["multiplier_dt"], cls.TIMESTAMP_FORMAT
+                ),
+            )
+        return BetData(**data)
+
+    def add(self, records: Iterable[PersistenceRecord]):
+        values = [
+            (kind.value, target_id, self.serialize(record))
+            for kind, target_id, record in records
+        ]
+        with self._lock:
+            self.executemany(
+                "INSERT INTO Journal (kind, target_id, data) "
+                "VALUES (?, ?, ?)",
+                values,
+            )
+            self.commit()
+
+    def reject(self, records: Iterable[PersistenceRecord], error: str):
+        """
+        save the records rejected by the backend in the quarantine
+        """
+        values = [
+            (kind.value, target_id, self.serialize(record), error)
+            for kind, target_id, record in records
+        ]
+        with self._lock:
+            self.executemany(
+                "INSERT INTO Quarantine (kind, target_id, data, error) "
+                "VALUES (?, ?, ?, ?)",
+                values,
+            )
+            self.commit()
+
+    def quarantine(self, ids: list[int], error: str):
+        """
+        move the records of the journal rejected by the backend
+        """
+        with self._lock:
+            self.executemany(
+                "INSERT INTO Quarantine (kind, target_id, data, error) "
+                "SELECT kind, target_id, data, ? FROM Journal WHERE id = ?",
+                [(error, id_) for id_ in ids],
+            )
+            self.executemany(
+                "DELETE FROM Journal WHERE id = ?", [(id_,) for id_ in ids]
+            )
+            self.commit()
+
+    def read(self, limit: int) -> list[tuple[int, PersistenceRecord]]:
+        """
+        :return: oldest records: (id, record)
+        """
+        with self._lock:
+            self.execute(
+                "SELECT id, kind, target_id, data FROM Journal "
+                "ORDER BY id LIMIT ?",
+                (limit,),
+            )
+            rows = self.fetchall()
+        records = []
+        for id_, kind, target_id, data in rows:
+            kind = PersistenceKind(kind)
+            records.append(
+                (id_, (kind, target_id, self.deserialize(kind, data)))
+            )
+        return records
+
+    def delete(self, ids: list[int]):
+        with self._lock:
+            self.executemany(
+                "DELETE FROM Journal WHERE id = ?", [(id_,) for id_ in ids]
+            )
+            self.commit()
+
+    def count(self, table: Optional[str] = "Journal") -> int:
+        with self._lock:
+            self.execute(f"SELECT COUNT(*) FROM {table}")
+            return self.fetchone()[0]
+
+
+class PersistenceWorker(Thread):
+    """
+    Saves the bets and multipliers in the backend in a background thread.
+    The records are grouped (create_bets / add_multipliers by home bet),
+    a failed call is retried with backoff and then the records are saved
+    in the journal, the journal is sent again when the backend answers.
+    The records rejected by the backend (4xx) go to the quarantine.
+    """
+
+    MAX_QUEUE_SIZE = 1000
+    BATCH_SIZE = 100
+    # seconds to wait more records to send with the batch
+    FLUSH_INTERVAL = 0.5
+    RETRIES = 3
+    # the retry n waits BACKOFF_FACTOR * 2 ** (n - 1)
+    BACKOFF_FACTOR = 0.5
+    # seconds between the attempts to send the journal
+    REPLAY_INTERVAL = 30
+    # seconds to wait the worker in close (the last records are sent)
+    CLOSE_TIMEOUT = 10
+    # seconds to wait a place for the stop in a full queue
+    STOP_TIMEOUT = 1
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        *,
+        journal: Optional[PersistenceJournal] = None,
+        create_bets: Callable = api_services.create_bets,
+        add_multipliers: Callable = api_services.add_multipliers,
+    ):
+        super().__init__(name="persistence-worker", daemon=True)
+        self.journal = journal or PersistenceJournal()
+        self._senders = {
+            PersistenceKind.BETS: lambda target_id, records: create_bets(
+                home_bet_id=target_id, bets=records
+            ),
+            PersistenceKind.MULTIPLIERS: (
+                lambda target_id, records: add_multipliers(
+                    home_bet_game_id=target_id, multipliers_data=records
+                )
+            ),
+        }
+        self._queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        # callbacks of the saves by id of their last record: (record, cb)
+        self._on_saved: dict[int, tuple[object, Callable]] = {}
+        # callbacks of the records in the journal, called when it is sent
+        self._on_replayed: list[Callable] = []
+        self._on_saved_lock = Lock()
+        self._stopping = Event()
+        self._next_replay = 0
+
+    def save_bets(self, *, home_bet_id: int, bets: list[BetData]):
+        self._put([(PersistenceKind.BETS, home_bet_id, bet) for bet in bets])
+
+    def save_multipliers(
+        self,
+        *,
+        home_bet_game_id: int,
+        multipliers: list[Multiplier],
+        on_saved: Optional[Callable[[], None]] = None,
+    ):
+        """
+        :param on_saved: called (worker thread) when the multipliers are
+            saved in the backend
+        """
+        if on_saved and multipliers:
+            with self._on_saved_lock:
+                self._on_saved[id(multipliers[-1])] = (
+                    multipliers[-1],
+                    on_saved,
+                )
+        self._put(
+            [
+                (PersistenceKind.MULTIPLIERS, home_bet_game_id, multiplier)
+                for multiplier in multipliers
+            ]
+        )
+
+    def _put(self, records: list[PersistenceRecord]):
+        """
+        never blocks, with the queue full the records go to the journal
+        """
+        for index, record in enumerate(records):
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                logger.warning("persistence queue full, using the journal")
+                self._add_to_journal(records[index:])
+                return
+
+    def close(self, timeout: Optional[float] = CLOSE_TIMEOUT):
+        """
+        send the records in the queue (without retries), the records
+        not sent are saved in the journal
+        """
+        self._stopping.set()
+        try:
+            self._queue.put(self._STOP, timeout=self.STOP_TIMEOUT)
+        except queue.Full:
+            # the worker stops when the queue is empty (_stopping)
+            pass
+        if self.is_alive():
+            self.join(timeout)
+        if self.is_alive():
+            logger.warning("PersistenceWorker :: close :: timeout")
+
+    def _send(self, kind: PersistenceKind, target_id: int, records: list):
+        self._senders[kind](target_id, records)
+
+    def _pop_callbacks(self, records: Iterable) -> list[Callable]:
+        with self._on_saved_lock:
+            return [
+                self._on_saved.pop(id(record))[1]
+                for record in records
+                if id(record) in self._on_saved
+            ]
+
+    @staticmethod
+    def _call(callbacks: list[Callable]):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:
+                logger.warning(f"PersistenceWorker :: on_saved :: {exc}")
+
+    def _add_to_journal(self, records: list[PersistenceRecord]):
+        callbacks = self._pop_callbacks(record for *_, record in records)
+        self.journal.add(records)
+        with self._on_saved_lock:
+            self._on_replayed.extend(callbacks)
+
+    def _send_with_retries(
+        self, kind: PersistenceKind, target_id: int, records: list
+    ) -> bool:
+        retries = 0 if self._stopping.is_set() else self.RETRIES
+        for attempt in range(retries + 1):
+            if attempt:
+                delay = self.BACKOFF_FACTOR * 2 ** (attempt - 1)
+                if self._stopping.wait(delay):
+                    break
+            try:
+                self._send(kind, target_id, records)
+                return True
+            except REJECTED_ERRORS:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    f"PersistenceWorker :: {kind.value} :: "
+                    f"attempt {attempt + 1} :: {exc}"
+                )
+        return False
+
+    @staticmethod
+    def _group(
+        records: Iterable[PersistenceRecord],
+    ) -> dict[tuple[PersistenceKind, int], list]:
+        groups = {}
+        for kind, target_id, record in records:
+            groups.setdefault((kind, target_id), []).append(record)
+        return groups
+
+    def _write(self, records: list[PersistenceRecord]):
+        backend_available = True
+        for (kind, target_id), group in self._group(records).items():
+            try:
+                if backend_available and self._send_with_retries(
+                    kind, target_id, group
+                ):
+                    self._call(self._pop_callbacks(group))
+                    continue
+            except REJECTED_ERRORS as exc:
+                # the records are not saved
+                self._pop_callbacks(group)
+                self._log_rejected(kind, len(group), exc)
+                self.journal.reject(
+                    ((kind, target_id, record) for record in group), str(exc)
+                )
+                continue
+            # the next groups go to the journal without waiting
+            backend_available = False
+            self._add_to_journal(
+                [(kind, target_id, record) for record in group]
+            )
+        if backend_available:
+            self.replay(force=True)
+
+    @staticmethod
+    def _log_rejected(kind: PersistenceKind, count: int, exc: Exception):
+        logger.warning(
+            f"PersistenceWorker :: {kind.value} :: {count} records "
+            f"rejected, moved to the quarantine :: {exc}"
+        )
+
+    def replay(self, force: Optional[bool] = False):
+        """
+        send the records of the journal (the oldest first)
+        :param force: ignore REPLAY_INTERVAL
+        """
+        if not force and time.monotonic() < self._next_replay:
+            return
+        self._next_replay = time.monotonic() + self.REPLAY_INTERVAL
+        while True:
+            rows = self.journal.read(self.BATCH_SIZE)
+            if not rows:
+                # the records of the callbacks were sent (or rejected)
+                with self._on_saved_lock:
+                    callbacks, self._on_replayed = self._on_replayed, []
+                self._call(callbacks)
+                return
+            ids_by_group = {}
+            for id_, (kind, target_id, _) in rows:
+                ids_by_group.setdefault((kind, target_id), []).append(id_)
+            groups = self._group(record for _, record in rows)
+            for key, group in groups.items():
+                try:
+                    self._send(*key, group)
+                except REJECTED_ERRORS as exc:
+                    # the next groups are sent, it doesn't block the journal
+                    self._log_rejected(key[0], len(group), exc)
+                    self.journal.quarantine(ids_by_group[key], str(exc))
+                    continue
+                except Exception as exc:
+                    logger.warning(f"PersistenceWorker :: replay :: {exc}")
+                    return
+                self.journal.delete(ids_by_group[key])
+
+    def run(self):
+        self.replay()
+        stop = False
+        while not stop:
+            try:
+                if self._stopping.is_set():
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=self.REPLAY_INTERVAL)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    # close couldn't put the stop (full queue)
+                    break
+                self.replay()
+                continue
+            records = []
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while True:
+                if item is self._STOP:
+                    stop = True
+                    break
+                records.append(item)
+                timeout = deadline - time.monotonic()
+                if len(records) >= self.BATCH_SIZE:
+                    break
+                try:
+                    if stop or self._stopping.is_set():
+                        item = self._queue.get_nowait()
+                    else:
+                        item = self._queue.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+            if records:
+                self._write(records)
+        self.journal.close()
@@ -16,9 +16,29 @@ from apps.api.models import (
     Positions,
     Prediction,
 )
+from apps.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# seconds that the responses are fresh, the stale responses are returned
+# while they are requested again in background
+MULTIPLIER_POSITIONS_TTL = 60
+BOTS_TTL = 300
+CUSTOMER_DATA_TTL = 300
+
+_multiplier_positions_cache = TTLCache(ttl=MULTIPLIER_POSITIONS_TTL)
+_bots_cache = TTLCache(ttl=BOTS_TTL)
+_customer_data_cache = TTLCache(ttl=CUSTOMER_DATA_TTL)
+
+
+def clear_cache() -> None:
+    for cache in (
+        _multiplier_positions_cache,
+        _bots_cache,
+        _customer_data_cache,
+    ):
+        cache.clear()
+
 
 def update_token() -> None:
     """
@@ -27,6 +47,7 @@ def update_token() -> None:
     """
     bot_connector = BotAPIConnector()
     bot_connector.update_token()
+    clear_cache()
 
 
 def request_login(*, username: str, password: str) -> str | None:
@@ -39,6 +60,7 @@ def request_login(*, username: str, password: str) -> str | None:
     bot_connector = BotAPIConnector()
     try:
         bot_connector.remove_token()
+        clear_cache()
         response = bot_connector.services.login(
             username=username, password=password
         )
@@ -59,6 +81,7 @@ def request_token_verify() -> bool:
     bot_connector = BotAPIConnector()
     try:
         bot_connector.update_token()
+        clear_cache()
         is_valid = bot_connector.services.request_verify_token()
         return is_valid
     except BotAPINoAuthorizationException:
@@ -111,12 +134,7 @@ def request_prediction(
     return data
 
 
-def get_bots(*, bot_type: Optional[str] = None) -> list[Bot]:
-    """
-    get_bot
-    :param bot_type:
-    :return:
-    """
+def _request_bots(bot_type: Optional[str]) -> list[Bot]:
     bot_connector = BotAPIConnector()
     response = bot_connector.services.get_bots(bot_type=bot_type)
     bots = response.get("bots")
@@ -124,7 +142,18 @@ def get_bots(*, bot_type: Optional[str] = None) -> list[Bot]:
     return data
 
 
-def get_multiplier_positions(*, home_bet_game_id: int) -> MultiplierPositions:
+def get_bots(*, bot_type: Optional[str] = None) -> list[Bot]:
+    """
+    get_bot (cached BOTS_TTL seconds)
+    :param bot_type:
+    :return:
+    """
+    return _bots_cache.get(bot_type, lambda: _request_bots(bot_type))
+
+
+def _request_multiplier_positions(
+    home_bet_game_id: int,
+) -> MultiplierPositions:
     bot_connector = BotAPIConnector()
     response = bot_connector.services.get_multiplier_positions(
         home_bet_game_id=home_bet_game_id
@@ -144,7 +173,45 @@ def get_multiplier_positions(*, home_bet_game_id: int) -> MultiplierPositions:
     return positions
 
 
-def get_customer_data(*, app_hash_str: str) -> CustomerData:
+def get_multiplier_positions(*, home_bet_game_id: int) -> MultiplierPositions:
+    """
+    get_multiplier_positions (cached MULTIPLIER_POSITIONS_TTL seconds)
+    :param home_bet_game_id:
+    :return:
+    """
+    return _multiplier_positions_cache.get(
+        home_bet_game_id,
+        lambda: _request_multiplier_positions(home_bet_game_id),
+    )
+
+
+def get_last_multiplier_positions(
+    *, home_bet_game_id: int
+) -> Optional[MultiplierPositions]:
+    """
+    last multiplier positions received, without waiting the backend
+    (they are requested in background when they are stale)
+    :param home_bet_game_id:
+    :return: None if they were never received
+    """
+    return _multiplier_positions_cache.peek(
+        home_bet_game_id,
+        lambda: _request_multiplier_positions(home_bet_game_id),
+    )
+
+
+def refresh_multiplier_positions(*, home_bet_game_id: int) -> None:
+    """
+    request the multiplier positions in background
+    :param home_bet_game_id:
+    """
+    _multiplier_positions_cache.refresh(
+        home_bet_game_id,
+        lambda: _request_multiplier_positions(home_bet_game_id),
+    )
+
+
+def _request_customer_data(app_hash_str: str) -> CustomerData:
     bot_connector = BotAPIConnector()
     data = bot_connector.services.get_me_data(app_hash_str=app_hash_str)
     customer_data = CustomerData(
@@ -154,6 +221,17 @@ def get_customer_data(*, app_hash_str: str) -> CustomerData:
     return customer_data
 
 
+def get_customer_data(*, app_hash_str: str) -> CustomerData:
+    """
+    get_customer_data (cached CUSTOMER_DATA_TTL seconds)
+    :param app_hash_str:
+    :return:
+    """
+    return _customer_data_cache.get(
+        app_hash_str, lambda: _request_customer_data(app_hash_str)
+    )
+
+
 def request_customer_live(
     *,
     home_bet_id: int,
@@ -25,6 +25,15 @@ class Config(metaclass=Singleton):
         MULTIPLIERS_TO_SHOW_LAST_POSITION = "MULTIPLIERS_TO_SHOW_LAST_POSITION"
         LANGUAGE = "LANGUAGE"
         IGNORE_DB_LOGS = "IGNORE_DB_LOGS"
+        LOG_CALLER_PATH = "LOG_CALLER_PATH"
+        LOCAL_PREDICTOR = "LOCAL_PREDICTOR"
+        HUMAN_TYPING = "HUMAN_TYPING"
+        BROWSER_HEADLESS = "BROWSER_HEADLESS"
+        BROWSER_BLOCK_RESOURCES = "BROWSER_BLOCK_RESOURCES"
+        BROWSER_BLOCK_DOMAINS = "BROWSER_BLOCK_DOMAINS"
+        BROWSER_DISABLE_GPU = "BROWSER_DISABLE_GPU"
+        BROWSER_DISABLE_ANIMATIONS = "BROWSER_DISABLE_ANIMATIONS"
+        BROWSER_USER_DATA_DIR = "BROWSER_USER_DATA_DIR"
         WS_SERVER_HOST = "WS_SERVER_HOST"
         WS_SERVER_PORT = "WS_SERVER_PORT"
 
@@ -53,6 +62,21 @@ class Config(metaclass=Singleton):
         self.MULTIPLIERS_TO_SHOW_LAST_POSITION = [10, 15, 20, 50, 100]
         self.LANGUAGE = "en"
         self.IGNORE_DB_LOGS = True
+        # save the function and line that sends every log
+        self.LOG_CALLER_PATH = True
+        # predictor used when the backend doesn't respond (empty: none)
+        self.LOCAL_PREDICTOR = ""
+        # type the amount and the multiplier of the bets key by key
+        self.HUMAN_TYPING = True
+        # launch profile of the browser of the game
+        self.BROWSER_HEADLESS = False
+        # resource types and domains of the requests aborted
+        self.BROWSER_BLOCK_RESOURCES = []
+        self.BROWSER_BLOCK_DOMAINS = []
+        self.BROWSER_DISABLE_GPU = False
+        self.BROWSER_DISABLE_ANIMATIONS = False
+        # folder to keep the cookies of the login (empty: no persistent)
+        self.BROWSER_USER_DATA_DIR = ""
         self._ALLOWED_LANGUAGES = ["en", "es"]
         self.WS_SERVER_HOST = "localhost"
         self.WS_SERVER_PORT = 5000
@@ -107,6 +131,28 @@ class Config(metaclass=Singleton):
                             self.LANGUAGE = self._ALLOWED_LANGUAGES[0]
                     case self.ConfigVar.IGNORE_DB_LOGS:
                         self.IGNORE_DB_LOGS = bool(int(value))
+                    case self.ConfigVar.LOG_CALLER_PATH:
+                        self.LOG_CALLER_PATH = bool(int(value))
+                    case self.ConfigVar.LOCAL_PREDICTOR:
+                        self.LOCAL_PREDICTOR = value
+                    case self.ConfigVar.HUMAN_TYPING:
+                        self.HUMAN_TYPING = bool(int(value))
+                    case self.ConfigVar.BROWSER_HEADLESS:
+                        self.BROWSER_HEADLESS = bool(int(value))
+                    case self.ConfigVar.BROWSER_BLOCK_RESOURCES:
+                        self.BROWSER_BLOCK_RESOURCES = [
+                            i for i in value.split(",") if i
+                        ]
+                    case self.ConfigVar.BROWSER_BLOCK_DOMAINS:
+                        self.BROWSER_BLOCK_DOMAINS = [
+                            i for i in value.split(",") if i
+                        ]
+                    case self.ConfigVar.BROWSER_DISABLE_GPU:
+                        self.BROWSER_DISABLE_GPU = bool(int(value))
+                    case self.ConfigVar.BROWSER_DISABLE_ANIMATIONS:
+                        self.BROWSER_DISABLE_ANIMATIONS = bool(int(value))
+                    case self.ConfigVar.BROWSER_USER_DATA_DIR:
+                        self.BROWSER_USER_DATA_DIR = value
                     case self.ConfigVar.WS_SERVER_HOST:
                         self.WS_SERVER_HOST = value
                     case self.ConfigVar.WS_SERVER_PORT:
@@ -10,6 +10,7 @@ class WSEvent(str, Enum):
     CHANGE_BOT = "changeBot"
     CLOSE_GAME = "closeGame"
     SET_MAX_AMOUNT_TO_BET = "setMaxAmountToBet"
+    LATENCIES = "latencies"
     # events from server
     LOG = "log"
     ADD_MULTIPLIERS = "add_multipliers"
@@ -0,0 +1,32 @@
+# Internal
+from apps.constants import BullishGameValues
+from apps.game.bots.bot_ai import BotAI
+from apps.game.bots.bot_strategy import BotStrategy
+
+
+class ReplayBotMixin:
+    """
+    The bots read the bullish game configuration from GlobalVars.config,
+    in the backtesting the values are set by the engine
+    (the config is not loaded in the worker processes)
+    """
+
+    REPLAY_MIN_VALUE_TO_BULLISH_GAME: float = BullishGameValues.LOW.get_value()
+    REPLAY_LEN_WINDOW_TO_BULLISH_GAME: int = 6
+
+    @property
+    def min_value_to_bullish_game(self) -> float:
+        return self.REPLAY_MIN_VALUE_TO_BULLISH_GAME
+
+    @property
+    def len_window_to_bullish_game(self) -> int:
+        # this value need to be negative
+        return abs(self.REPLAY_LEN_WINDOW_TO_BULLISH_GAME) * -1
+
+
+class ReplayBotStrategy(ReplayBotMixin, BotStrategy):
+    pass
+
+
+class ReplayBotAI(ReplayBotMixin, BotAI):
+    pass
@@ -0,0 +1,16 @@
+# Standard Library
+from enum import Enum
+
+
+class BacktestLimit(str, Enum):
+    STOP_LOSS = "stop_loss"
+    TAKE_PROFIT = "take_profit"
+    # the balance is less than the minimum bet
+    BANKRUPTCY = "bankruptcy"
+
+
+class SeriesMethod(str, Enum):
+    # resample blocks of the recorded history
+    BOOTSTRAP = "bootstrap"
+    # sample from the distribution fitted to the history
+    DISTRIBUTION = "distribution"
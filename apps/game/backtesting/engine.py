@@ -0,0 +1,256 @@
+# Standard Library
+import builtins
+import gettext
+from typing import Callable, Optional, Sequence
+
+# Internal
+from apps.api.models import Bot, MultiplierPositions, Prediction
+from apps.game.backtesting.bots import ReplayBotAI, ReplayBotStrategy
+from apps.game.backtesting.constants import BacktestLimit
+from apps.game.backtesting.models import BacktestResult
+from apps.game.bots.bot_base import BotBase
+from apps.game.games.constants import GameType
+from apps.game.models import Bet
+from apps.game.prediction_core import PredictionModel
+from apps.globals import GlobalVars
+from apps.gui.gui_events import disable_gui_events
+
+# receives the multipliers of the game and returns the predictions
+# of the models (the same data returned by api_services.request_prediction)
+PredictionProvider = Callable[[list[float]], list[Prediction]]
+
+
+class BacktestEngine:
+    """
+    Replay a multiplier history through the bots without browser,
+    socket or backend.
+    Every round does the same steps as GameBase.play:
+    - settle the bets of the last round and update the balance
+    - bot.evaluate_bets (conditions)
+    - bot.add_multiplier
+    - bot.get_next_bet
+    the events sent to the GUI are discarded.
+    """
+
+    REPLAY_BOTS = {
+        GameType.STRATEGY: ReplayBotStrategy,
+        GameType.AI: ReplayBotAI,
+    }
+
+    def __init__(
+        self,
+        *,
+        bot: Bot,
+        balance: float,
+        bet_amount: float,
+        minimum_bet: float,
+        maximum_bet: float,
+        game_type: Optional[GameType] = GameType.STRATEGY,
+        amount_multiple: Optional[float] = None,
+        multiplier_positions: Optional[MultiplierPositions] = None,
+        prediction_provider: Optional[PredictionProvider] = None,
+        min_value_to_bullish_game: Optional[float] = None,
+        len_window_to_bullish_game: Optional[int] = None,
+        stop_on_limits: Optional[bool] = True,
+        keep_balances: Optional[bool] = True,
+    ):
+        """
+        :param bot: bot configuration to replay
+        :param balance: initial balance
+        :param bet_amount: amount selected by the user
+            (the same as set_max_amount_to_bet)
+        :param minimum_bet: minimum bet allowed in the home bet
+        :param maximum_bet: maximum bet allowed in the home bet
+        :param game_type: GameType.STRATEGY or GameType.AI
+        :param amount_multiple: amount multiple of the home bet
+        :param multiplier_positions: positions used to predict
+            the second multiplier
+        :param prediction_provider: predictions for GameType.AI,
+            without provider the AI bot doesn't bet
+        :param min_value_to_bullish_game: default GlobalVars.config
+        :param len_window_to_bullish_game: default GlobalVars.config
+        :param stop_on_limits: stop the replay when stop loss,
+            take profit or bankruptcy is reached
+        :param keep_balances: save the balance of every round
+        """
+        self.bot_data = bot
+        self.balance = balance
+        self.bet_amount = bet_amount
+        self.minimum_bet = minimum_bet
+        self.maximum_bet = maximum_bet
+        self.game_type = GameType(game_type)
+        self.amount_multiple = amount_multiple
+        self.multiplier_positions = multiplier_positions
+        self.prediction_provider = prediction_provider
+        self.min_value_to_bullish_game = self._get_config_value(
+            min_value_to_bullish_game,
+            "MIN_VALUE_TO_BULLISH_GAME",
+            ReplayBotStrategy.REPLAY_MIN_VALUE_TO_BULLISH_GAME,
+        )
+        self.len_window_to_bullish_game = self._get_config_value(
+            len_window_to_bullish_game,
+            "LEN_WINDOW_TO_BULLISH_GAME",
+            ReplayBotStrategy.REPLAY_LEN_WINDOW_TO_BULLISH_GAME,
+        )
+        self.stop_on_limits = stop_on_limits
+        self.keep_balances = keep_balances
+
+    @staticmethod
+    def _get_config_value(value: any, name: str, default: any) -> any:
+        if value is not None:
+            return value
+        config = getattr(GlobalVars, "config", None)
+        return getattr(config, name, default)
+
+    @staticmethod
+    def install_translation():
+        # the bots use the gettext function "_" installed by crashbot.py
+        if not hasattr(builtins, "_"):
+            gettext.NullTranslations().install()
+
+    @staticmethod
+    def settle_bets(bets: list[Bet], multiplier: float) -> float:
+        """
+        Profit of the bets with the multiplier result
+        (the same as Bet.evaluate without change the bet)
+        :param bets: bets placed in the round
+        :param multiplier: multiplier result
+        :return: profit of the round
+        """
+        profit = 0
+        for bet in bets:
+            if multiplier > bet.multiplier:
+                profit += bet.amount * (bet.multiplier - 1)
+            else:
+                profit -= bet.amount
+        return profit
+
+    def _create_bot(self, history: list[float]) -> BotBase:
+        bot_class = self.REPLAY_BOTS[self.game_type]
+        bot = bot_class(
+            bot_name=self.bot_data.name,
+            minimum_bet=self.minimum_bet,
+            maximum_bet=self.maximum_bet,
+            amount_multiple=self.amount_multiple,
+        )
+        bot.REPLAY_MIN_VALUE_TO_BULLISH_GAME = self.min_value_to_bullish_game
+        bot.REPLAY_LEN_WINDOW_TO_BULLISH_GAME = self.len_window_to_bullish_game
+        bot.initialize(
+            balance=self.balance, multipliers=history, bot=self.bot_data
+        )
+        bot.set_max_amount_to_bet(amount=self.bet_amount, user_change=True)
+        return bot
+
+    def _get_next_bet(
+        self, bot: BotBase, prediction_model: PredictionModel
+    ) -> list[Bet]:
+        if self.game_type == GameType.AI:
+            # the same flow of GameAI.get_next_bet
+            prediction_model.evaluate_models(bot.MIN_AVERAGE_MODEL_PREDICTION)
+            if not self.prediction_provider:
+                return []
+            predictions = self.prediction_provider(bot.multipliers.tolist())
+            if not predictions:
+                return []
+            prediction_model.add_predictions(predictions)
+            prediction = prediction_model.get_best_prediction()
+            if prediction is None:
+                return []
+            return bot.get_next_bet(
+                prediction=prediction,
+                multiplier_positions=self.multiplier_positions,
+                auto_play=True,
+            )
+        # the same flow of GameStrategy.get_next_bet
+        if bot.ONLY_BULLISH_GAMES and not bot.is_bullish_game:
+            return []
+        return bot.get_next_bet(
+            multiplier_positions=self.multiplier_positions,
+            auto_play=True,
+        )
+
+    def _check_limits(self, bot: BotBase) -> Optional[BacktestLimit]:
+        if bot.balance < self.minimum_bet or bot.balance <= 0:
+            return BacktestLimit.BANKRUPTCY
+        if bot.stop_loss and bot.in_stop_loss():
+            return BacktestLimit.STOP_LOSS
+        if bot.take_profit and bot.in_take_profit():
+            return BacktestLimit.TAKE_PROFIT
+        return None
+
+    def run(
+        self,
+        multipliers: Sequence[float],
+        *,
+        history: Optional[Sequence[float]] = None,
+    ) -> BacktestResult:
+        """
+        Replay the multipliers
+        :param multipliers: multipliers to replay (one per round)
+        :param history: multipliers shown in the game before
+            the first round (used to initialize the bot)
+        :return: BacktestResult
+        """
+        self.install_translation()
+        with disable_gui_events():
+            return self._run(multipliers, list(history or []))
+
+    def _run(
+        self, multipliers: Sequence[float], history: list[float]
+    ) -> BacktestResult:
+        bot = self._create_bot(history)
+        prediction_model = PredictionModel()
+        balance = self.balance
+        peak_balance = balance
+        max_drawdown = 0
+        bets_placed = 0
+        bets_won = 0
+        balances = []
+        limit_reached = None
+        limit_round = None
+        bets: list[Bet] = []
+        rounds = 0
+        for multiplier in multipliers:
+            rounds += 1
+            # the result of the bets placed in the last round
+            balance = round(balance + self.settle_bets(bets, multiplier), 2)
+            bets_placed += len(bets)
+            bets_won += sum(1 for bet in bets if multiplier > bet.multiplier)
+            bot.update_balance(balance)
+            if self.game_type == GameType.AI:
+                prediction_model.add_multiplier_result(multiplier)
+            bot.evaluate_bets(multiplier)
+            bot.add_multiplier(multiplier)
+            peak_balance = max(peak_balance, balance)
+            max_drawdown = max(max_drawdown, peak_balance - balance)
+            if self.keep_balances:
+                balances.append(balance)
+            limit = self._check_limits(bot)
+            if limit and limit_reached is None:
+                limit_reached = limit.value
+                limit_round = rounds
+            if limit and self.stop_on_limits:
+                bets = []
+                break
+            bets = self._get_next_bet(bot, prediction_model)
+            # the bets that exceed the balance are rejected by the game
+            available = balance
+            placed_bets = []
+            for bet in bets:
+                if 0 < bet.amount <= available:
+                    available -= bet.amount
+                    placed_bets.append(bet)
+            bets = placed_bets
+            bot.bets = bets
+        return BacktestResult(
+            bot_name=self.bot_data.name,
+            rounds=rounds,
+            initial_balance=self.balance,
+            final_balance=balance,
+            max_drawdown=round(max_drawdown, 2),
+            bets_placed=bets_placed,
+            bets_won=bets_won,
+            balances=balances,
+            limit_reached=limit_reached,
+            limit_round=limit_round,
+        )
@@ -0,0 +1,142 @@
+"""
+vectorized simulation of single bet strategies
+(a fixed amount to a fixed multiplier in every round).
+All the functions work over the last axis, so the multipliers can be
+a 1D array (one history) or a 2D array (one history per row).
+"""
+
+# Standard Library
+from typing import Optional
+
+# Libraries
+import numpy as np
+
+
+def single_bet_profits(
+    multipliers: np.ndarray,
+    *,
+    multiplier: float | np.ndarray,
+    amount: float | np.ndarray,
+    bet_mask: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Profit of every round, the same value returned by Bet.evaluate
+    :param multipliers: multiplier results
+    :param multiplier: multiplier of the bet (cash out)
+    :param amount: amount of the bet
+    :param bet_mask: rounds with bet (default all the rounds)
+    :return: array with the profit of every round
+    """
+    multipliers = np.asarray(multipliers, dtype=np.float64)
+    amount = np.asarray(amount, dtype=np.float64)
+    profits = np.where(
+        multipliers > multiplier, amount * (multiplier - 1), -amount
+    )
+    if bet_mask is not None:
+        profits = np.where(bet_mask, profits, 0.0)
+    return np.round(profits, 2)
+
+
+def balance_trajectory(
+    profits: np.ndarray,
+    *,
+    balance: float,
+    stop_loss: Optional[float] = 0,
+    take_profit: Optional[float] = 0,
+) -> np.ndarray:
+    """
+    Balance after every round, when the stop loss or the take profit
+    is reached the bot doesn't bet anymore (the balance is frozen)
+    :param profits: profit of every round (single_bet_profits)
+    :param balance: initial balance
+    :param stop_loss: amount of loss to stop (0 = disabled)
+    :param take_profit: amount of profit to stop (0 = disabled)
+    :return: array with the balance of every round
+    """
+    cumulative = np.cumsum(profits, axis=-1)
+    if not stop_loss and not take_profit:
+        return balance + cumulative
+    reached = np.zeros(cumulative.shape, dtype=bool)
+    if stop_loss:
+        reached |= cumulative <= -stop_loss
+    if take_profit:
+        reached |= cumulative >= take_profit
+    # the rounds after the limit has no bet
+    stopped = np.maximum.accumulate(reached, axis=-1)
+    active = np.ones(cumulative.shape, dtype=bool)
+    active[..., 1:] = ~stopped[..., :-1]
+    return balance + np.cumsum(np.where(active, profits, 0.0), axis=-1)
+
+
+def limit_rounds(
+    balances: np.ndarray,
+    *,
+    balance: float,
+    stop_loss: Optional[float] = 0,
+    take_profit: Optional[float] = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    First round (1-based) where the stop loss and the take profit
+    are reached, 0 if the limit is not reached
+    :return: tuple(stop_loss_rounds, take_profit_rounds)
+    """
+    profit = balances - balance
+
+    def _first_round(mask: np.ndarray) -> np.ndarray:
+        return np.where(mask.any(axis=-1), mask.argmax(axis=-1) + 1, 0)
+
+    empty = np.zeros(profit.shape, dtype=bool)
+    stop_loss_mask = profit <= -stop_loss if stop_loss else empty
+    take_profit_mask = profit >= take_profit if take_profit else empty
+    return _first_round(stop_loss_mask), _first_round(take_profit_mask)
+
+
+def max_drawdown(balances: np.ndarray, *, balance: float) -> np.ndarray:
+    """
+    Maximum drop of the balance from a previous peak
+    :param balances: balance of every round
+    :param balance: initial balance
+    :return: max drawdown (one per history)
+    """
+    peaks = np.maximum(np.maximum.accumulate(balances, axis=-1), balance)
+    return np.max(peaks - balances, axis=-1, initial=0.0)
+
+
+def multiplier_streak_lengths(
+    multipliers: np.ndarray, *, multiplier: float, is_less: bool
+) -> np.ndarray:
+    """
+    Length of the streak of multipliers less (or greater) than
+    the multiplier that ends in every round, the same value of
+    BotConditionHelper.calculate_multiplier_streak
+    """
+    multipliers = np.asarray(multipliers, dtype=np.float64)
+    if is_less:
+        in_streak = multipliers < multiplier
+    else:
+        in_streak = multipliers > multiplier
+    index = np.arange(multipliers.shape[-1])
+    last_break = np.maximum.accumulate(np.where(in_streak, -1, index), axis=-1)
+    return index - last_break
+
+
+def no_bet_streak_mask(
+    multipliers: np.ndarray,
+    *,
+    multiplier: float,
+    count: int,
+    is_less: bool,
+) -> np.ndarray:
+    """
+    Rounds with bet for the condition
+    streak_n_multiplier_less_than / streak_n_multiplier_greater_than
+    with the action make_bet=0. The condition is evaluated with the
+    multipliers before the round.
+    :return: bet_mask for single_bet_profits
+    """
+    lengths = multiplier_streak_lengths(
+        multipliers, multiplier=multiplier, is_less=is_less
+    )
+    mask = np.ones(lengths.shape, dtype=bool)
+    mask[..., 1:] = lengths[..., :-1] < count
+    return mask
@@ -0,0 +1,63 @@
+# Standard Library
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class BacktestResult:
+    bot_name: str
+    rounds: int
+    initial_balance: float
+    final_balance: float
+    # maximum drop of the balance from a previous peak
+    max_drawdown: float
+    bets_placed: int
+    bets_won: int
+    balances: list[float] = field(default_factory=list)
+    # BacktestLimit reached, the replay stops in this round
+    limit_reached: Optional[str] = None
+    limit_round: Optional[int] = None
+
+    @property
+    def profit(self) -> float:
+        return round(self.final_balance - self.initial_balance, 2)
+
+    @property
+    def profit_percentage(self) -> float:
+        if not self.initial_balance:
+            return 0
+        return round(self.profit / self.initial_balance, 4)
+
+    @property
+    def max_drawdown_percentage(self) -> float:
+        if not self.initial_balance:
+            return 0
+        return round(self.max_drawdown / self.initial_balance, 4)
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.bets_placed:
+            return 0
+        return round(self.bets_won / self.bets_placed, 4)
+
+
+@dataclass
+class RiskReport:
+    bot_name: str
+    simulations: int
+    rounds: int
+    initial_balance: float
+    bankruptcy_probability: float
+    stop_loss_probability: float
+    take_profit_probability: float
+    # round where the limit is reached (only the simulations that reach it)
+    stop_loss_rounds: list[int] = field(default_factory=list)
+    take_profit_rounds: list[int] = field(default_factory=list)
+    bankruptcy_rounds: list[int] = field(default_factory=list)
+    # BacktestLimit: {percentile: round}
+    hitting_time_percentiles: dict[str, dict[int, float]] = field(
+        default_factory=dict
+    )
+    # percentile: value
+    drawdown_percentiles: dict[int, float] = field(default_factory=dict)
+    profit_percentiles: dict[int, float] = field(default_factory=dict)
@@ -0,0 +1,307 @@
+# Standard Library
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Sequence
+
+# Libraries
+import numpy as np
+
+# Internal
+from apps.api.models import Bot
+from apps.game.backtesting.constants import BacktestLimit, SeriesMethod
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.backtesting.models import BacktestResult, RiskReport
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# data of the worker processes (initialized once per process)
+_worker_data: dict[str, any] = {}
+
+
+@dataclass
+class CrashDistribution:
+    """
+    Distribution of the crash multipliers:
+    - the game crashes at 1.0 with probability 1 - p_continue
+    - otherwise the multiplier follows a Pareto distribution
+      P(M >= x) = x ** -alpha
+    """
+
+    p_continue: float
+    alpha: float
+
+    @classmethod
+    def fit(cls, multipliers: Sequence[float]) -> "CrashDistribution":
+        """
+        Fit the distribution to the multipliers (maximum likelihood)
+        :param multipliers: recorded multipliers
+        :return: CrashDistribution
+        """
+        values = np.asarray(multipliers, dtype=np.float64)
+        if not len(values):
+            raise ValueError("the multipliers are required to fit")
+        continued = values[values > 1.0]
+        p_continue = len(continued) / len(values)
+        log_sum = np.log(continued).sum()
+        alpha = len(continued) / log_sum if log_sum else 1.0
+        return cls(p_continue=p_continue, alpha=alpha)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        values = rng.random(size) ** (-1 / self.alpha)
+        # the game shows the multiplier truncated to 2 decimals
+        values = np.floor(values * 100) / 100
+        crashed = rng.random(size) >= self.p_continue
+        return np.where(crashed, 1.0, np.maximum(values, 1.01))
+
+
+def bootstrap_series(
+    history: Sequence[float],
+    *,
+    rounds: int,
+    rng: np.random.Generator,
+    block_size: Optional[int] = 1,
+) -> np.ndarray:
+    """
+    Resample blocks of the history (with replacement), the blocks keep
+    the streaks of the game
+    :param history: recorded multipliers
+    :param rounds: length of the series
+    :param rng: random generator
+    :param block_size: consecutive multipliers per block
+    :return: array of multipliers
+    """
+    values = np.asarray(history, dtype=np.float64)
+    block_size = max(1, min(block_size, len(values)))
+    blocks = -(-rounds // block_size)
+    starts = rng.integers(0, len(values) - block_size + 1, size=blocks)
+    indexes = (starts[:, None] + np.arange(block_size)).ravel()
+    return values[indexes[:rounds]]
+
+
+def _init_worker(
+    bot_data: dict[str, any],
+    history: list[float],
+    series_kwargs: dict[str, any],
+    engine_kwargs: dict[str, any],
+):
+    # the history is sent once per process and not in every batch
+    _worker_data.update(
+        bot=Bot(**bot_data),
+        history=history,
+        series_kwargs=series_kwargs,
+        engine_kwargs=engine_kwargs,
+    )
+
+
+def _generate_series(rng: np.random.Generator) -> np.ndarray:
+    series_kwargs = _worker_data["series_kwargs"]
+    rounds = series_kwargs["rounds"]
+    if series_kwargs["method"] == SeriesMethod.DISTRIBUTION:
+        return series_kwargs["distribution"].sample(rng, rounds)
+    return bootstrap_series(
+        _worker_data["history"],
+        rounds=rounds,
+        rng=rng,
+        block_size=series_kwargs["block_size"],
+    )
+
+
+def _run_batch(
+    seed: np.random.SeedSequence, simulations: int
+) -> list[BacktestResult]:
+    rng = np.random.default_rng(seed)
+    engine = BacktestEngine(
+        bot=_worker_data["bot"], **_worker_data["engine_kwargs"]
+    )
+    return [
+        engine.run(
+            _generate_series(rng).tolist(), history=_worker_data["history"]
+        )
+        for _ in range(simulations)
+    ]
+
+
+class MonteCarloSimulator:
+    """
+    Estimate the risk of a bot configuration replaying synthetic
+    multiplier series (bootstrap of the history or fitted distribution).
+    The simulations are split in batches and distributed in a
+    ProcessPoolExecutor, the results of every batch are returned
+    as soon as it finishes.
+    example:
+        simulator = MonteCarloSimulator(
+            bot=bot, history=multipliers, simulations=5000, rounds=500,
+            balance=1000, bet_amount=10, minimum_bet=1, maximum_bet=100
+        )
+        report = simulator.run(
+            progress_callback=lambda done, total: print(done, total)
+        )
+    """
+
+    def __init__(
+        self,
+        *,
+        bot: Bot,
+        history: Sequence[float],
+        simulations: int,
+        rounds: int,
+        method: Optional[SeriesMethod] = SeriesMethod.BOOTSTRAP,
+        block_size: Optional[int] = 1,
+        batch_size: Optional[int] = 50,
+        seed: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        **engine_kwargs,
+    ):
+        """
+        :param bot: bot to simulate
+        :param history: recorded multipliers (also used to
+            initialize the bot)
+        :param simulations: number of series to simulate
+        :param rounds: rounds per series
+        :param method: SeriesMethod.BOOTSTRAP or SeriesMethod.DISTRIBUTION
+        :param block_size: multipliers per block (bootstrap)
+        :param batch_size: simulations per task
+        :param seed: seed of the random generator, the results don't
+            depend on the number of workers
+        :param max_workers: processes to use, default os.cpu_count(),
+            with 1 the batches run in the current process
+        :param engine_kwargs: parameters of BacktestEngine
+        """
+        if not history:
+            raise ValueError("the history is required")
+        self.bot = bot
+        self.history = list(history)
+        self.simulations = simulations
+        self.rounds = rounds
+        self.method = SeriesMethod(method)
+        self.block_size = block_size
+        self.batch_size = max(1, batch_size)
+        self.seed = seed
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.distribution = None
+        if self.method == SeriesMethod.DISTRIBUTION:
+            self.distribution = CrashDistribution.fit(self.history)
+        engine_kwargs["stop_on_limits"] = True
+        engine_kwargs.setdefault("keep_balances", False)
+        self.engine_kwargs = engine_kwargs
+
+    def _get_batches(self) -> list[tuple[np.random.SeedSequence, int]]:
+        sizes = [
+            min(self.batch_size, self.simulations - start)
+            for start in range(0, self.simulations, self.batch_size)
+        ]
+        # one independent seed per batch
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        return list(zip(seeds, sizes))
+
+    def iter_results(self) -> Iterator[list[BacktestResult]]:
+        """
+        Run the simulations, yield the results of every batch
+        (in the order they finish)
+        """
+        init_args = (
+            self.bot.dict(),
+            self.history,
+            dict(
+                method=self.method,
+                rounds=self.rounds,
+                block_size=self.block_size,
+                distribution=self.distribution,
+            ),
+            self.engine_kwargs,
+        )
+        batches = self._get_batches()
+        if self.max_workers == 1:
+            _init_worker(*init_args)
+            for seed, size in batches:
+                yield _run_batch(seed, size)
+            return
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=init_args,
+        ) as executor:
+            futures = [
+                executor.submit(_run_batch, seed, size)
+                for seed, size in batches
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(
+        self, *, progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> RiskReport:
+        """
+        Run all the simulations
+        :param progress_callback: called after every batch with
+            (completed simulations, total simulations)
+        :return: RiskReport
+        """
+        results = []
+        for batch in self.iter_results():
+            results.extend(batch)
+            if progress_callback:
+                progress_callback(len(results), self.simulations)
+        return build_risk_report(
+            results,
+            bot_name=self.bot.name,
+            rounds=self.rounds,
+            initial_balance=self.engine_kwargs.get("balance", 0),
+        )
+
+
+def build_risk_report(
+    results: list[BacktestResult],
+    *,
+    bot_name: str,
+    rounds: int,
+    initial_balance: float,
+) -> RiskReport:
+    """
+    Summarize the results of the simulations
+    """
+    limit_rounds = {limit: [] for limit in BacktestLimit}
+    for result in results:
+        if result.limit_reached:
+            limit = BacktestLimit(result.limit_reached)
+            limit_rounds[limit].append(result.limit_round)
+    total = len(results) or 1
+
+    def _percentiles(values: list[float]) -> dict[int, float]:
+        if not values:
+            return {}
+        return {
+            percentile: round(float(value), 2)
+            for percentile, value in zip(
+                PERCENTILES, np.percentile(values, PERCENTILES)
+            )
+        }
+
+    return RiskReport(
+        bot_name=bot_name,
+        simulations=len(results),
+        rounds=rounds,
+        initial_balance=initial_balance,
+        bankruptcy_probability=round(
+            len(limit_rounds[BacktestLimit.BANKRUPTCY]) / total, 4
+        ),
+        stop_loss_probability=round(
+            len(limit_rounds[BacktestLimit.STOP_LOSS]) / total, 4
+        ),
+        take_profit_probability=round(
+            len(limit_rounds[BacktestLimit.TAKE_PROFIT]) / total, 4
+        ),
+        stop_loss_rounds=sorted(limit_rounds[BacktestLimit.STOP_LOSS]),
+        take_profit_rounds=sorted(limit_rounds[BacktestLimit.TAKE_PROFIT]),
+        bankruptcy_rounds=sorted(limit_rounds[BacktestLimit.BANKRUPTCY]),
+        hitting_time_percentiles={
+            limit.value: _percentiles(values)
+            for limit, values in limit_rounds.items()
+            if values
+        },
+        drawdown_percentiles=_percentiles(
+            [result.max_drawdown for result in results]
+        ),
+        profit_percentiles=_percentiles([result.profit for result in results]),
+    )
@@ -0,0 +1,310 @@
+# Standard Library
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+# Internal
+from apps.api.models import Bot
+from apps.custom_bots.handlers import CustomBotsEncryptHandler
+from apps.custom_bots.validations import CustomBotValidationHandler
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.backtesting.models import BacktestResult
+
+# prefix of the parameters that update the action_value of a condition
+# format: conditions.<condition_id>.<condition_action>
+CONDITION_PARAMETER_PREFIX = "conditions"
+
+# data of the worker processes (initialized once per process)
+_worker_data: dict[str, any] = {}
+
+
+@dataclass
+class SweepResult:
+    parameters: dict[str, any]
+    result: BacktestResult
+
+    @property
+    def profit(self) -> float:
+        return self.result.profit
+
+    @property
+    def max_drawdown(self) -> float:
+        return self.result.max_drawdown
+
+    @property
+    def hit_rate(self) -> float:
+        return self.result.hit_rate
+
+
+def apply_parameters(bot: Bot, parameters: dict[str, any]) -> Bot:
+    """
+    Returns a copy of the bot with the parameters updated
+    :param bot: bot to copy
+    :param parameters: dict(field=value) the field can be a Bot attribute
+        or conditions.<condition_id>.<condition_action>
+    :return: Bot
+    """
+    new_bot = Bot(**bot.dict())
+    for key, value in parameters.items():
+        if not key.startswith(f"{CONDITION_PARAMETER_PREFIX}."):
+            if not hasattr(new_bot, key) or key == "conditions":
+                raise ValueError(f"invalid bot parameter: {key}")
+            setattr(new_bot, key, value)
+            continue
+        try:
+            _, condition_id, condition_action = key.split(".")
+        except ValueError:
+            raise ValueError(f"invalid condition parameter: {key}")
+        actions = [
+            action
+            for condition in new_bot.conditions
+            if str(condition.id) == condition_id
+            for action in condition.actions
+            if action.condition_action == condition_action
+        ]
+        if not actions:
+            raise ValueError(f"condition action not found: {key}")
+        for action in actions:
+            action.action_value = value
+    return new_bot
+
+
+def _init_worker(
+    bot_data: dict[str, any],
+    multipliers: Sequence[float],
+    history: Optional[Sequence[float]],
+    engine_kwargs: dict[str, any],
+):
+    # the history is sent once per process and not in every task
+    _worker_data.update(
+        bot=Bot(**bot_data),
+        multipliers=multipliers,
+        history=history,
+        engine_kwargs=engine_kwargs,
+    )
+
+
+def _run_parameters(parameters: dict[str, any]) -> SweepResult:
+    bot = apply_parameters(_worker_data["bot"], parameters)
+    engine = BacktestEngine(bot=bot, **_worker_data["engine_kwargs"])
+    result = engine.run(
+        _worker_data["multipliers"], history=_worker_data["history"]
+    )
+    return SweepResult(parameters=parameters, result=result)
+
+
+class BotOptimizer:
+    """
+    Grid or random search over the bot parameters.
+    Every combination replays the same multiplier history with
+    BacktestEngine, the combinations are distributed in a
+    ProcessPoolExecutor.
+    example:
+        optimizer = BotOptimizer(
+            bot=bot, multipliers=multipliers, balance=1000,
+            bet_amount=10, minimum_bet=1, maximum_bet=100
+        )
+        results = optimizer.grid_search(
+            {
+                "min_multiplier_to_bet": [1.5, 1.8, 2],
+                "stop_loss_percentage": [0.2, 0.5],
+                "conditions.2.update_multiplier": [1.5, 2],
+            }
+        )
+        print(results_to_table(results))
+        optimizer.export(results[0], custom_bots_path="custom_bots")
+    """
+
+    def __init__(
+        self,
+        *,
+        bot: Bot,
+        multipliers: Sequence[float],
+        history: Optional[Sequence[float]] = None,
+        max_workers: Optional[int] = None,
+        **engine_kwargs,
+    ):
+        """
+        :param bot: bot to optimize
+        :param multipliers: multipliers to replay
+        :param history: multipliers before the first round
+        :param max_workers: processes to use, default os.cpu_count(),
+            with 1 the combinations run in the current process
+        :param engine_kwargs: parameters of BacktestEngine
+        """
+        self.bot = bot
+        self.multipliers = list(multipliers)
+        self.history = list(history) if history else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # the balances of every round are not needed to rank the results
+        engine_kwargs.setdefault("keep_balances", False)
+        self.engine_kwargs = engine_kwargs
+
+    @staticmethod
+    def generate_grid(
+        parameters: dict[str, Sequence[any]],
+    ) -> list[dict[str, any]]:
+        keys = list(parameters.keys())
+        return [
+            dict(zip(keys, values))
+            for values in itertools.product(*parameters.values())
+        ]
+
+    @staticmethod
+    def generate_random(
+        parameters: dict[str, Sequence[any]],
+        *,
+        iterations: int,
+        seed: Optional[int] = None,
+    ) -> list[dict[str, any]]:
+        random_ = random.Random(seed)
+        # the repeated values don't add combinations
+        parameters = {
+            key: list(dict.fromkeys(values))
+            for key, values in parameters.items()
+        }
+        combinations = []
+        seen = set()
+        max_combinations = 1
+        for values in parameters.values():
+            max_combinations *= len(values)
+        while len(combinations) < min(iterations, max_combinations):
+            combination = {
+                key: random_.choice(values)
+                for key, values in parameters.items()
+            }
+            key_ = tuple(combination.values())
+            if key_ in seen:
+                continue
+            seen.add(key_)
+            combinations.append(combination)
+        return combinations
+
+    def grid_search(
+        self, parameters: dict[str, Sequence[any]]
+    ) -> list[SweepResult]:
+        """
+        Replay every combination of the parameters
+        :param parameters: dict(field=[values])
+        :return: results sorted by rank (best first)
+        """
+        return self.run(self.generate_grid(parameters))
+
+    def random_search(
+        self,
+        parameters: dict[str, Sequence[any]],
+        *,
+        iterations: int,
+        seed: Optional[int] = None,
+    ) -> list[SweepResult]:
+        """
+        Replay random combinations of the parameters
+        :param parameters: dict(field=[values])
+        :param iterations: number of combinations
+        :param seed: seed of the random generator
+        :return: results sorted by rank (best first)
+        """
+        combinations = self.generate_random(
+            parameters, iterations=iterations, seed=seed
+        )
+        return self.run(combinations)
+
+    def run(self, combinations: list[dict[str, any]]) -> list[SweepResult]:
+        # validate the parameters before start the processes
+        for combination in combinations[:1]:
+            apply_parameters(self.bot, combination)
+        init_args = (
+            self.bot.dict(),
+            self.multipliers,
+            self.history,
+            self.engine_kwargs,
+        )
+        if self.max_workers == 1:
+            _init_worker(*init_args)
+            results = [_run_parameters(item) for item in combinations]
+        else:
+            chunk_size = max(1, len(combinations) // (self.max_workers * 4))
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=init_args,
+            ) as executor:
+                results = list(
+                    executor.map(
+                        _run_parameters, combinations, chunksize=chunk_size
+                    )
+                )
+        return rank_results(results)
+
+    def build_bot(
+        self, result: SweepResult, *, name: Optional[str] = None
+    ) -> Bot:
+        bot = apply_parameters(self.bot, result.parameters)
+        bot.name = name or f"{self.bot.name}_optimized"
+        return bot
+
+    def export(
+        self,
+        result: SweepResult,
+        *,
+        custom_bots_path: str,
+        name: Optional[str] = None,
+    ) -> Bot:
+        """
+        Save the bot of the result as a .bot file
+        :param result: result to export (usually the first one)
+        :param custom_bots_path: path to custom bots folder
+        :param name: name of the new bot, default <bot name>_optimized
+        :return: Bot saved
+        """
+        bot = self.build_bot(result, name=name)
+        BacktestEngine.install_translation()
+        errors = CustomBotValidationHandler(bot=bot).validate_bot()
+        if errors:
+            raise ValueError(", ".join(errors))
+        CustomBotsEncryptHandler(custom_bots_path).save(bot)
+        return bot
+
+
+def rank_results(results: list[SweepResult]) -> list[SweepResult]:
+    """
+    Sort the results by profit (desc), max drawdown (asc)
+    and hit rate (desc)
+    """
+    return sorted(
+        results,
+        key=lambda item: (-item.profit, item.max_drawdown, -item.hit_rate),
+    )
+
+
+def results_to_table(
+    results: list[SweepResult], *, limit: Optional[int] = None
+) -> str:
+    """
+    Format the results as a text table
+    :param results: ranked results
+    :param limit: maximum number of rows
+    :return: str
+    """
+    header = (
+        f"{'#':>4} {'profit':>12} {'profit %':>9} {'drawdown':>12} "
+        f"{'hit rate':>9} {'bets':>7} {'limit':>12}  parameters"
+    )
+    rows = [header, "-" * len(header)]
+    for i, item in enumerate(results[:limit], start=1):
+        result = item.result
+        parameters = ", ".join(
+            f"{key}={value}" for key, value in item.parameters.items()
+        )
+        rows.append(
+            f"{i:>4} {result.profit:>12.2f} "
+            f"{result.profit_percentage * 100:>8.2f}% "
+            f"{result.max_drawdown:>12.2f} "
+            f"{result.hit_rate * 100:>8.2f}% "
+            f"{result.bets_placed:>7} "
+            f"{result.limit_reached or '-':>12}  {parameters}"
+        )
+    return "\n".join(rows)
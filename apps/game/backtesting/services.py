@@ -0,0 +1,38 @@
+"""
+this file contains the logic to backtest the bots
+"""
+
+# Standard Library
+import os
+from typing import Optional, Sequence
+
+# Internal
+from apps.custom_bots.handlers import CustomBotsEncryptHandler
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.backtesting.models import BacktestResult
+from apps.game.utils import load_multipliers  # noqa
+
+
+def backtest_custom_bots(
+    *,
+    custom_bots_path: str,
+    multipliers: Sequence[float],
+    history: Optional[Sequence[float]] = None,
+    **engine_kwargs,
+) -> list[BacktestResult]:
+    """
+    replay the multipliers with every custom bot (.bot files)
+    @param custom_bots_path: path to custom bots folder
+    @param multipliers: multipliers to replay
+    @param history: multipliers before the first round
+    @param engine_kwargs: parameters of BacktestEngine (balance, bet_amount,
+        minimum_bet, maximum_bet...)
+    """
+    if not os.path.exists(custom_bots_path):
+        return []
+    bots_handler = CustomBotsEncryptHandler(custom_bots_path)
+    results = []
+    for bot in bots_handler.load_all():
+        engine = BacktestEngine(bot=bot, **engine_kwargs)
+        results.append(engine.run(multipliers, history=history))
+    return results
@@ -2,6 +2,9 @@
 import abc
 from typing import List, Optional
 
+# Libraries
+import numpy as np
+
 # Internal
 from apps.api.models import Bot, MultiplierPositions
 from apps.game import utils as game_utils
@@ -11,6 +14,7 @@ from apps.game.prediction_core import PredictionCore
 from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.utils import graphs as utils_graphs
+from apps.utils.ring_buffer import RingBuffer
 
 
 class BotBase(abc.ABC):
@@ -58,7 +62,6 @@ class BotBase(abc.ABC):
     maximum_bet: float
     bets: List[Bet] = []
     amounts_lost: List[float] = []
-    multipliers: List[float] = []
 
     # amount to bet
     _bet_amount: float = 0
@@ -84,8 +87,48 @@ class BotBase(abc.ABC):
         self.minimum_bet = minimum_bet
         self.maximum_bet = maximum_bet
         self.amount_multiple = amount_multiple
+        # the class attributes are shared by all the instances
+        self.bets = []
+        self.amounts_lost = []
+        self.multipliers = []
+
+    @property
+    def multipliers(self) -> np.ndarray:
+        # last MAX_MULTIPLIERS_IN_MEMORY multipliers (read-only view)
+        return self._multipliers.values(self.MAX_MULTIPLIERS_IN_MEMORY)
+
+    @multipliers.setter
+    def multipliers(self, multipliers: RingBuffer | list[float]):
+        # the RingBuffer is shared with the owner (the game page),
+        # the owner adds the multipliers to the history
+        self._owns_multipliers = not isinstance(multipliers, RingBuffer)
+        if self._owns_multipliers:
+            multipliers = RingBuffer(
+                self.MAX_MULTIPLIERS_IN_MEMORY, multipliers
+            )
+        self._multipliers = multipliers
+        # the trend is calculated again with the new history
+        self._trend = None
+        self._last_positions = game_utils.LastPositionIndex(
+            self.MAX_MULTIPLIERS_IN_MEMORY, len(self.multipliers)
+        )
 
-    def initialize(self, *, balance: float, multipliers: list[float]):
+    def initialize(
+        self,
+        *,
+        balance: float,
+        multipliers: RingBuffer | list[float],
+        bot: Optional[Bot] = None,
+    ):
+        """
+        Initialize the bot
+        :param balance: initial balance
+        :param multipliers: last multipliers of the game, a RingBuffer
+            is shared with the bot (it's not copied)
+        :param bot: bot data, if None it is searched by BOT_NAME
+            in GlobalVars.get_bots()
+        :return: None
+        """
         self.initial_balance = balance
         self.last_balance = balance
         self.balance = balance
@@ -94,7 +137,7 @@ class BotBase(abc.ABC):
             balance=self.balance,
             initial_balance=self.initial_balance,
         )
-        self.bot = next(
+        self.bot = bot or next(
             filter(lambda x: x.name == self.BOT_NAME, GlobalVars.get_bots()),
             None,
         )
@@ -106,7 +149,7 @@ class BotBase(abc.ABC):
             bot_conditions=self.bot.conditions,
             min_multiplier_to_bet=self.bot.min_multiplier_to_bet,
             min_multiplier_to_recover_losses=self.bot.min_multiplier_to_recover_losses,  # noqa
-            multipliers=multipliers,
+            multipliers=self._multipliers,
         )
         SendEventToGUI.log.info(f"Bot {self.bot.name} loaded")
         self.MIN_CATEGORY_PERCENTAGE_TO_BET = (
@@ -185,10 +228,13 @@ class BotBase(abc.ABC):
         return final_amount
 
     def add_multiplier(self, multiplier: float):
-        self.multipliers.append(multiplier)
-        # remove the first multiplier
-        if len(self.multipliers) > self.MAX_MULTIPLIERS_IN_MEMORY:
-            self.multipliers = self.multipliers[1:]
+        if self._owns_multipliers:
+            self._multipliers.append(multiplier)
+        self._last_positions.add_multiplier(multiplier)
+        if self._trend and self._trend.len_window == abs(
+            self.len_window_to_bullish_game
+        ):
+            self._trend.add_multiplier(multiplier)
         self.is_bullish_game = self.determine_bullish_game()
         if self.is_bullish_game:
             SendEventToGUI.log.info(_("Game is bullish"))  # noqa
@@ -209,12 +255,13 @@ class BotBase(abc.ABC):
         self.amounts_lost = []
 
     def determine_bullish_game(self) -> bool:
-        y_coordinates = utils_graphs.convert_multipliers_to_coordinate(
-            self.multipliers
-        )
-        slope, _ = utils_graphs.calculate_slope_linear_regression(
-            y_coordinates, self.len_window_to_bullish_game
-        )
+        len_window = abs(self.len_window_to_bullish_game)
+        if not self._trend or self._trend.len_window != len_window:
+            # the window was changed in the configuration
+            self._trend = utils_graphs.SlidingLinearRegression(
+                len_window, self._multipliers.values(len_window)
+            )
+        slope, _ = self._trend.calculate_slope()
         SendEventToGUI.log.debug(f"determine_bullish_game :: slope {slope} ")
         return slope >= self.min_value_to_bullish_game
 
@@ -420,6 +467,7 @@ class BotBase(abc.ABC):
             data=self.multiplier_positions,
             last_multipliers=self.multipliers,
             use_all_time=True,
+            last_positions=self._last_positions,
         )
         if multiplier <= 2:
             return 2, 2
@@ -434,8 +482,8 @@ class BotBase(abc.ABC):
         if not multipliers:
             return [], 0
         for multiplier in multipliers:
-            position = game_utils.get_last_position_multiplier(
-                multiplier=multiplier, last_multipliers=self.multipliers
+            position = self._last_positions.get_position(
+                multiplier, self.multipliers
             )
             positions.append((multiplier, position))
         return positions, len(self.multipliers)
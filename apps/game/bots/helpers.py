@@ -1,11 +1,15 @@
 # Standard Library
+import bisect
 import copy
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional
+from operator import attrgetter
+from typing import Optional, Sequence
 
 # Internal
 from apps.api.models import BotCondition, BotConditionAction
 from apps.game.bots.constants import ConditionAction, ConditionON
+from apps.utils.ring_buffer import RingBuffer
 
 
 @dataclass
@@ -17,6 +21,20 @@ class EvaluateResult:
     recovery_losses: bool
 
 
+@dataclass(eq=False)
+class CompiledCondition:
+    # position in BotConditionHelper.bot_conditions
+    index: int
+    condition: BotCondition
+    condition_on: ConditionON
+    # position in BotConditionHelper._priority_conditions
+    priority: int
+    # int(condition_on_value) of the streak conditions
+    streak_count: int
+    no_make_bet: bool
+    action_types: frozenset[str]
+
+
 class BotConditionHelper:
     _priority_conditions = [
         ConditionON.PROFIT_LESS_THAN,
@@ -28,6 +46,14 @@ class BotConditionHelper:
         ConditionON.STREAK_WINS,
         ConditionON.STREAK_LOSSES,
     ]
+    _streak_conditions = (ConditionON.STREAK_WINS, ConditionON.STREAK_LOSSES)
+    _every_conditions = (ConditionON.EVERY_WIN, ConditionON.EVERY_LOSS)
+    _multiplier_streak_conditions = {
+        ConditionON.STREAK_N_MULTIPLIER_LESS_THAN: True,
+        ConditionON.STREAK_N_MULTIPLIER_GREATER_THAN: False,
+    }
+    # length of the multipliers and last_games history
+    MAX_HISTORY_LENGTH = 500
 
     def __init__(
         self,
@@ -35,7 +61,7 @@ class BotConditionHelper:
         bot_conditions: list[BotCondition],
         min_multiplier_to_bet: float,
         min_multiplier_to_recover_losses: float,
-        multipliers: list[float],
+        multipliers: RingBuffer | list[float],
     ):
         self.bot_conditions = bot_conditions
         self.bot_conditions = sorted(
@@ -49,12 +75,46 @@ class BotConditionHelper:
         self.MIN_MULTIPLIER_TO_RECOVER_LOSSES = copy.copy(
             min_multiplier_to_recover_losses
         )
-        self.multipliers = copy.copy(multipliers)
+        self._compile_conditions()
+        self.multipliers = multipliers
         self.current_multiplier = copy.copy(min_multiplier_to_bet)
         self.initial_bet_amount = 0.0
         self.current_bet_amount = 0.0
         self.profit = 0.0
-        self.last_games: list[bool] = []
+        self.last_games = []
+
+    @property
+    def multipliers(self) -> RingBuffer:
+        return self._multipliers
+
+    @multipliers.setter
+    def multipliers(self, multipliers: RingBuffer | list[float]):
+        # the RingBuffer is shared with the owner (the bot or the game page),
+        # the owner adds the multipliers before evaluate the conditions
+        self._owns_multipliers = not isinstance(multipliers, RingBuffer)
+        if self._owns_multipliers:
+            multipliers = RingBuffer(self.MAX_HISTORY_LENGTH, multipliers)
+        self._multipliers = multipliers
+        # streak of every threshold of the streak_n_multiplier conditions
+        values = multipliers.values(self.MAX_HISTORY_LENGTH)
+        self._multiplier_streaks = {
+            key: self._count_multiplier_streak(values, *key)
+            for key in self._multiplier_thresholds
+        }
+
+    @property
+    def last_games(self) -> deque[bool]:
+        return self._last_games
+
+    @last_games.setter
+    def last_games(self, last_games: list[bool]):
+        self._last_games = deque(last_games, maxlen=self.MAX_HISTORY_LENGTH)
+        self._streak_outcome = last_games[-1] if last_games else None
+        self._streak = 0
+        for game in reversed(last_games):
+            if game != self._streak_outcome:
+                break
+            self._streak += 1
 
     def set_bet_amount(self, *, bet_amount: float, user_change: bool = False):
         """
@@ -69,31 +129,58 @@ class BotConditionHelper:
         self.current_bet_amount = bet_amount
 
     def add_last_game(self, last_game: bool):
-        self.last_games.append(last_game)
+        self._last_games.append(last_game)
+        if last_game == self._streak_outcome:
+            self._streak += 1
+            return
+        self._streak_outcome = last_game
+        self._streak = 1
+
+    def add_multiplier(self, multiplier: float):
+        if self._owns_multipliers:
+            self._multipliers.append(multiplier)
+        for key in self._multiplier_streaks:
+            threshold, is_less = key
+            if (is_less and multiplier < threshold) or (
+                not is_less and multiplier > threshold
+            ):
+                self._multiplier_streaks[key] += 1
+                continue
+            self._multiplier_streaks[key] = 0
 
     def set_profit(self, profit: float):
         self.profit = profit
 
     def calculate_streak(self, outcome: bool):
-        streak = 0
-        for game in reversed(self.last_games):
-            if game == outcome:
-                streak += 1
-            else:
-                break
-        return streak
+        if outcome != self._streak_outcome:
+            return 0
+        return self._streak
 
-    def calculate_multiplier_streak(
-        self, *, multiplier: float, count_multipliers: float, is_less: bool
-    ) -> bool:
+    @staticmethod
+    def _count_multiplier_streak(
+        multipliers: Sequence[float], multiplier: float, is_less: bool
+    ) -> int:
         streak = 0
-        for value in reversed(self.multipliers):
+        for value in reversed(multipliers):
             if (is_less and value < multiplier) or (
                 not is_less and value > multiplier
             ):
                 streak += 1
                 continue
             break
+        return streak
+
+    def calculate_multiplier_streak(
+        self, *, multiplier: float, count_multipliers: float, is_less: bool
+    ) -> bool:
+        streak = self._multiplier_streaks.get((multiplier, is_less))
+        if streak is None:
+            # the threshold is not used by the conditions
+            streak = self._count_multiplier_streak(
+                self._multipliers.values(self.MAX_HISTORY_LENGTH),
+                multiplier,
+                is_less,
+            )
         return streak >= count_multipliers
 
     @staticmethod
@@ -103,140 +190,191 @@ class BotConditionHelper:
             return any([action.action_value == 0 for action in actions])
         return False
 
+    def _compile_conditions(self):
+        """
+        Build the plan to evaluate the conditions (once per bot):
+        conditions grouped by ConditionON in the order of bot_conditions
+        """
+        self._plan: dict[ConditionON, list[CompiledCondition]] = {
+            condition_on: [] for condition_on in ConditionON
+        }
+        for index, condition in enumerate(self.bot_conditions):
+            condition_on = ConditionON(condition.condition_on)
+            streak_count = 0
+            if condition_on in self._streak_conditions:
+                streak_count = int(condition.condition_on_value)
+            self._plan[condition_on].append(
+                CompiledCondition(
+                    index=index,
+                    condition=condition,
+                    condition_on=condition_on,
+                    priority=self._priority_conditions.index(condition_on),
+                    streak_count=streak_count,
+                    no_make_bet=self._has_no_make_bet(condition.actions),
+                    action_types=frozenset(
+                        action.condition_action for action in condition.actions
+                    ),
+                )
+            )
+        # the groups are sorted by condition_on_value
+        self._plan_values = {
+            condition_on: [
+                item.condition.condition_on_value
+                for item in self._plan[condition_on]
+            ]
+            for condition_on in (
+                ConditionON.PROFIT_GREATER_THAN,
+                ConditionON.PROFIT_LESS_THAN,
+            )
+        }
+        # (condition_on_value_2, is_less) of the streak_n_multiplier
+        self._multiplier_thresholds = {
+            (item.condition.condition_on_value_2, is_less)
+            for condition_on, is_less in (
+                self._multiplier_streak_conditions.items()
+            )
+            for item in self._plan[condition_on]
+        }
+        self._plan_streak_counts = {
+            condition_on: [
+                item.streak_count for item in self._plan[condition_on]
+            ]
+            for condition_on in self._streak_conditions
+        }
+        # every condition without the actions of the streak conditions
+        # key: (index, action types of the streak conditions)
+        self._masked_conditions: dict[
+            tuple[int, frozenset], Optional[BotCondition]
+        ] = {}
+
+    def _get_fired_conditions(self) -> list[CompiledCondition]:
+        plan = self._plan
+        fired = []
+        if self.last_games:
+            if self.last_games[-1]:
+                fired += plan[ConditionON.EVERY_WIN]
+            else:
+                fired += plan[ConditionON.EVERY_LOSS]
+        for condition_on in self._streak_conditions:
+            if not plan[condition_on]:
+                continue
+            streak = self.calculate_streak(
+                condition_on == ConditionON.STREAK_WINS
+            )
+            position = bisect.bisect_right(
+                self._plan_streak_counts[condition_on], streak
+            )
+            fired += plan[condition_on][:position]
+        if plan[ConditionON.PROFIT_GREATER_THAN]:
+            position = bisect.bisect_left(
+                self._plan_values[ConditionON.PROFIT_GREATER_THAN],
+                self.profit,
+            )
+            fired += plan[ConditionON.PROFIT_GREATER_THAN][:position]
+        if plan[ConditionON.PROFIT_LESS_THAN]:
+            position = bisect.bisect_right(
+                self._plan_values[ConditionON.PROFIT_LESS_THAN], self.profit
+            )
+            fired += plan[ConditionON.PROFIT_LESS_THAN][position:]
+        for (
+            condition_on,
+            is_less,
+        ) in self._multiplier_streak_conditions.items():
+            for item in plan[condition_on]:
+                in_streak = self.calculate_multiplier_streak(
+                    multiplier=item.condition.condition_on_value_2,
+                    count_multipliers=item.condition.condition_on_value,
+                    is_less=is_less,
+                )
+                if in_streak:
+                    fired.append(item)
+        # the conditions are validated in the order of bot_conditions
+        fired.sort(key=attrgetter("index"))
+        return fired
+
+    def _get_masked_condition(
+        self, item: CompiledCondition, streak_action_types: frozenset
+    ) -> Optional[BotCondition]:
+        """
+        Returns the every condition without the actions
+        of the streak conditions (None if it has no actions)
+        """
+        if item.condition.actions and not (
+            item.action_types & streak_action_types
+        ):
+            return item.condition
+        key = (item.index, streak_action_types)
+        if key not in self._masked_conditions:
+            condition = None
+            actions = [
+                action
+                for action in item.condition.actions
+                if action.condition_action not in streak_action_types
+            ]
+            if actions:
+                condition = copy.copy(item.condition)
+                condition.actions = actions
+            self._masked_conditions[key] = condition
+        return self._masked_conditions[key]
+
     def _check_conditions(self) -> list[BotCondition]:
         """
         Check if the conditions are valid
         :return: list of valid conditions
         """
-        _conditions = []
-
-        def _add_valid_condition(new_condition: BotCondition):
-            _condition_on = ConditionON(new_condition.condition_on)
-            if _condition_on in [c.condition_on for c in _conditions]:
-                filter_conditions = filter(
-                    lambda x: x.condition_on == _condition_on.value,
-                    _conditions,
-                )
-                for _condition in filter_conditions:
-                    if (
-                        new_condition.condition_on_value_2 is not None
-                        and _condition.condition_on_value_2 is not None
-                    ):
-                        is_same_value = (
-                            _condition.condition_on_value
-                            == new_condition.condition_on_value
-                        )
-                        is_value_2_less = (
-                            _condition.condition_on_value_2
-                            < new_condition.condition_on_value_2
-                        )
-                        if is_same_value and is_value_2_less:
-                            _conditions.remove(_condition)
-                            continue
-                    is_value_less = (
+        _conditions: list[CompiledCondition] = []
+        for new_item in self._get_fired_conditions():
+            new_condition = new_item.condition
+            # the filter is lazy and the list is modified while iterating,
+            # a removed condition skips the next one of the list
+            filter_conditions = filter(
+                lambda x: x.condition_on == new_item.condition_on,
+                _conditions,
+            )
+            for _item in filter_conditions:
+                _condition = _item.condition
+                if (
+                    new_condition.condition_on_value_2 is not None
+                    and _condition.condition_on_value_2 is not None
+                ):
+                    is_same_value = (
                         _condition.condition_on_value
-                        < new_condition.condition_on_value
-                    )
-                    no_make_bet = self._has_no_make_bet(_condition.actions)
-                    if is_value_less and not no_make_bet:
-                        _conditions.remove(_condition)
-            _conditions.append(new_condition)
-
-        bot_conditions = copy.copy(self.bot_conditions)
-        for condition in bot_conditions:
-            condition_ = copy.copy(condition)
-            condition_on = ConditionON(condition_.condition_on)
-            condition_on_value = condition_.condition_on_value
-            condition_on_value_2 = condition_.condition_on_value_2
-            match condition_on:
-                case ConditionON.EVERY_WIN:
-                    if self.last_games and self.last_games[-1]:
-                        _add_valid_condition(condition_)
-                case ConditionON.EVERY_LOSS:
-                    if self.last_games and not self.last_games[-1]:
-                        _add_valid_condition(condition_)
-                case ConditionON.STREAK_WINS:
-                    if self.calculate_streak(True) >= int(condition_on_value):
-                        _add_valid_condition(condition_)
-                case ConditionON.STREAK_LOSSES:
-                    if self.calculate_streak(False) >= int(condition_on_value):
-                        _add_valid_condition(condition_)
-                case ConditionON.PROFIT_GREATER_THAN:
-                    if self.profit > condition_on_value:
-                        _add_valid_condition(condition_)
-                case ConditionON.PROFIT_LESS_THAN:
-                    if self.profit < condition_on_value:
-                        _add_valid_condition(condition_)
-                case ConditionON.STREAK_N_MULTIPLIER_LESS_THAN:
-                    in_streak = self.calculate_multiplier_streak(
-                        multiplier=condition_on_value_2,
-                        count_multipliers=condition_on_value,
-                        is_less=True,
+                        == new_condition.condition_on_value
                     )
-                    if in_streak:
-                        _add_valid_condition(condition_)
-                case ConditionON.STREAK_N_MULTIPLIER_GREATER_THAN:
-                    in_streak = self.calculate_multiplier_streak(
-                        multiplier=condition_on_value_2,
-                        count_multipliers=condition_on_value,
-                        is_less=False,
+                    is_value_2_less = (
+                        _condition.condition_on_value_2
+                        < new_condition.condition_on_value_2
                     )
-                    if in_streak:
-                        _add_valid_condition(condition_)
-        _conditions = sorted(
-            _conditions,
-            key=lambda x: self._priority_conditions.index(
-                ConditionON(x.condition_on)
-            ),
-            reverse=True,
-        )
-        actions = []
-        streak_wins = list(
-            filter(
-                lambda x: x.condition_on == ConditionON.STREAK_WINS.value,
-                _conditions,
-            )
-        )
-        for streak_win in streak_wins:
-            actions += streak_win.actions
-        streak_losses = list(
-            filter(
-                lambda x: x.condition_on == ConditionON.STREAK_LOSSES.value,
-                _conditions,
-            )
-        )
-        for streak_loss in streak_losses:
-            actions += streak_loss.actions
-        if streak_wins or streak_losses:
-            every_conditions = list(
-                filter(
-                    lambda x: x.condition_on
-                    in [
-                        ConditionON.EVERY_WIN.value,
-                        ConditionON.EVERY_LOSS.value,
-                    ],
-                    _conditions,
+                    if is_same_value and is_value_2_less:
+                        _conditions.remove(_item)
+                        continue
+                is_value_less = (
+                    _condition.condition_on_value
+                    < new_condition.condition_on_value
                 )
-            )
-            for action in actions:
-                for every_condition in every_conditions:
-                    _actions = [
-                        action.condition_action
-                        for action in every_condition.actions
-                    ]
-                    if action.condition_action in _actions:
-                        # remove the action from the every condition
-                        every_condition.actions = list(
-                            filter(
-                                lambda x: x.condition_action
-                                != action.condition_action,
-                                every_condition.actions,
-                            )
-                        )
-            for every_condition in every_conditions:
-                if not every_condition.actions:
-                    _conditions.remove(every_condition)
-        return _conditions
+                if is_value_less and not _item.no_make_bet:
+                    _conditions.remove(_item)
+            _conditions.append(new_item)
+        _conditions.sort(key=attrgetter("priority"), reverse=True)
+        streak_action_types = frozenset()
+        has_streak = False
+        for item in _conditions:
+            if item.condition_on in self._streak_conditions:
+                has_streak = True
+                streak_action_types |= item.action_types
+        if not has_streak:
+            return [item.condition for item in _conditions]
+        valid_conditions = []
+        for item in _conditions:
+            condition = item.condition
+            if item.condition_on in self._every_conditions:
+                condition = self._get_masked_condition(
+                    item, streak_action_types
+                )
+                if condition is None:
+                    continue
+            valid_conditions.append(condition)
+        return valid_conditions
 
     def evaluate_conditions(
         self,
@@ -258,7 +396,7 @@ class BotConditionHelper:
             forget_losses,
          )
         """
-        self.multipliers.append(multiplier_result)
+        self.add_multiplier(multiplier_result)
         if result_last_game is not None:
             self.add_last_game(result_last_game)
         self.profit = profit
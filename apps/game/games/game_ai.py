@@ -1,14 +1,18 @@
 # Standard Library
+import asyncio
 from typing import Optional
 
 # Internal
-from apps.api import services as api_services
+from apps.api import async_services as api_services
+from apps.api.models import Prediction
 from apps.game.bookmakers.home_bet import HomeBet
 from apps.game.bots.bot_ai import BotAI
 from apps.game.games.constants import GameType
 from apps.game.games.game_base import GameBase
 from apps.game.models import Bet
 from apps.game.prediction_core import PredictionCore, PredictionModel
+from apps.game.predictors.predictor_base import LocalPredictor
+from apps.game.predictors.services import load_local_predictor
 from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.utils.local_storage import LocalStorage
@@ -22,6 +26,10 @@ class GameAI(GameBase, configuration=GameType.AI.value):
     """
 
     _prediction_model: PredictionModel
+    # prediction requested before the bets are evaluated
+    _prediction_task: Optional[asyncio.Task] = None
+    # seconds to wait the backend before use the local predictor
+    PREDICTION_TIMEOUT: float = 3
 
     def __init__(
         self,
@@ -34,9 +42,12 @@ class GameAI(GameBase, configuration=GameType.AI.value):
         self._prediction_model: PredictionModel = (
             PredictionModel.get_instance()
         )
+        # fallback when the backend doesn't respond
+        self._local_predictor: Optional[LocalPredictor] = load_local_predictor(
+            GlobalVars.config.LOCAL_PREDICTOR
+        )
 
     def initialize_bot(self, *, bot_name: str):
-        multipliers_ = [item.multiplier for item in self.multipliers]
         self.BOT_NAME = bot_name
         self.bot = BotAI(
             bot_name=bot_name,
@@ -46,16 +57,48 @@ class GameAI(GameBase, configuration=GameType.AI.value):
         )
         self.bot.initialize(
             balance=self.initial_balance,
-            multipliers=multipliers_,
+            multipliers=self.game_page.multipliers,
+        )
+        self.update_local_predictor()
+
+    def update_local_predictor(self):
+        """
+        learn the last multiplier, a predictor not trained offline is
+        trained with the history of the game
+        """
+        predictor = self._local_predictor
+        if not predictor:
+            return
+        if predictor.trained:
+            predictor.update(self.multipliers)
+        elif len(self.multipliers) > predictor.min_history:
+            predictor.fit(self.multipliers)
+
+    def get_local_predictions(self) -> Optional[list[Prediction]]:
+        if not self._local_predictor:
+            return None
+        prediction = self._local_predictor.predict(self.multipliers)
+        if prediction is None:
+            return None
+        SendEventToGUI.log.debug(
+            f"local prediction ({self._local_predictor.TYPE.value}): "
+            f"{prediction.prediction_round}"
         )
+        return [prediction]
 
-    def request_get_prediction(self) -> Optional[PredictionCore]:
+    def prefetch_next_bet(self) -> None:
         """
-        Get the prediction from the database
+        Request the prediction as soon as the multiplier is read,
+        meanwhile the balance is read and the bets are evaluated
         """
-        multipliers = [item.multiplier for item in self.multipliers]
+        self._prediction_task = asyncio.create_task(
+            self._request_predictions()
+        )
+
+    async def _request_predictions(self) -> Optional[list[Prediction]]:
+        multipliers = self.multipliers.tolist()
         try:
-            predictions = api_services.request_prediction(
+            return await api_services.request_prediction(
                 home_bet_game_id=GlobalVars.get_home_bet_game_id(),
                 multipliers=multipliers,
             )
@@ -64,24 +107,53 @@ class GameAI(GameBase, configuration=GameType.AI.value):
                 f"{_('Error in request_get_prediction')}: {e}"  # noqa
             )
             return None
+
+    async def request_get_prediction(self) -> Optional[PredictionCore]:
+        """
+        Get the prediction from the database (the prefetched request),
+        the local predictor is used when the backend fails or it takes
+        more than PREDICTION_TIMEOUT
+        """
+        task, self._prediction_task = self._prediction_task, None
+        if not task:
+            task = asyncio.create_task(self._request_predictions())
+        with self.latencies.measure("prediction_wait"):
+            try:
+                predictions = await asyncio.wait_for(
+                    task, self.PREDICTION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                SendEventToGUI.log.debug("request_get_prediction: timeout")
+                predictions = None
+        if predictions is None:
+            predictions = self.get_local_predictions()
+        if predictions is None:
+            return None
         self._prediction_model.add_predictions(predictions)
         return self._prediction_model.get_best_prediction()
 
+    async def close(self):
+        if self._prediction_task:
+            self._prediction_task.cancel()
+            self._prediction_task = None
+        await super().close()
+
     def add_multiplier(self, multiplier: float) -> None:
         """
         Add a new multiplier and update the multipliers
         """
         self._prediction_model.add_multiplier_result(multiplier)
         super().add_multiplier(multiplier)
+        self.update_local_predictor()
 
-    def get_next_bet(self) -> list[Bet]:
+    async def get_next_bet(self) -> list[Bet]:
         """
         Get the next bet from the prediction
         """
         self._prediction_model.evaluate_models(
             self.bot.MIN_AVERAGE_MODEL_PREDICTION
         )
-        prediction = self.request_get_prediction()
+        prediction = await self.request_get_prediction()
         if prediction is None:
             SendEventToGUI.log.warning(_("No prediction found"))  # noqa
             return []
@@ -1,20 +1,28 @@
 # Standard Library
 import abc
-from copy import copy
+import asyncio
+import time
+from datetime import datetime
 from typing import Optional
 
+# Libraries
+import numpy as np
+
 # Internal
-from apps.api import services as api_services
+from apps.api import async_services as api_services
+from apps.api import services as sync_api_services
 from apps.api.models import BetData, HomeBetGameModel
 from apps.api.models import Multiplier as APIMultiplierData
 from apps.api.models import MultiplierPositions
+from apps.api.persistence import PersistenceWorker
 from apps.game.bookmakers.home_bet import HomeBet
 from apps.game.bots.bot_base import BotBase
-from apps.game.models import Bet, Multiplier
+from apps.game.models import Bet
 from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.scrappers.constants import CrashGame
 from apps.scrappers.game_base import AbstractCrashGameBase
+from apps.utils.histogram import LatencyHistograms
 from apps.utils.local_storage import LocalStorage
 from apps.utils.patterns.factory import ConfigurationFactory
 
@@ -44,11 +52,16 @@ class GameBase(abc.ABC, ConfigurationFactory):
     initial_balance: float = 0
     balance: float = 0
     currency: str = "USD"
-    multipliers: list[Multiplier] = []
-    multipliers_to_save: list[Multiplier] = []
+    # number of multipliers read from the game page
+    # (window of the history used by the game)
+    len_multipliers: int = 0
+    # multipliers of the history pending to save
+    multipliers_to_save: int = 0
     bets: list[Bet] = []
 
     multiplier_positions: MultiplierPositions = None
+    # saves the bets and multipliers in background
+    persistence: Optional[PersistenceWorker] = None
 
     def __init__(
         self,
@@ -64,6 +77,13 @@ class GameBase(abc.ABC, ConfigurationFactory):
         self.game_page = self.home_bet.get_crash_game(
             crash_game=CrashGame(self.home_bet_game.crash_game)
         )
+        # crash_to_bet: from the multiplier read to the bets sent
+        self.latencies = LatencyHistograms()
+
+    @property
+    def multipliers(self) -> np.ndarray:
+        # the history is owned by the game page (read-only view)
+        return self.game_page.multipliers.values(self.len_multipliers)
 
     def _set_max_min_bet(self):
         # use after GlobalVars.set_currency(self.currency)
@@ -100,23 +120,27 @@ class GameBase(abc.ABC, ConfigurationFactory):
         #         f" local storage {self.initial_balance}"
         #     )
         SendEventToGUI.log.debug("loading the player")
-        multipliers_ = self.game_page.multipliers
-        SendEventToGUI.send_multipliers(multipliers_)
-        self.multipliers = list(
-            map(lambda item: Multiplier(item), multipliers_)
-        )
-        self.multipliers_to_save = copy(self.multipliers)
+        self.len_multipliers = len(self.game_page.multipliers)
+        SendEventToGUI.send_multipliers(self.multipliers.tolist())
+        self.multipliers_to_save = self.len_multipliers
         self.initialize_bot(bot_name=self.BOT_NAME)
         self.initialized = True
-        self.request_customer_live()
+        self.persistence = PersistenceWorker()
+        self.persistence.start()
         self.request_save_multipliers()
+        await asyncio.gather(
+            self.request_customer_live(), self.request_multiplier_positions()
+        )
         SendEventToGUI.log.success(_("Game initialized"))  # noqa
         SendEventToGUI.game_loaded(True)
         positions, len_multiplier = self.bot.get_last_position_of_multipliers()
         SendEventToGUI.send_multiplier_positions(positions, len_multiplier)
 
     async def close(self):
-        self.request_customer_live(closing_session=True)
+        await self.request_customer_live(closing_session=True)
+        if self.persistence:
+            # the records not sent are saved in the journal
+            await asyncio.to_thread(self.persistence.close)
         await self.game_page.close()
         # TODO: clean all variables
         self.initialized = False
@@ -127,14 +151,14 @@ class GameBase(abc.ABC, ConfigurationFactory):
         """
         return await self.game_page.read_balance() or 0
 
-    def request_customer_live(
+    async def request_customer_live(
         self, *, closing_session: Optional[bool] = False
     ):
         """
         Request the customer live
         """
         try:
-            response = api_services.request_customer_live(
+            response = await api_services.request_customer_live(
                 home_bet_id=self.home_bet.id,
                 balance=self.balance,
                 currency=self.currency,
@@ -150,13 +174,15 @@ class GameBase(abc.ABC, ConfigurationFactory):
         except Exception as error:
             SendEventToGUI.log.debug(f"Error in requestCustomerLive: {error}")
 
-    def request_multiplier_positions(self):
+    async def request_multiplier_positions(self):
         """
         Get the multiplier positions from the database
         """
         try:
-            self.multiplier_positions = api_services.get_multiplier_positions(
-                home_bet_game_id=GlobalVars.get_home_bet_game_id()
+            self.multiplier_positions = (
+                await api_services.get_multiplier_positions(
+                    home_bet_game_id=GlobalVars.get_home_bet_game_id()
+                )
             )
             # SendEventToGUI.log.debug("multiplier positions received")
         except Exception as error:
@@ -164,62 +190,73 @@ class GameBase(abc.ABC, ConfigurationFactory):
                 f"Error in requestMultiplierPositions: {error}"
             )
 
-    def request_save_multipliers(self):
+    def read_multiplier_positions(self):
         """
-        Save the multipliers in the database
+        Read the last multiplier positions received (memory), they are
+        requested in background when they are stale, so the game never
+        waits the backend
+        """
+        home_bet_game_id = GlobalVars.get_home_bet_game_id()
+        positions = sync_api_services.get_last_multiplier_positions(
+            home_bet_game_id=home_bet_game_id
+        )
+        if positions:
+            self.multiplier_positions = positions
+
+    def request_save_multipliers(self) -> bool:
+        """
+        Queue the multipliers pending to save,
+        they are saved in the database by the persistence worker, the
+        multiplier positions are requested again (background) when the
+        multipliers are saved
+        :return: True if the multipliers were queued
         """
         # TODO fix this
         if not GlobalVars.get_allowed_to_save_multipliers():
-            return
-        if len(self.multipliers_to_save) < self.MAX_MULTIPLIERS_TO_SAVE:
-            return
-        try:
-            _multipliers = [
+            return False
+        if self.multipliers_to_save < self.MAX_MULTIPLIERS_TO_SAVE:
+            return False
+        history = self.game_page.multipliers
+        home_bet_game_id = GlobalVars.get_home_bet_game_id()
+        self.persistence.save_multipliers(
+            home_bet_game_id=home_bet_game_id,
+            multipliers=[
                 APIMultiplierData(
-                    multiplier=item.multiplier,
-                    multiplier_dt=item.multiplier_dt,
+                    multiplier=multiplier,
+                    multiplier_dt=datetime.fromtimestamp(timestamp),
                 )
-                for item in self.multipliers_to_save
-            ]
-            api_services.add_multipliers(
-                home_bet_game_id=GlobalVars.get_home_bet_game_id(),
-                multipliers_data=_multipliers,
-            )
-            self.multipliers_to_save = []
-            SendEventToGUI.log.debug("multipliers saved")
-            self.request_multiplier_positions()
-        except Exception as error:
-            SendEventToGUI.log.debug(
-                f"error in requestSaveMultipliers: {error}"
-            )
+                for multiplier, timestamp in zip(
+                    history.to_list(self.multipliers_to_save),
+                    history.timestamps(self.multipliers_to_save).tolist(),
+                )
+            ],
+            on_saved=lambda: sync_api_services.refresh_multiplier_positions(
+                home_bet_game_id=home_bet_game_id
+            ),
+        )
+        self.multipliers_to_save = 0
+        return True
 
-    def request_save_bets(self):
+    def request_save_bets(self, bets: list[Bet]):
         """
-        Save the bets in the database
+        Queue the bets to save in the database (persistence worker)
+        :param bets: bets of the last round (with the multiplier result)
         """
-        if not self.bets:
+        if not bets:
             return
-        bets_to_save = [
-            BetData(
-                bet.external_id,
-                bet.prediction,
-                bet.multiplier,
-                round(bet.amount, 2),
-                bet.multiplier_result,
-            )
-            for bet in self.bets
-        ]
-        # SendEventToGUI.log.debug(_("saving bets"))  # noqa
-        try:
-            api_services.create_bets(
-                home_bet_id=self.home_bet.id,
-                bets=bets_to_save,
-            )
-            # SendEventToGUI.log.debug(_("bets saved"))  # noqa
-        except Exception as error:
-            SendEventToGUI.log.debug(
-                f"{_('Error in requestSaveBets')} :: {error}"  # noqa
-            )
+        self.persistence.save_bets(
+            home_bet_id=self.home_bet.id,
+            bets=[
+                BetData(
+                    bet.external_id,
+                    bet.prediction,
+                    bet.multiplier,
+                    round(bet.amount, 2),
+                    bet.multiplier_result,
+                )
+                for bet in bets
+            ],
+        )
 
     async def wait_next_game(self):
         """
@@ -227,11 +264,18 @@ class GameBase(abc.ABC, ConfigurationFactory):
         """
         SendEventToGUI.log.info(_("Waiting for the next game"))  # noqa
         await self.game_page.wait_next_game()
+        # the requests of the next bet start while the balance is read
+        self.prefetch_next_bet()
         self.balance = await self.read_balance_to_aviator()
         # TODO implement create manual bets
         self.bot.update_balance(self.balance)
         self.add_multiplier(self.game_page.multipliers[-1])
-        self.bets = []
+
+    def prefetch_next_bet(self) -> None:
+        """
+        Start the requests of the next bet (the new multiplier is
+        in the history), it is called before the balance is read
+        """
 
     async def send_bets_to_aviator(self):
         """
@@ -242,6 +286,13 @@ class GameBase(abc.ABC, ConfigurationFactory):
         await self.game_page.bet(
             bets=self.bets, use_auto_cash_out=GlobalVars.get_auto_cash_out()
         )
+        # time.time() when the multiplier was read
+        read_at = self.game_page.multipliers.timestamps(1)[-1]
+        crash_to_bet = time.time() - read_at
+        self.latencies.observe("crash_to_bet", crash_to_bet)
+        SendEventToGUI.log.debug(
+            f"crash to bet: {round(crash_to_bet * 1000)} ms"
+        )
 
     def evaluate_bets(self, multiplier: float) -> None:
         """
@@ -253,33 +304,52 @@ class GameBase(abc.ABC, ConfigurationFactory):
         """
         Add a new multiplier and update the multipliers
         """
+        # the multiplier is already in the history (game_page.wait_next_game)
         self.evaluate_bets(multiplier)
-        self.multipliers.append(Multiplier(multiplier))
         self.bot.add_multiplier(multiplier)
-        self.multipliers_to_save.append(Multiplier(multiplier))
-        self.request_save_bets()
-        self.request_save_multipliers()
-        # remove the first multiplier
-        self.multipliers = self.multipliers[1:]
+        self.add_multiplier_to_save()
         SendEventToGUI.send_multipliers([multiplier])
 
+    def add_multiplier_to_save(self):
+        # the multipliers pending to save can't exceed the history
+        self.multipliers_to_save = min(
+            self.multipliers_to_save + 1, self.game_page.multipliers.capacity
+        )
+
+    def request_round_data(self, bets: list[Bet]) -> asyncio.Future:
+        """
+        Send the data of the last round to the backend, the bets and
+        multipliers are queued and the requests run concurrently
+        :param bets: bets of the last round
+        """
+        self.request_save_bets(bets)
+        self.request_save_multipliers()
+        return asyncio.gather(self.request_customer_live())
+
     async def play(self):
         while self.initialized:
             await self.wait_next_game()
-            self.request_customer_live()
-            self.get_next_bet()
-            (
-                positions,
-                len_multipliers,
-            ) = self.bot.get_last_position_of_multipliers()
-            SendEventToGUI.send_multiplier_positions(
-                positions, len_multipliers
-            )
-            await self.send_bets_to_aviator()
+            last_bets, self.bets = self.bets, []
+            # only the next bet (prediction) is in the critical path,
+            # the data of the last round is saved meanwhile
+            round_data = self.request_round_data(last_bets)
+            try:
+                self.read_multiplier_positions()
+                await self.get_next_bet()
+                (
+                    positions,
+                    len_multipliers,
+                ) = self.bot.get_last_position_of_multipliers()
+                SendEventToGUI.send_multiplier_positions(
+                    positions, len_multipliers
+                )
+                await self.send_bets_to_aviator()
+            finally:
+                await round_data
             SendEventToGUI.log.info(
                 "*****************************************"
             )
         SendEventToGUI.log.error(_("The game is not initialized"))  # noqa
 
     @abc.abstractmethod
-    def get_next_bet(self) -> list[Bet]: ...
+    async def get_next_bet(self) -> list[Bet]: ...
@@ -1,8 +1,11 @@
+# Standard Library
+import asyncio
+
 # Internal
 from apps.game.bots.bot_strategy import BotStrategy
 from apps.game.games.constants import GameType
 from apps.game.games.game_base import GameBase
-from apps.game.models import Bet, Multiplier
+from apps.game.models import Bet
 from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.utils.display import format_amount_to_display
@@ -18,7 +21,6 @@ class GameStrategy(GameBase, configuration=GameType.STRATEGY.value):
     """
 
     def initialize_bot(self, *, bot_name: str):
-        multipliers_ = [item.multiplier for item in self.multipliers]
         self.BOT_NAME = bot_name
         self.bot = BotStrategy(
             bot_name=self.BOT_NAME,
@@ -28,36 +30,27 @@ class GameStrategy(GameBase, configuration=GameType.STRATEGY.value):
         )
         self.bot.initialize(
             balance=self.initial_balance,
-            multipliers=multipliers_,
+            multipliers=self.game_page.multipliers,
         )
 
     def add_multiplier(self, multiplier: float) -> None:
         """
         Add a new multiplier and update the multipliers
         """
+        # the multiplier is already in the history (game_page.wait_next_game)
         self.evaluate_bets(multiplier)
-        self.multipliers.append(Multiplier(multiplier))
         self.bot.add_multiplier(multiplier)
-        self.multipliers_to_save.append(Multiplier(multiplier))
-        self.request_save_multipliers()
-        # remove the first multiplier
-        self.multipliers = self.multipliers[1:]
+        self.add_multiplier_to_save()
         SendEventToGUI.send_multipliers([multiplier])
 
-    async def wait_next_game(self):
+    def request_round_data(self, bets: list[Bet]) -> asyncio.Future:
         """
-        Wait for the next game to start
-        override the base method to not save customer balance
+        the bets of this game are not saved
         """
-        SendEventToGUI.log.info(_("Waiting for the next game"))  # noqa
-        await self.game_page.wait_next_game()
-        self.balance = await self.read_balance_to_aviator()
-        # TODO implement create manual bets
-        self.bot.update_balance(self.balance)
-        self.add_multiplier(self.game_page.multipliers[-1])
-        self.bets = []
+        self.request_save_multipliers()
+        return asyncio.gather(self.request_customer_live())
 
-    def get_next_bet(self) -> list[Bet]:
+    async def get_next_bet(self) -> list[Bet]:
         auto_play = GlobalVars.get_auto_play()
         only_bullish_games = self.bot.ONLY_BULLISH_GAMES
         is_bullish_game = self.bot.is_bullish_game
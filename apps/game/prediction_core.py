@@ -1,15 +1,38 @@
+# Standard Library
+import heapq
+from collections import deque
+from typing import Optional
+
 # Internal
 from apps.api.models import Prediction
+from apps.game.utils import get_multiplier_category
 
 
 class PredictionCore:
-    def __init__(self, *, id: int, average_predictions: float):
+    # length of the lists of predictions and results
+    MAX_LENGTH = 500
+    CATEGORIES = (1, 2)
+
+    def __init__(
+        self,
+        *,
+        id: int,
+        average_predictions: float,
+        window: Optional[int] = None,
+    ):
+        """
+        :param id: id of the model
+        :param average_predictions: average of the model (backend)
+        :param window: number of results to calculate the accuracy,
+         None to use all the results
+        """
         self.id = id
         self.average_predictions_of_model = average_predictions
-        self.prediction_values = []
-        self.prediction_rounds = []
-        self.probability_values = []
-        self.multiplier_results = []
+        self.window = window
+        self.prediction_values = deque(maxlen=self.MAX_LENGTH)
+        self.prediction_rounds = deque(maxlen=self.MAX_LENGTH)
+        self.probability_values = deque(maxlen=self.MAX_LENGTH)
+        self.multiplier_results = deque(maxlen=self.MAX_LENGTH)
         self.category_percentages = {
             1: None,
             2: None,
@@ -20,6 +43,18 @@ class PredictionCore:
             2: None,
             3: None,
         }
+        # predictions without result: (value, round)
+        self._pending = deque(maxlen=self.MAX_LENGTH)
+        # results evaluated in the window: (round, correct, value_in_live)
+        self._evaluated = deque(maxlen=window) if window else None
+        # all the results evaluated
+        self.results_count = 0
+        # results and correct results in the window
+        self._evaluated_count = 0
+        self._correct_count = 0
+        self._category_counts = dict.fromkeys(self.CATEGORIES, 0)
+        self._category_hits = dict.fromkeys(self.CATEGORIES, 0)
+        self._category_hits_in_live = dict.fromkeys(self.CATEGORIES, 0)
 
     def add_prediction(
         self,
@@ -32,6 +67,7 @@ class PredictionCore:
         self.prediction_values.append(prediction)
         self.prediction_rounds.append(prediction_round)
         self.probability_values.append(probability)
+        self._pending.append((prediction, prediction_round))
         self.average_predictions_of_model = average_predictions
         if self.category_percentages[prediction_round] is None:
             self.category_percentages[prediction_round] = (
@@ -42,45 +78,56 @@ class PredictionCore:
                 category_percentage  # NOQA
             )
 
+    def has_pending_prediction(self) -> bool:
+        return bool(self._pending)
+
     def add_multiplier_result(self, multiplier: float):
         self.multiplier_results.append(multiplier)
+        if not self._pending:
+            return
+        value, value_round = self._pending.popleft()
+        result = (
+            value_round,
+            value_round == get_multiplier_category(multiplier),
+            value <= multiplier,
+        )
+        if self._evaluated is not None:
+            if len(self._evaluated) == self._evaluated.maxlen:
+                # the oldest result leaves the window
+                self._update_counters(*self._evaluated[0], sign=-1)
+            self._evaluated.append(result)
+        self._update_counters(*result, sign=1)
+        self.results_count += 1
         self.calculate_average_model_prediction()
         self.calculate_category_percentages()
 
+    def _update_counters(
+        self, value_round: int, correct: bool, value_in_live: bool, sign: int
+    ):
+        self._evaluated_count += sign
+        self._correct_count += sign * correct
+        if value_round not in self._category_counts:
+            return
+        self._category_counts[value_round] += sign
+        self._category_hits[value_round] += sign * correct
+        self._category_hits_in_live[value_round] += sign * value_in_live
+
     def calculate_category_percentages(self):
-        for i in range(1, 3):
-            count_i = 0
-            count = 0
-            count_values = 0
-            for j in range(len(self.prediction_rounds)):
-                value_round = self.prediction_rounds[j]
-                value = self.prediction_values[j]
-                if value_round == i:
-                    count_i += 1
-                    round_multiplier = round(self.multiplier_results[j], 0)
-                    round_multiplier = (
-                        2 if round_multiplier >= 2 else round_multiplier
-                    )
-                    if value_round == round_multiplier:
-                        count += 1
-                    if value <= self.multiplier_results[j]:
-                        count_values += 1
+        for i in self.CATEGORIES:
+            count_i = self._category_counts[i]
+            count = self._category_hits[i]
             if count == 0 or count_i == 0:
                 continue
-            self.category_percentages[i] = round(count / count_i, 2)  # noqa
-            self.category_percentages_values_in_live[i] = round(  # noqa
-                count_values / count_i, 2  # noqa
-            )  # noqa
+            self.category_percentages[i] = round(count / count_i, 2)
+            self.category_percentages_values_in_live[i] = round(
+                self._category_hits_in_live[i] / count_i, 2
+            )
 
     def calculate_average_model_prediction(self):
-        correct_values_count = 0
-        for i in range(len(self.multiplier_results)):
-            round_multiplier = round(self.multiplier_results[i], 0)
-            round_multiplier = 2 if round_multiplier >= 2 else round_multiplier
-            if self.prediction_rounds[i] == round_multiplier:
-                correct_values_count += 1
+        if not self._evaluated_count:
+            return
         self.average_predictions_of_model = round(
-            correct_values_count / len(self.multiplier_results), 2
+            self._correct_count / self._evaluated_count, 2
         )
 
     def get_prediction_value(self) -> int:
@@ -105,12 +152,35 @@ class PredictionCore:
 
 class PredictionModel:
     __instance = None
-    predictions = []
     MAX_RESULTS_TO_EVALUATE = 18
+    # responses that a model can be missing before it is discarded
+    # (with its history), None to keep it always
+    MAX_MISSING_RESPONSES: Optional[int] = 10
 
-    def __init__(self):
-        if not PredictionModel.__instance:
-            PredictionModel.__instance = self
+    def __init__(
+        self,
+        accuracy_window: Optional[int] = None,
+        max_missing_responses: Optional[int] = MAX_MISSING_RESPONSES,
+    ):
+        """
+        :param accuracy_window: number of results to calculate the accuracy
+         of the models, None to use all the results
+        :param max_missing_responses: responses that a model can be missing
+         before it is discarded, 0 to discard it in the first response
+         without it, None to keep it always
+        """
+        self.accuracy_window = accuracy_window
+        self.max_missing_responses = max_missing_responses
+        self.models: dict[int, PredictionCore] = {}
+        # models of the last response: id -> position in the response
+        self._active: dict[int, int] = {}
+        # models missing in the last responses: id -> responses missing
+        self._missing: dict[int, int] = {}
+        # best models: (-average, position, version, id), the entries with
+        # an old version or of a model not active are ignored
+        self._heap: list[tuple[float, int, int, int]] = []
+        self._versions: dict[int, int] = {}
+        self._version = 0
 
     @staticmethod
     def get_instance():
@@ -118,22 +188,42 @@ class PredictionModel:
             PredictionModel.__instance = PredictionModel()
         return PredictionModel.__instance
 
+    @property
+    def predictions(self) -> list[PredictionCore]:
+        """
+        models of the last response
+        """
+        return [self.models[id_] for id_ in self._active]
+
+    def _heap_entry(
+        self, model: PredictionCore
+    ) -> tuple[float, int, int, int]:
+        self._version += 1
+        self._versions[model.id] = self._version
+        return (
+            -model.average_predictions_of_model,
+            self._active[model.id],
+            self._version,
+            model.id,
+        )
+
+    def _remove_model(self, id_: int):
+        self.models.pop(id_, None)
+        self._active.pop(id_, None)
+        self._missing.pop(id_, None)
+        self._versions.pop(id_, None)
+
     def add_predictions(self, predictions: list[Prediction]):
-        new_predictions = []
+        active = {}
         for prediction in predictions:
-            prediction_ = next(
-                (
-                    item
-                    for item in self.predictions
-                    if item.id == prediction.id
-                ),
-                None,
-            )
+            prediction_ = self.models.get(prediction.id)
             if not prediction_:
                 prediction_ = PredictionCore(
                     id=prediction.id,
                     average_predictions=prediction.average_predictions,
+                    window=self.accuracy_window,
                 )
+                self.models[prediction.id] = prediction_
             prediction_.add_prediction(
                 prediction.prediction,
                 prediction.prediction_round,
@@ -141,33 +231,43 @@ class PredictionModel:
                 prediction.average_predictions,
                 prediction.category_percentage,
             )
-            new_predictions.append(prediction_)
-        self.predictions = new_predictions
+            active[prediction.id] = len(active)
+            self._missing.pop(prediction.id, None)
+        for id_ in self._active.keys() - active.keys():
+            self._missing[id_] = 0
+        self._active = active
+        for id_ in list(self._missing):
+            self._missing[id_] += 1
+            if (
+                self.max_missing_responses is not None
+                and self._missing[id_] > self.max_missing_responses
+            ):
+                self._remove_model(id_)
+        # all the active models have a new average
+        self._heap = [self._heap_entry(self.models[id_]) for id_ in active]
+        heapq.heapify(self._heap)
 
     def add_multiplier_result(self, multiplier: float):
-        for prediction in self.predictions:
-            if len(prediction.multiplier_results) < len(
-                prediction.prediction_rounds
-            ):
-                prediction.add_multiplier_result(multiplier)
+        for prediction in self.models.values():
+            if not prediction.has_pending_prediction():
+                continue
+            prediction.add_multiplier_result(multiplier)
+            if prediction.id in self._active:
+                heapq.heappush(self._heap, self._heap_entry(prediction))
 
     def evaluate_models(self, min_bot_average_prediction_model: float):
-        self.predictions = [
-            p
-            for p in self.predictions
-            if p.average_predictions_of_model
-            > min_bot_average_prediction_model
-            or len(p.multiplier_results) < self.MAX_RESULTS_TO_EVALUATE
-        ]
-
-    def get_best_prediction(self) -> PredictionCore | None:
-        if not self.predictions:
-            return None
-        best_prediction = self.predictions[0]
-        for pre in self.predictions:
+        for prediction in list(self.models.values()):
             if (
-                pre.average_predictions_of_model
-                > best_prediction.average_predictions_of_model
+                prediction.average_predictions_of_model
+                <= min_bot_average_prediction_model
+                and prediction.results_count >= self.MAX_RESULTS_TO_EVALUATE
             ):
-                best_prediction = pre
-        return best_prediction
+                self._remove_model(prediction.id)
+
+    def get_best_prediction(self) -> PredictionCore | None:
+        while self._heap:
+            _, _, version, id_ = self._heap[0]
+            if id_ in self._active and self._versions[id_] == version:
+                return self.models[id_]
+            heapq.heappop(self._heap)
+        return None
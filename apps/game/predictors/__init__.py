@@ -0,0 +1,6 @@
+# Internal
+from apps.game.predictors.predictors import (  # noqa
+    FrequencyPredictor,
+    LogisticPredictor,
+    MarkovPredictor,
+)
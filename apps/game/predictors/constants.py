@@ -0,0 +1,8 @@
+# Standard Library
+from enum import Enum
+
+
+class PredictorType(str, Enum):
+    MARKOV = "markov"
+    FREQUENCY = "frequency"
+    LOGISTIC = "logistic"
@@ -0,0 +1,192 @@
+# Standard Library
+import abc
+import json
+import os
+from typing import Optional, Sequence
+
+# Libraries
+import numpy as np
+
+# Internal
+from apps.api.models import Prediction
+from apps.game.predictors.constants import PredictorType
+from apps.utils.patterns.factory import ConfigurationFactory
+
+
+class LocalPredictor(abc.ABC, ConfigurationFactory):
+    """
+    Prediction model that runs in the bot (without the backend), it
+    predicts the category of the next multiplier (1: < 2, 2: >= 2) and
+    returns the same Prediction of the backend, so PredictionModel and
+    BotAI use it without changes.
+    To implement a new predictor you need to create a new class with a
+    configuration (PredictorType), it needs be imported in the file
+    apps/game/predictors/__init__.py
+    """
+
+    TYPE: PredictorType
+    # the ids of the backend models are positive
+    ID: int = -1
+    # value of the prediction by category
+    PREDICTION_VALUES = {1: 1.0, 2: 2.0}
+    # part of the history (the newest multipliers) that is not learned
+    # before the accuracy is measured with it
+    HOLDOUT: float = 0.3
+
+    def __init__(self, **kwargs):
+        # hits / predictions in the held out history (HOLDOUT)
+        self.accuracy: float = 0
+        # hits / predictions of every category in the held out history
+        self.category_percentages: dict[int, float] = {1: 0, 2: 0}
+        self.trained = False
+
+    @property
+    @abc.abstractmethod
+    def min_history(self) -> int:
+        """
+        multipliers needed to predict
+        """
+
+    @abc.abstractmethod
+    def get_params(self) -> dict[str, any]:
+        """
+        arguments of the constructor
+        """
+
+    @abc.abstractmethod
+    def _get_state(self) -> dict[str, any]:
+        """
+        learned values (json serializable)
+        """
+
+    @abc.abstractmethod
+    def _set_state(self, state: dict[str, any]): ...
+
+    @abc.abstractmethod
+    def _fit(self, multipliers: np.ndarray): ...
+
+    @abc.abstractmethod
+    def _probabilities(self, multipliers: np.ndarray) -> np.ndarray:
+        """
+        :param multipliers: history (at least min_history multipliers)
+        :return: probability that the next multiplier is category 2 for
+         every window of min_history multipliers (the last is the next
+         multiplier of the history)
+        """
+
+    @staticmethod
+    def categories(multipliers: np.ndarray) -> np.ndarray:
+        """
+        categories of the multipliers (game_utils.get_multiplier_category)
+        """
+        return np.where(np.round(multipliers) >= 2, 2, 1)
+
+    def fit(self, multipliers: Sequence[float]) -> "LocalPredictor":
+        """
+        train the predictor with a history of multipliers (the oldest
+        first) and calculate its accuracy with the newest multipliers
+        (HOLDOUT) before they are learned, without enough history for
+        them the accuracy is 0
+        """
+        multipliers = np.asarray(multipliers, dtype=np.float64)
+        if len(multipliers) <= self.min_history:
+            raise ValueError(
+                f"{type(self).__name__} needs more than "
+                f"{self.min_history} multipliers"
+            )
+        min_history = self.min_history
+        self.accuracy = 0
+        self.category_percentages = {1: 0, 2: 0}
+        split = max(
+            round(len(multipliers) * (1 - self.HOLDOUT)), min_history + 1
+        )
+        if split < len(multipliers):
+            self._fit(multipliers[:split])
+            start = split - min_history
+            held_out = multipliers[start:]
+            self._evaluate(held_out)
+        self._fit(multipliers)
+        self.trained = True
+        return self
+
+    def _evaluate(self, multipliers: np.ndarray):
+        """
+        accuracy of the predictions of the multipliers after the first
+        window of the history
+        """
+        predicted = np.where(
+            self._probabilities(multipliers)[:-1] >= 0.5, 2, 1
+        )
+        min_history = self.min_history
+        results = self.categories(multipliers[min_history:])
+        hits = predicted == results
+        self.accuracy = round(float(hits.mean()), 2)
+        for category in self.category_percentages:
+            in_category = predicted == category
+            if in_category.any():
+                self.category_percentages[category] = round(
+                    float(hits[in_category].mean()), 2
+                )
+
+    def update(self, multipliers: np.ndarray):
+        """
+        learn the last multiplier of the history (online predictors)
+        """
+
+    def predict(self, multipliers: np.ndarray) -> Optional[Prediction]:
+        """
+        :param multipliers: history with the last multiplier at the end
+        :return: prediction of the next multiplier, None when it is not
+         trained or the history is too short
+        """
+        min_history = self.min_history
+        if not self.trained or len(multipliers) < min_history:
+            return None
+        window = np.asarray(multipliers[-min_history:], dtype=np.float64)
+        probability = float(self._probabilities(window)[-1])
+        category = 2 if probability >= 0.5 else 1
+        if category == 1:
+            probability = 1 - probability
+        return Prediction(
+            id=self.ID,
+            prediction=self.PREDICTION_VALUES[category],
+            prediction_round=category,
+            probability=round(probability, 2),
+            average_predictions=self.accuracy,
+            category_percentage=self.category_percentages[category],
+        )
+
+    def to_dict(self) -> dict[str, any]:
+        return dict(
+            type=self.TYPE.value,
+            params=self.get_params(),
+            state=self._get_state(),
+            accuracy=self.accuracy,
+            category_percentages=self.category_percentages,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, any]) -> "LocalPredictor":
+        predictor = LocalPredictor(
+            configuration=data["type"], **data["params"]
+        )
+        predictor._set_state(data["state"])
+        predictor.accuracy = data["accuracy"]
+        predictor.category_percentages = {
+            int(category): percentage
+            for category, percentage in data["category_percentages"].items()
+        }
+        predictor.trained = True
+        return predictor
+
+    def save(self, file_name: str):
+        file_dir = os.path.dirname(file_name)
+        if file_dir:
+            os.makedirs(file_dir, exist_ok=True)
+        with open(file_name, "w") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, file_name: str) -> "LocalPredictor":
+        with open(file_name, "r") as file:
+            return cls.from_dict(json.load(file))
@@ -0,0 +1,206 @@
+# Libraries
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Internal
+from apps.game.predictors.constants import PredictorType
+from apps.game.predictors.predictor_base import LocalPredictor
+
+
+class MarkovPredictor(
+    LocalPredictor, configuration=PredictorType.MARKOV.value
+):
+    """
+    Markov chain over the categories, the probability of the next
+    category is the frequency of the transitions from the last `order`
+    categories. It learns every new multiplier (update).
+    """
+
+    TYPE = PredictorType.MARKOV
+    ID = -1
+
+    def __init__(self, *, order: int = 3, smoothing: float = 1, **kwargs):
+        """
+        :param order: number of categories of a state
+        :param smoothing: transitions added to every state (laplace)
+        """
+        super().__init__(**kwargs)
+        self.order = order
+        self.smoothing = smoothing
+        # transitions: state -> [to category 1, to category 2]
+        self.transitions = np.full((2**order, 2), float(smoothing))
+        # state of the categories of a window (the last is the lowest bit)
+        self._weights = 2 ** np.arange(order - 1, -1, -1)
+
+    @property
+    def min_history(self) -> int:
+        return self.order
+
+    def get_params(self) -> dict[str, any]:
+        return dict(order=self.order, smoothing=self.smoothing)
+
+    def _get_state(self) -> dict[str, any]:
+        return dict(transitions=self.transitions.tolist())
+
+    def _set_state(self, state: dict[str, any]):
+        self.transitions = np.array(state["transitions"], dtype=np.float64)
+
+    def _states(self, multipliers: np.ndarray) -> np.ndarray:
+        is_category_2 = self.categories(multipliers) - 1
+        return sliding_window_view(is_category_2, self.order) @ self._weights
+
+    def _fit(self, multipliers: np.ndarray):
+        order = self.order
+        self.transitions = np.full((2**order, 2), float(self.smoothing))
+        states = self._states(multipliers)[:-1]
+        results = self.categories(multipliers[order:]) - 1
+        np.add.at(self.transitions, (states, results), 1)
+
+    def _probabilities(self, multipliers: np.ndarray) -> np.ndarray:
+        transitions = self.transitions[self._states(multipliers)]
+        return transitions[:, 1] / transitions.sum(axis=1)
+
+    def update(self, multipliers: np.ndarray):
+        window_length = self.order + 1
+        if not self.trained or len(multipliers) < window_length:
+            return
+        window = np.asarray(multipliers[-window_length:], dtype=np.float64)
+        state = self._states(window[:-1])[0]
+        result = self.categories(window[-1:])[0] - 1
+        self.transitions[state, result] += 1
+
+
+class FrequencyPredictor(
+    LocalPredictor, configuration=PredictorType.FREQUENCY.value
+):
+    """
+    The probability of the next category 2 is its frequency in the last
+    `window` multipliers (it doesn't learn values).
+    """
+
+    TYPE = PredictorType.FREQUENCY
+    ID = -2
+
+    def __init__(self, *, window: int = 20, smoothing: float = 1, **kwargs):
+        """
+        :param window: number of multipliers
+        :param smoothing: multipliers of every category added (laplace)
+        """
+        super().__init__(**kwargs)
+        self.window = window
+        self.smoothing = smoothing
+
+    @property
+    def min_history(self) -> int:
+        return self.window
+
+    def get_params(self) -> dict[str, any]:
+        return dict(window=self.window, smoothing=self.smoothing)
+
+    def _get_state(self) -> dict[str, any]:
+        return {}
+
+    def _set_state(self, state: dict[str, any]):
+        pass
+
+    def _fit(self, multipliers: np.ndarray):
+        pass
+
+    def _probabilities(self, multipliers: np.ndarray) -> np.ndarray:
+        is_category_2 = self.categories(multipliers) - 1
+        counts = sliding_window_view(is_category_2, self.window).sum(axis=1)
+        return (counts + self.smoothing) / (self.window + 2 * self.smoothing)
+
+
+class LogisticPredictor(
+    LocalPredictor, configuration=PredictorType.LOGISTIC.value
+):
+    """
+    Logistic regression on the logarithm of the last `lags` multipliers,
+    it is trained with gradient descent (fit) and it doesn't learn in
+    the game.
+    """
+
+    TYPE = PredictorType.LOGISTIC
+    ID = -3
+
+    def __init__(
+        self,
+        *,
+        lags: int = 10,
+        learning_rate: float = 0.1,
+        iterations: int = 500,
+        regularization: float = 0.01,
+        **kwargs,
+    ):
+        """
+        :param lags: number of multipliers of the features
+        :param learning_rate: step of the gradient descent
+        :param iterations: iterations of the gradient descent
+        :param regularization: L2 penalty of the weights
+        """
+        super().__init__(**kwargs)
+        self.lags = lags
+        self.learning_rate = learning_rate
+        self.iterations = iterations
+        self.regularization = regularization
+        self.weights = np.zeros(lags)
+        self.bias = 0.0
+        # standardization of the features
+        self.mean = np.zeros(lags)
+        self.std = np.ones(lags)
+
+    @property
+    def min_history(self) -> int:
+        return self.lags
+
+    def get_params(self) -> dict[str, any]:
+        return dict(
+            lags=self.lags,
+            learning_rate=self.learning_rate,
+            iterations=self.iterations,
+            regularization=self.regularization,
+        )
+
+    def _get_state(self) -> dict[str, any]:
+        return dict(
+            weights=self.weights.tolist(),
+            bias=self.bias,
+            mean=self.mean.tolist(),
+            std=self.std.tolist(),
+        )
+
+    def _set_state(self, state: dict[str, any]):
+        self.weights = np.array(state["weights"], dtype=np.float64)
+        self.bias = float(state["bias"])
+        self.mean = np.array(state["mean"], dtype=np.float64)
+        self.std = np.array(state["std"], dtype=np.float64)
+
+    def _features(self, multipliers: np.ndarray) -> np.ndarray:
+        return sliding_window_view(np.log(multipliers), self.lags)
+
+    def _fit(self, multipliers: np.ndarray):
+        lags = self.lags
+        features = self._features(multipliers)[:-1]
+        results = self.categories(multipliers[lags:]) - 1
+        self.mean = features.mean(axis=0)
+        self.std = features.std(axis=0)
+        self.std[self.std == 0] = 1
+        features = (features - self.mean) / self.std
+        self.weights = np.zeros(self.lags)
+        self.bias = 0.0
+        for _ in range(self.iterations):
+            errors = self._sigmoid(features @ self.weights + self.bias)
+            errors -= results
+            gradient = features.T @ errors / len(results)
+            gradient += self.regularization * self.weights
+            self.weights -= self.learning_rate * gradient
+            self.bias -= self.learning_rate * float(errors.mean())
+
+    @staticmethod
+    def _sigmoid(values: np.ndarray) -> np.ndarray:
+        return 1 / (1 + np.exp(-values))
+
+    def _probabilities(self, multipliers: np.ndarray) -> np.ndarray:
+        features = (self._features(multipliers) - self.mean) / self.std
+        return self._sigmoid(features @ self.weights + self.bias)
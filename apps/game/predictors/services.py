@@ -0,0 +1,73 @@
+"""
+load and train (offline) the local predictors
+usage: python -m apps.game.predictors.services <history.csv> [type]
+"""
+
+# Standard Library
+import os
+import sys
+from typing import Optional
+
+# Internal
+from apps.game.predictors.constants import PredictorType
+from apps.game.predictors.predictor_base import LocalPredictor
+from apps.game.utils import load_multipliers
+
+PREDICTORS_PATH = "data/local_predictors"
+
+
+def get_predictor_file(predictor_type: str) -> str:
+    return os.path.join(PREDICTORS_PATH, f"{predictor_type}.json")
+
+
+def load_local_predictor(predictor_type: str) -> Optional[LocalPredictor]:
+    """
+    the trained predictor (train_local_predictor) if it was saved,
+    otherwise a predictor to train with the history of the game
+    :return: None if the type is not a PredictorType (disabled)
+    """
+    if predictor_type not in {type_.value for type_ in PredictorType}:
+        return None
+    file_name = get_predictor_file(predictor_type)
+    if os.path.exists(file_name):
+        return LocalPredictor.load(file_name)
+    return LocalPredictor(configuration=predictor_type)
+
+
+def train_local_predictor(
+    *,
+    file_name: str,
+    predictor_type: str,
+    output: Optional[str] = None,
+    **params,
+) -> LocalPredictor:
+    """
+    train a predictor with an exported history and save it
+    :param file_name: csv file with the multipliers (the oldest first)
+    :param predictor_type: PredictorType
+    :param output: file of the predictor, default the file that the game
+     loads (get_predictor_file)
+    :param params: arguments of the predictor
+    """
+    multipliers = load_multipliers(file_name)
+    predictor = LocalPredictor(configuration=predictor_type, **params)
+    predictor.fit(multipliers)
+    predictor.save(output or get_predictor_file(predictor_type))
+    return predictor
+
+
+def main():
+    file_name = sys.argv[1]
+    types = sys.argv[2:] or [type_.value for type_ in PredictorType]
+    for predictor_type in types:
+        predictor = train_local_predictor(
+            file_name=file_name, predictor_type=predictor_type
+        )
+        print(
+            f"{predictor_type}: accuracy {predictor.accuracy} "
+            f"categories {predictor.category_percentages}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 # Standard Library
-import copy
 import random
-from typing import Optional
+from typing import Optional, Sequence
 
 # Internal
 from apps.api.models import MultiplierPositions
+from apps.utils import csv as utils_csv
 
 
 def generate_random_multiplier(min_: float, max_: float) -> float:
@@ -57,22 +57,75 @@ def adaptive_kelly_formula(
     return round(capital * f, 2)
 
 
+def get_multiplier_category(multiplier: float) -> int:
+    """
+    category of the multiplier as the predictions are evaluated (1 or 2)
+    """
+    return 2 if round(multiplier, 0) >= 2 else 1
+
+
 def get_last_position_multiplier(
-    *, multiplier: int, last_multipliers: list[float]
+    *, multiplier: int, last_multipliers: Sequence[float]
 ) -> int:
-    multi = copy.copy(last_multipliers)
-    multi.reverse()
-    for i in range(len(multi)):
-        if multi[i] >= multiplier:
+    for i, value in enumerate(reversed(last_multipliers)):
+        if value >= multiplier:
             return i + 1
     return -1
 
 
+class LastPositionIndex:
+    """
+    Rounds since the last multiplier >= threshold (the same value of
+    get_last_position_multiplier) for every threshold used.
+    The positions are updated with every new multiplier, a new threshold
+    is calculated once from the history.
+    """
+
+    def __init__(self, max_length: int, length: Optional[int] = 0):
+        """
+        :param max_length: maximum length of the history
+        :param length: current length of the history
+        """
+        self.max_length = max_length
+        self.length = min(length, max_length)
+        # threshold: position (-1 if it's not in the history)
+        self._positions: dict[float, int] = {}
+
+    def add_multiplier(self, multiplier: float):
+        self.length = min(self.length + 1, self.max_length)
+        for threshold, position in self._positions.items():
+            if multiplier >= threshold:
+                position = 1
+            elif position > 0:
+                position += 1
+                # the multiplier is not in the history anymore
+                if position > self.length:
+                    position = -1
+            self._positions[threshold] = position
+
+    def get_position(
+        self, threshold: float, last_multipliers: Sequence[float]
+    ) -> int:
+        """
+        :param threshold: multiplier to search
+        :param last_multipliers: history (used only for a new threshold)
+        :return: position of the last multiplier >= threshold or -1
+        """
+        position = self._positions.get(threshold)
+        if position is None:
+            position = get_last_position_multiplier(
+                multiplier=threshold, last_multipliers=last_multipliers
+            )
+            self._positions[threshold] = position
+        return position
+
+
 def predict_next_multiplier(
     *,
     data: MultiplierPositions,
-    last_multipliers: list[float],
-    use_all_time: Optional[bool] = True
+    last_multipliers: Sequence[float],
+    use_all_time: Optional[bool] = True,
+    last_positions: Optional[LastPositionIndex] = None,
 ) -> tuple[int, float]:
     """
     predict the next multiplier range.
@@ -80,6 +133,7 @@ def predict_next_multiplier(
     :param data: data from backend
     :param last_multipliers:
     :param use_all_time: if True, use all_time data, else use today data
+    :param last_positions: index of the last positions of last_multipliers
     :return: tuple(next_value, percentage)
     """
 
@@ -91,7 +145,7 @@ def predict_next_multiplier(
     #             return i + 1
     #     return -1
 
-    if not last_multipliers or not data:
+    if not len(last_multipliers) or not data:
         return 0, 0
     data_ = data.all_time if use_all_time else data.today
     max_value = (0, 0)
@@ -100,9 +154,12 @@ def predict_next_multiplier(
         multiplier = int(key)
         if multiplier < 2:
             continue
-        index_ = get_last_position_multiplier(
-            multiplier=multiplier, last_multipliers=last_multipliers
-        )
+        if last_positions:
+            index_ = last_positions.get_position(multiplier, last_multipliers)
+        else:
+            index_ = get_last_position_multiplier(
+                multiplier=multiplier, last_multipliers=last_multipliers
+            )
         if index_ < 0:
             continue
         count = int(values.count)
@@ -114,3 +171,17 @@ def predict_next_multiplier(
                 if max_value[1] < percentage:
                     max_value = (multiplier, percentage)
     return max_value
+
+
+def load_multipliers(
+    file_name: str, *, column: Optional[str] = "multiplier"
+) -> list[float]:
+    """
+    read the multiplier history from a csv file
+    @param file_name: path of the csv file
+    @param column: column with the multipliers
+    """
+    data = utils_csv.read_data(file_name)
+    if not data:
+        return []
+    return [float(row[column]) for row in data if row.get(column)]
@@ -76,6 +76,19 @@ def set_max_amount_to_bet_event(data: dict[str, any]) -> dict[str, any]:
     return data
 
 
+def latencies_event(**_kwargs) -> dict[str, any]:
+    """
+    latency histograms (ms) of the game loop and of the bet steps
+    """
+    game = GlobalVars.get_game()
+    if not game or not game.initialized:
+        return make_error("game is not running")
+    return dict(
+        game=game.latencies.to_dict(),
+        bet=game.game_page.bet_latencies.to_dict(),
+    )
+
+
 async def close_game_event(**_kwargs) -> dict[str, any]:
     game = GlobalVars.get_game()
     if not game:
@@ -58,6 +58,12 @@ async def set_max_amount_to_bet(sid, data, room=None):
     await sio.emit(WSEvent.SET_MAX_AMOUNT_TO_BET, data=data_, room=sid)
 
 
+@sio.on(WSEvent.LATENCIES)
+async def latencies(sid, data=None, room=None):
+    data_ = events.latencies_event()
+    await sio.emit(WSEvent.LATENCIES, data=data_, room=sid)
+
+
 @sio.on(WSEvent.CLOSE_GAME)
 async def close_game(sid, data, room=None):
     data_ = await events.close_game_event()
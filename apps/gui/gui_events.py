@@ -1,4 +1,6 @@
 # Standard Library
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
 from typing import Optional
 
@@ -25,6 +27,33 @@ class LogCode(str, Enum):
     DEBUG = "debug"
 
 
+# when False the events are discarded (no-op sink), it is used by the
+# backtesting engine to run the bots without GUI, socket or DB logs
+_gui_events_enabled: ContextVar[bool] = ContextVar(
+    "gui_events_enabled", default=True
+)
+
+
+@contextmanager
+def disable_gui_events():
+    """
+    Discard every event sent with SendEventToGUI inside the context.
+    The flag is a ContextVar, so the live game running in other
+    thread or task keeps sending its events
+    """
+    token = _gui_events_enabled.set(False)
+    try:
+        yield
+    finally:
+        _gui_events_enabled.reset(token)
+
+
+def _emit_to_gui(event: GUIEvent, data: any):
+    if not _gui_events_enabled.get():
+        return
+    GlobalVars.emit_to_gui(event, data)
+
+
 def _send_log_to_gui(data: any, code: Optional[LogCode] = LogCode.INFO):
     """
     Send log message to GUI
@@ -32,11 +61,14 @@ def _send_log_to_gui(data: any, code: Optional[LogCode] = LogCode.INFO):
     :param code: LogCode
     :return: None
     """
+    if not _gui_events_enabled.get():
+        return
     data = {"message": data} if isinstance(data, str) else data
     data.update(code=code.value)
-    GlobalVars.emit_to_gui(GUIEvent.LOG, data)
+    _emit_to_gui(GUIEvent.LOG, data)
+    # the path is the caller of SendEventToGUI.log.<code>
     log_services.save_game_log(
-        message=data.get("message"), level=data.get("code")
+        message=data.get("message"), level=data.get("code"), stacklevel=3
     )
 
 
@@ -60,7 +92,7 @@ class SendEventToGUI:
 
         @staticmethod
         def debug(message: str):
-            if not GlobalVars.config.DEBUG:
+            if not _gui_events_enabled.get() or not GlobalVars.config.DEBUG:
                 return
             _send_log_to_gui(message, LogCode.DEBUG)
 
@@ -68,16 +100,14 @@ class SendEventToGUI:
 
     @staticmethod
     def send_balance(*, balance: float, initial_balance: float):
-        GlobalVars.emit_to_gui(
+        _emit_to_gui(
             GUIEvent.UPDATE_BALANCE,
             dict(balance=balance, initial_balance=initial_balance),
         )
 
     @staticmethod
     def send_multipliers(multipliers: list[float]):
-        GlobalVars.emit_to_gui(
-            GUIEvent.ADD_MULTIPLIERS, dict(multipliers=multipliers)
-        )
+        _emit_to_gui(GUIEvent.ADD_MULTIPLIERS, dict(multipliers=multipliers))
 
     @staticmethod
     def send_multiplier_positions(
@@ -88,22 +118,20 @@ class SendEventToGUI:
         @param positions: tuple of list of multipliers
         @param len_multipliers: length of multipliers
         """
-        GlobalVars.emit_to_gui(
+        _emit_to_gui(
             GUIEvent.RECEIVE_MULTIPLIER_POSITIONS,
             data=dict(positions=positions, len_multipliers=len_multipliers),
         )
 
     @staticmethod
     def game_loaded(is_game_loaded: bool):
-        GlobalVars.emit_to_gui(
-            GUIEvent.GAME_LOADED, dict(loaded=is_game_loaded)
-        )
+        _emit_to_gui(GUIEvent.GAME_LOADED, dict(loaded=is_game_loaded))
 
     @staticmethod
     def error(error: str):
-        GlobalVars.emit_to_gui(GUIEvent.ERROR, dict(error=error))
+        _emit_to_gui(GUIEvent.ERROR, dict(error=error))
 
     @staticmethod
     def exception(exception: any):
         exception = isinstance(exception, str) and exception or str(exception)
-        GlobalVars.emit_to_gui(GUIEvent.EXCEPTION, dict(exception=exception))
+        _emit_to_gui(GUIEvent.EXCEPTION, dict(exception=exception))
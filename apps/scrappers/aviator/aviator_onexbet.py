@@ -6,7 +6,7 @@ from apps.game.bookmakers.constants import BookmakerIDS
 from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.scrappers.aviator.aviator_base import AviatorBase
-from apps.utils.datetime import sleep_now
+from apps.utils.datetime import async_sleep_now
 
 
 class AviatorOneXBet(AviatorBase, configuration=BookmakerIDS.ONE_X_BET.value):
@@ -20,7 +20,7 @@ class AviatorOneXBet(AviatorBase, configuration=BookmakerIDS.ONE_X_BET.value):
 
         page_login_button = self._page.locator(".login-btn")
         await self._click(page_login_button)
-        sleep_now(1)
+        await async_sleep_now(1)
 
         username = GlobalVars.get_username()
         password = GlobalVars.get_password()
@@ -6,7 +6,7 @@ from apps.game.bookmakers.constants import BookmakerIDS
 from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.scrappers.aviator.aviator_base import AviatorBase
-from apps.utils.datetime import sleep_now
+from apps.utils.datetime import async_sleep_now
 
 
 class AviatorRivalo(  # noqa
@@ -27,7 +27,7 @@ class AviatorRivalo(  # noqa
             return
         page_login_button = self._page.locator("a[href='/login']")
         await self._click(page_login_button)
-        sleep_now(3)
+        await async_sleep_now(3)
         username = GlobalVars.get_username()
         password = GlobalVars.get_password()
         if not username or not password:
@@ -44,7 +44,7 @@ class AviatorRivalo(  # noqa
         await username_input.type(username, delay=100)
         await password_input.type(password, delay=100)
         await self._click(login_button)
-        sleep_now(3)
+        await async_sleep_now(3)
 
     async def _get_app_game(self):
         if not self._page:
@@ -8,7 +8,7 @@ from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 # Internal
 from apps.gui.gui_events import SendEventToGUI
 from apps.scrappers.game_base import AbstractControlBase, Control
-from apps.utils.datetime import sleep_now
+from apps.utils.datetime import async_sleep_now
 
 
 class BetControl(AbstractControlBase):
@@ -17,7 +17,10 @@ class BetControl(AbstractControlBase):
     BTN_BET_DANGER_SELECTOR = "btn-danger.bet"
     BTN_CASH_OUT_SELECTOR = "btn-warning.cashout"
 
-    def __init__(self, aviator_page: Locator):
+    def __init__(
+        self, aviator_page: Locator, *, human_typing: Optional[bool] = True
+    ):
+        super().__init__(human_typing=human_typing)
         self.aviator_page = aviator_page
         self._bet_control_1: Optional[Locator] = None
         self._bet_control_2: Optional[Locator] = None
@@ -108,6 +111,7 @@ class BetControl(AbstractControlBase):
         # bet_buttons = self.aviator_page.locator("button.btn-success.bet")
         self._bet_button_1 = self._bet_control_1.locator("button.bet").first
         self._bet_button_2 = self._bet_control_2.locator("button.bet").first
+        self.reset_state()
         self.was_load = True
 
     async def set_auto_cash_out(
@@ -125,24 +129,28 @@ class BetControl(AbstractControlBase):
 
         if not auto_cash_out_multiplier:
             raise Exception("buttons null autoCashOutMultiplier")
-        is_switcher_enabled = await auto_cash_out_multiplier.is_enabled()
-        if (
-            enabled
-            and not is_switcher_enabled
-            or not enabled
-            and is_switcher_enabled
-        ):
-            await auto_cash_out_switcher.click(delay=self._random_delay(1000))
+        state = self.get_state(control)
+        # the page is read only when the mirror is unknown (reset_state)
+        if state.auto_cash_out is None:
+            state.auto_cash_out = await auto_cash_out_multiplier.is_enabled()
+        if state.auto_cash_out != bool(enabled):
+            async with self.input_lock:
+                await auto_cash_out_switcher.click(
+                    delay=self._random_delay(1000)
+                )
+            state.auto_cash_out = bool(enabled)
         if not enabled:
             return
-        value = round(
-            float(await auto_cash_out_multiplier.input_value(timeout=1000)), 2
-        )
-        if value != multiplier:
-            await auto_cash_out_multiplier.fill("", timeout=1000)
-            await auto_cash_out_multiplier.type(
-                str(multiplier), delay=self._random_delay(500)
+        if state.multiplier is None:
+            state.multiplier = round(
+                float(
+                    await auto_cash_out_multiplier.input_value(timeout=1000)
+                ),
+                2,
             )
+        if state.multiplier != multiplier:
+            await self._write_input(auto_cash_out_multiplier, str(multiplier))
+            state.multiplier = multiplier
 
     async def update_amount(self, *, amount: float, control: Control):
         input_element = self._amount_input_1
@@ -152,14 +160,16 @@ class BetControl(AbstractControlBase):
         if input_element is None:
             raise Exception("updateAmount :: input null")
 
-        value = round(float(await input_element.input_value(timeout=1000)), 0)
-        if value != amount:
-            await input_element.fill("", timeout=1000)
-            if amount - int(amount) == 0:
-                amount = int(amount)
-            await input_element.type(
-                str(amount), delay=self._random_delay(500)
+        state = self.get_state(control)
+        # the page is read only when the mirror is unknown (reset_state)
+        if state.amount is None:
+            state.amount = round(
+                float(await input_element.input_value(timeout=1000)), 0
             )
+        if state.amount != amount:
+            value = int(amount) if amount - int(amount) == 0 else amount
+            await self._write_input(input_element, str(value))
+            state.amount = amount
         # self.aviator_page.wait_for_timeout(500)
 
     async def bet(
@@ -169,25 +179,35 @@ class BetControl(AbstractControlBase):
         multiplier: float,
         control: Control,
         use_auto_cash_out: Optional[bool] = False,
-    ) -> None:
+    ) -> bool:
         if multiplier is None or amount is None:
             raise Exception("bet :: no multiplier or amount")
 
-        await self.set_auto_cash_out(
-            control=control,
-            multiplier=multiplier,
-            enabled=use_auto_cash_out,
-        )
-        await self.update_amount(amount=amount, control=control)
+        self.start_bet(control)
+        with self._measure("set_auto_cash_out", control):
+            await self.set_auto_cash_out(
+                control=control,
+                multiplier=multiplier,
+                enabled=use_auto_cash_out,
+            )
+        with self._measure("update_amount", control):
+            await self.update_amount(amount=amount, control=control)
 
         if self._bet_button_1 is None or self._bet_button_2 is None:
             raise Exception("bet :: bet button null. control")
 
-        if control == Control.Control1:
-            await self._bet_button_1.click(delay=self._random_delay())
-            return
-
-        await self._bet_button_2.click(delay=self._random_delay())
+        bet_button = self._bet_button_1
+        bet_control = self._bet_control_1
+        if control == Control.Control2:
+            bet_button = self._bet_button_2
+            bet_control = self._bet_control_2
+        async with self.input_lock:
+            with self._measure("click", control):
+                await bet_button.click(delay=self._random_delay())
+        accepted_button = bet_control.locator(
+            f"button.{self.BTN_BET_DANGER_SELECTOR}"
+        ).first
+        return await self._wait_bet_accepted(accepted_button, control)
 
     async def wait_manual_cash_out(
         self, *, amount: float, multiplier: float, control: Control
@@ -225,7 +245,7 @@ class BetControl(AbstractControlBase):
             await bet_control.locator(selector_).wait_for(timeout=5000)
             btn_ = bet_control.locator(selector_).first
             if not await btn_.is_visible():
-                sleep_now(1)
+                await async_sleep_now(1)
                 continue
             status_ = await get_status_of_btn(btn_)
             match status_:
@@ -244,7 +264,7 @@ class BetControl(AbstractControlBase):
                     return
                 case 0:
                     # bet button with bet
-                    sleep_now(0.8)
+                    await async_sleep_now(0.8)
                     continue
                 case 1:
                     break
@@ -259,6 +279,7 @@ class BetControl(AbstractControlBase):
             )
             multiplier_ = round(value_ / amount, 2)
             if multiplier_ >= multiplier:
-                await btn_.click()
+                async with self.input_lock:
+                    await btn_.click()
                 return
-            # sleep_now(0.05)
+            # await async_sleep_now(0.05)
@@ -0,0 +1,124 @@
+# Standard Library
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
+
+# Libraries
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    Route,
+)
+
+# Internal
+from apps.config import Config
+
+# chromium arguments to render without GPU
+DISABLE_GPU_ARGS = ["--disable-gpu"]
+# viewport of the page without window (headless)
+HEADLESS_VIEWPORT = dict(width=1366, height=768)
+# the css animations and transitions of the frames end immediately
+DISABLE_ANIMATIONS_SCRIPT = """
+document.addEventListener("DOMContentLoaded", () => {
+    const style = document.createElement("style");
+    style.textContent = `*, *::before, *::after {
+        animation-duration: 0s !important;
+        animation-delay: 0s !important;
+        transition-duration: 0s !important;
+        transition-delay: 0s !important;
+    }`;
+    document.head.appendChild(style);
+});
+"""
+
+
+@dataclass
+class BrowserProfile:
+    """
+    launch options of the browser of the scrappers (conf.ini)
+    """
+
+    headless: bool = False
+    # resource types aborted (image, media, font, stylesheet...)
+    block_resources: list[str] = field(default_factory=list)
+    # requests aborted to these domains and their subdomains
+    block_domains: list[str] = field(default_factory=list)
+    disable_gpu: bool = False
+    disable_animations: bool = False
+    # folder of the persistent context (cookies of the login),
+    # empty: a new context every time
+    user_data_dir: str = ""
+
+    @classmethod
+    def from_config(cls, config: Config) -> "BrowserProfile":
+        return cls(
+            headless=config.BROWSER_HEADLESS,
+            block_resources=config.BROWSER_BLOCK_RESOURCES,
+            block_domains=config.BROWSER_BLOCK_DOMAINS,
+            disable_gpu=config.BROWSER_DISABLE_GPU,
+            disable_animations=config.BROWSER_DISABLE_ANIMATIONS,
+            user_data_dir=config.BROWSER_USER_DATA_DIR,
+        )
+
+    @property
+    def blocks_requests(self) -> bool:
+        return bool(self.block_resources or self.block_domains)
+
+    def launch_args(self) -> list[str]:
+        # to lunch the browser maximized add "--start-maximized"
+        return list(DISABLE_GPU_ARGS) if self.disable_gpu else []
+
+    def context_options(self) -> dict:
+        options = dict(no_viewport=not self.headless)
+        if self.headless:
+            options.update(viewport=HEADLESS_VIEWPORT)
+        if self.disable_animations:
+            options.update(reduced_motion="reduce")
+        return options
+
+    def is_blocked(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.block_resources:
+            return True
+        host = urlparse(url).hostname or ""
+        return any(
+            host == domain or host.endswith(f".{domain}")
+            for domain in self.block_domains
+        )
+
+    async def route(self, route: Route):
+        request = route.request
+        if self.is_blocked(request.resource_type, request.url):
+            await route.abort()
+            return
+        await route.continue_()
+
+    async def open_page(
+        self, playwright: Playwright
+    ) -> tuple[Optional[Browser], BrowserContext, Page]:
+        """
+        launch the browser with the profile
+        :return: browser (None with a persistent context), context and page
+        """
+        browser = None
+        if self.user_data_dir:
+            context = await playwright.chromium.launch_persistent_context(
+                self.user_data_dir,
+                headless=self.headless,
+                args=self.launch_args(),
+                **self.context_options(),
+            )
+        else:
+            browser = await playwright.chromium.launch(
+                headless=self.headless, args=self.launch_args()
+            )
+            context = await browser.new_context(**self.context_options())
+        if self.disable_animations:
+            await context.add_init_script(DISABLE_ANIMATIONS_SCRIPT)
+        if self.blocks_requests:
+            # the frames of the game are routed too
+            await context.route("**/*", self.route)
+        # the persistent context opens with a blank page
+        page = context.pages[0] if context.pages else await context.new_page()
+        return browser, context, page
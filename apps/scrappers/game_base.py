@@ -1,11 +1,17 @@
 # Standard Library
 import abc
+import asyncio
 import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, Union
 
 # Libraries
 from playwright.async_api import FrameLocator
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
 from playwright.sync_api import (
     Browser,
     BrowserContext,
@@ -16,6 +22,47 @@ from playwright.sync_api import (
 
 # Internal
 from apps.game.models import Bet
+from apps.globals import GlobalVars
+from apps.gui.gui_events import SendEventToGUI
+from apps.scrappers.browser_profile import BrowserProfile
+from apps.utils.histogram import LatencyHistograms
+from apps.utils.ring_buffer import RingBuffer
+
+# observes the history of the game (args: binding and selector of the
+# multipliers), the binding is called with every new multiplier
+# (a new first item, or a different content if the list is rendered
+# again). It returns the content of the first item
+HISTORY_OBSERVER_SCRIPT = """
+(history, {binding, selector}) => {
+    if (history._crashBotObserver) {
+        history._crashBotObserver.disconnect();
+    }
+    const firstItem = () => {
+        const items = history.querySelectorAll(selector);
+        const content = items[0] ? items[0].textContent.trim() : "";
+        return {items, content};
+    };
+    let {items, content: lastContent} = firstItem();
+    let lastItem = items[0];
+    const observer = new MutationObserver(() => {
+        const {items, content} = firstItem();
+        if (!content) {
+            return;
+        }
+        const added = items[0] !== lastItem && items[1] === lastItem;
+        if (added || content !== lastContent) {
+            window[binding](content);
+        }
+        lastItem = items[0];
+        lastContent = content;
+    });
+    observer.observe(
+        history, {childList: true, subtree: true, characterData: true}
+    );
+    history._crashBotObserver = observer;
+    return lastContent;
+}
+"""
 
 
 class Control(Enum):
@@ -23,7 +70,111 @@ class Control(Enum):
     Control2 = 2
 
 
+@dataclass
+class ControlState:
+    """
+    values of the inputs of a control written by the bot (None: not read)
+    """
+
+    amount: Optional[float] = None
+    multiplier: Optional[float] = None
+    auto_cash_out: Optional[bool] = None
+
+
 class AbstractControlBase(abc.ABC):
+    # ms to wait the bet accepted
+    BET_ACCEPTED_TIMEOUT: int = 5000
+
+    def __init__(self, *, human_typing: Optional[bool] = True):
+        # type the inputs key by key (fill + type with random delays),
+        # otherwise the value is set with a single fill
+        self.human_typing = human_typing
+        # the focus and the mouse of the page are shared by the controls,
+        # the actions that type or click hold the lock (the bets of the
+        # controls are sent concurrently)
+        self._input_lock = asyncio.Lock()
+        # time of the steps of the bets: set_auto_cash_out, update_amount,
+        # click, accepted (click -> the button changes to cancel)
+        self._latencies = LatencyHistograms()
+        # ms of the steps of the last bet by control
+        self.last_latencies: dict[Control, dict[str, int]] = {}
+        # mirror of the inputs of the controls, the unchanged inputs are
+        # not read or written again
+        self._states: dict[Control, ControlState] = {}
+
+    @property
+    def input_lock(self) -> asyncio.Lock:
+        return self._input_lock
+
+    @property
+    def latencies(self) -> LatencyHistograms:
+        return self._latencies
+
+    def get_state(self, control: Control) -> ControlState:
+        return self._states.setdefault(control, ControlState())
+
+    def reset_state(self, control: Optional[Control] = None):
+        """
+        forget the mirror of the inputs (all the controls by default),
+        they are read from the page in the next bet
+        """
+        if control is None:
+            self._states.clear()
+        else:
+            self._states.pop(control, None)
+
+    async def _write_input(self, input_element: Locator, value: str):
+        async with self.input_lock:
+            if not self.human_typing:
+                await input_element.fill(value, timeout=1000)
+                return
+            await input_element.fill("", timeout=1000)
+            await input_element.type(value, delay=self._random_delay(500))
+
+    def start_bet(self, control: Control):
+        """
+        forget the steps of the last bet of the control
+        """
+        self.last_latencies[control] = {}
+
+    def observe(self, step: str, control: Control, seconds: float):
+        """
+        add the time of a step of the bet of the control
+        """
+        self.latencies.observe(step, seconds)
+        self.last_latencies.setdefault(control, {})[step] = round(
+            seconds * 1000
+        )
+
+    @contextmanager
+    def _measure(self, step: str, control: Control):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(step, control, time.perf_counter() - start)
+
+    async def _wait_bet_accepted(
+        self, accepted_button: Locator, control: Control
+    ) -> bool:
+        """
+        wait the button of the control in the state of bet accepted
+        :param accepted_button: button of the control with the class of
+         bet accepted (cancel)
+        """
+        start = time.perf_counter()
+        try:
+            await accepted_button.wait_for(timeout=self.BET_ACCEPTED_TIMEOUT)
+        except PlaywrightTimeoutError:
+            SendEventToGUI.log.warning(
+                f"bet not accepted :: control {control.value}"
+            )
+            # the page could have changed the inputs (limits of the bet)
+            self.reset_state(control)
+            return False
+        self.observe("accepted", control, time.perf_counter() - start)
+        return True
+
     @staticmethod
     def _random_delay(max_microseconds: Optional[int] = 50) -> int:
         return random.randint(15, max_microseconds)
@@ -56,10 +207,23 @@ class AbstractControlBase(abc.ABC):
         multiplier: float,
         control: int,
         use_auto_cash_out: Optional[bool] = False,
-    ) -> None: ...
+    ) -> bool:
+        """
+        :return: True if the bet was accepted
+        """
 
 
 class AbstractCrashGameBase(abc.ABC):
+    # capacity of the multiplier history shared with the game and the bot
+    MAX_MULTIPLIERS_IN_MEMORY: int = 500
+    # function of the page called by the history observer
+    HISTORY_BINDING: str = "crashBotNewMultiplier"
+    # selector of the multipliers in the history (the last is the first)
+    HISTORY_ITEM_SELECTOR: str = ".payout"
+    # seconds without multipliers to observe the history again
+    # (the frame of the game was reloaded)
+    HISTORY_OBSERVER_TIMEOUT: float = 120
+
     def __init__(self, *, url: str):
         self.playwright: Union[sync_playwright, None] = None
         self._browser: Union[Browser, None] = None
@@ -75,9 +239,113 @@ class AbstractCrashGameBase(abc.ABC):
         self.maximum_bet: int = 0
         self.maximum_win_for_one_bet: int = 0
         self.url: str = url
-        self.multipliers: list[float] = []
+        self.multipliers = RingBuffer(self.MAX_MULTIPLIERS_IN_MEMORY)
         self.balance: int = 0
         self.currency: str = "USD1"
+        # multipliers pushed by the history observer: (content, time)
+        self._new_multipliers: Optional[asyncio.Queue] = None
+
+    async def _open_browser(self):
+        """
+        launch the browser with the profile of conf.ini and open the page
+        """
+        profile = BrowserProfile.from_config(GlobalVars.config)
+        SendEventToGUI.log.debug(f"browser profile :: {profile}")
+        self.playwright = await async_playwright().start()
+        self._browser, self._context, self._page = await profile.open_page(
+            self.playwright
+        )
+
+    async def _close_browser(self):
+        await self._page.close()
+        # the persistent context has no browser
+        if self._browser:
+            await self._browser.close()
+        else:
+            await self._context.close()
+
+    @property
+    def bet_latencies(self) -> LatencyHistograms:
+        """
+        time of the steps of the bets (controls) and from the end of the
+        round to the bet accepted (round_end_to_accepted)
+        """
+        return self._controls.latencies
+
+    async def _send_bet(
+        self,
+        *,
+        amount: float,
+        multiplier: float,
+        control: Control,
+        use_auto_cash_out: bool,
+    ):
+        accepted = await self._controls.bet(
+            amount=amount,
+            multiplier=multiplier,
+            control=control,
+            use_auto_cash_out=use_auto_cash_out,
+        )
+        if accepted and len(self.multipliers):
+            # time.time() when the multiplier was read
+            round_end = self.multipliers.timestamps(1)[-1]
+            self._controls.observe(
+                "round_end_to_accepted", control, time.time() - round_end
+            )
+        steps = self._controls.last_latencies.get(control, {})
+        SendEventToGUI.log.debug(
+            f"bet latencies :: control {control.value} :: "
+            + ", ".join(f"{step} {ms} ms" for step, ms in steps.items())
+        )
+
+    def _on_new_multiplier(self, source: dict, content: str):
+        self._new_multipliers.put_nowait((content, time.time()))
+
+    async def _observe_history(self):
+        """
+        observe the history element (MutationObserver), the new
+        multipliers are pushed to _new_multipliers without polling
+        """
+        if self._new_multipliers is None:
+            self._new_multipliers = asyncio.Queue()
+            await self._page.expose_binding(
+                self.HISTORY_BINDING, self._on_new_multiplier
+            )
+        last_content = await self._history_game.first.evaluate(
+            HISTORY_OBSERVER_SCRIPT,
+            dict(
+                binding=self.HISTORY_BINDING,
+                selector=self.HISTORY_ITEM_SELECTOR,
+            ),
+        )
+        # a multiplier added before the observer
+        if (
+            last_content
+            and len(self.multipliers)
+            and self._format_multiplier(last_content) != self.multipliers[-1]
+        ):
+            self._on_new_multiplier({}, last_content)
+
+    async def _wait_new_multiplier(self) -> tuple[float, float]:
+        """
+        wait the next multiplier of the history observer
+        :return: the multiplier and the time.time() when it was added
+        """
+        if self._new_multipliers is None:
+            await self._observe_history()
+        while True:
+            try:
+                content, timestamp = await asyncio.wait_for(
+                    self._new_multipliers.get(),
+                    self.HISTORY_OBSERVER_TIMEOUT,
+                )
+                return self._format_multiplier(content), timestamp
+            except asyncio.TimeoutError:
+                SendEventToGUI.log.debug("wait_next_game :: observe again")
+                # the inputs of the reloaded frame have the default values
+                if self._controls is not None:
+                    self._controls.reset_state()
+                await self._observe_history()
 
     @staticmethod
     def _format_multiplier(multiplier: str) -> float:
@@ -6,14 +6,13 @@ from typing import Optional, Union
 # Libraries
 from playwright.async_api import Locator
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import async_playwright
 
 # Internal
 from apps.game.models import Bet
+from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.scrappers.game_base import AbstractCrashGameBase, Control
 from apps.scrappers.to_the_moon.bet_control import BetControl
-from apps.utils.datetime import sleep_now
 from apps.utils.display import format_amount_to_display
 from apps.utils.patterns.factory import ConfigurationFactory
 
@@ -25,6 +24,8 @@ class ToTheMoonBase(AbstractCrashGameBase, ConfigurationFactory):
     import all the classes in apps/game/bookmakers/__init__.py
     """
 
+    HISTORY_ITEM_SELECTOR = ".history-item"
+
     def __init__(self, *, url: str, **kwargs):
         super().__init__(url=url)
 
@@ -77,11 +78,7 @@ class ToTheMoonBase(AbstractCrashGameBase, ConfigurationFactory):
                 raise e
 
     async def open(self):
-        self.playwright = await async_playwright().start()
-        # to lunch the browser maximized add args=["--start-maximized"]
-        self._browser = await self.playwright.chromium.launch(headless=False)
-        self._context = await self._browser.new_context(no_viewport=True)
-        self._page = await self._context.new_page()
+        await self._open_browser()
         await self._page.goto(self.url, timeout=100000)
         await self._login()
         self._app_game = await self._get_app_game()
@@ -93,15 +90,16 @@ class ToTheMoonBase(AbstractCrashGameBase, ConfigurationFactory):
         await self.read_multipliers()
         await self.read_currency()
         # await self.read_game_limits()
-        self._controls = BetControl(self._app_game)
+        self._controls = BetControl(
+            self._app_game, human_typing=GlobalVars.config.HUMAN_TYPING
+        )
         await self._controls.init()
         SendEventToGUI.log.success(_("ToTheMoon loaded"))  # noqa
 
     async def close(self):
         if not self._page:
             return
-        await self._page.close()
-        await self._browser.close()
+        await self._close_browser()
         # TODO: implement close session of home bet
 
     async def read_game_limits(self):
@@ -215,6 +213,7 @@ class ToTheMoonBase(AbstractCrashGameBase, ConfigurationFactory):
                 }
             )
             raise Exception("ToTheMoonPage :: no _controls")
+        bet_tasks = []
         manual_cash_out_tasks = []
         for i, bet in enumerate(bets):
             if len(bets) > 1:
@@ -226,13 +225,14 @@ class ToTheMoonBase(AbstractCrashGameBase, ConfigurationFactory):
                 f"{_('Sending bet to game')} ${format_amount_to_display(bet.amount)} * "  # noqa
                 f"{bet.multiplier} control: {control.value}"
             )
-            await self._controls.bet(
-                amount=bet.amount,
-                multiplier=bet.multiplier,
-                control=control,
-                use_auto_cash_out=use_auto_cash_out,
+            bet_tasks.append(
+                self._send_bet(
+                    amount=bet.amount,
+                    multiplier=bet.multiplier,
+                    control=control,
+                    use_auto_cash_out=use_auto_cash_out,
+                )
             )
-            sleep_now(0.5)
             if not use_auto_cash_out:
                 manual_cash_out_tasks.append(
                     self._controls.wait_manual_cash_out(
@@ -241,6 +241,8 @@ class ToTheMoonBase(AbstractCrashGameBase, ConfigurationFactory):
                         control=control,
                     )
                 )
+        # the controls are independent, the bets are sent together
+        await asyncio.gather(*bet_tasks)
         if manual_cash_out_tasks:
             await asyncio.gather(*manual_cash_out_tasks)
             SendEventToGUI.log.debug("Finished manual cash out tasks")
@@ -254,39 +256,17 @@ class ToTheMoonBase(AbstractCrashGameBase, ConfigurationFactory):
                 }
             )
             raise Exception("waitNextGame :: no historyGame")
-        last_multiplier_saved = self.multipliers[-1]
-        while True:
-            try:
-                await self._history_game.locator(
-                    ".history-item"
-                ).first.wait_for(timeout=5000)
-                locator = self._history_game.locator(
-                    ".history-item",
-                ).first
-                last_multiplier_content = await locator.text_content(
-                    timeout=1000
-                )
-                last_multiplier = (
-                    self._format_multiplier(last_multiplier_content)
-                    if last_multiplier_content
-                    else last_multiplier_saved
-                )
-                if last_multiplier_saved != last_multiplier:
-                    self.multipliers.append(last_multiplier)
-                    SendEventToGUI.log.success(
-                        f"{_('Last Multiplier')}: {last_multiplier}"  # noqa
-                    )
-                    self.multipliers = self.multipliers[1:]
-                    return
-                sleep_now(0.2)
-            except Exception as e:
-                if isinstance(e, PlaywrightTimeoutError):
-                    SendEventToGUI.log.debug("wait_next_game :: timeout")
-                    continue
-                SendEventToGUI.exception(
-                    {
-                        "location": "ToTheMoonPage",
-                        "message": f"wait_next_game :: {e}",
-                    }
-                )
-                raise e
+        try:
+            multiplier, timestamp = await self._wait_new_multiplier()
+        except Exception as e:
+            SendEventToGUI.exception(
+                {
+                    "location": "ToTheMoonPage",
+                    "message": f"wait_next_game :: {e}",
+                }
+            )
+            raise e
+        self.multipliers.append(multiplier, timestamp)
+        SendEventToGUI.log.success(
+            f"{_('Last Multiplier')}: {multiplier}"  # noqa
+        )
@@ -4,7 +4,7 @@ from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 # Internal
 from apps.game.bookmakers.constants import BookmakerIDS
 from apps.scrappers.to_the_moon.to_the_moon_base import ToTheMoonBase
-from apps.utils.datetime import sleep_now
+from apps.utils.datetime import async_sleep_now
 
 
 class ToTheMoonOneWinDemo(
@@ -19,7 +19,7 @@ class ToTheMoonOneWinDemo(
         while True:
             try:
                 # await self._page.wait_for_url(self.url, timeout=50000)
-                sleep_now(10)
+                await async_sleep_now(10)
                 self._app_game = self._page.locator("main").first
                 await self._app_game.locator(
                     ".content-top__history>#rate_history"
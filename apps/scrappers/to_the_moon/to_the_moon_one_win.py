@@ -6,7 +6,7 @@ from apps.game.bookmakers.constants import BookmakerIDS
 from apps.globals import GlobalVars
 from apps.gui.gui_events import SendEventToGUI
 from apps.scrappers.to_the_moon.to_the_moon_base import ToTheMoonBase
-from apps.utils.datetime import sleep_now
+from apps.utils.datetime import async_sleep_now
 
 
 class ToTheMoonOneWin(ToTheMoonBase, configuration=BookmakerIDS.ONE_WIN.value):
@@ -20,7 +20,7 @@ class ToTheMoonOneWin(ToTheMoonBase, configuration=BookmakerIDS.ONE_WIN.value):
 
         page_login_button = self._page.locator("button.login")
         await self._click(page_login_button)
-        sleep_now(1)
+        await async_sleep_now(1)
 
         username = GlobalVars.get_username()
         password = GlobalVars.get_password()
@@ -0,0 +1,115 @@
+"""
+cache of values with time to live (stale-while-revalidate)
+"""
+
+# Standard Library
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# executor shared by the caches to refresh the values in background
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="cache-refresh"
+)
+
+
+@dataclass
+class CacheEntry:
+    value: any
+    # time.monotonic() of the last load
+    loaded_at: float
+
+
+class TTLCache:
+    """
+    Values by key with a time to live.
+    A value older than ttl is returned (stale) while it is loaded again in
+    background, a value older than max_stale (if set) is loaded again
+    before return it. When the load fails the last value is kept.
+    """
+
+    def __init__(self, *, ttl: float, max_stale: Optional[float] = None):
+        """
+        :param ttl: seconds that a value is fresh
+        :param max_stale: seconds that a stale value can be returned,
+         None to return it always
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries: dict[Hashable, CacheEntry] = {}
+        self._refreshing: set[Hashable] = set()
+        self._lock = Lock()
+        # changes with clear(), a load started before is not saved
+        self._generation = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _load(self, key: Hashable, loader: Callable[[], any]) -> any:
+        generation = self._generation
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = CacheEntry(value, time.monotonic())
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], any]):
+        try:
+            self._load(key, loader)
+        except Exception as exc:
+            logger.warning(f"TTLCache :: refresh {key} :: {exc}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def refresh(self, key: Hashable, loader: Callable[[], any]):
+        """
+        load the value in background (once by key at the same time)
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        _refresh_executor.submit(self._refresh, key, loader)
+
+    def get(self, key: Hashable, loader: Callable[[], any]) -> any:
+        """
+        :param key: key of the value
+        :param loader: function to load the value
+        :return: the cached value, it is loaded (waiting) only when it is
+         not in the cache or it is older than max_stale
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._load(key, loader)
+        age = time.monotonic() - entry.loaded_at
+        if self.max_stale is not None and age > self.ttl + self.max_stale:
+            return self._load(key, loader)
+        if age > self.ttl:
+            self.refresh(key, loader)
+        return entry.value
+
+    def peek(
+        self, key: Hashable, loader: Optional[Callable[[], any]] = None
+    ) -> any:
+        """
+        last value without waiting, it is loaded in background (with the
+        loader) when it is not in the cache or it is stale
+        :return: the value or None
+        """
+        entry = self._entries.get(key)
+        if loader and (
+            entry is None or time.monotonic() - entry.loaded_at > self.ttl
+        ):
+            self.refresh(key, loader)
+        return entry.value if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
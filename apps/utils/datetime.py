@@ -1,6 +1,14 @@
 # Standard Library
+import asyncio
 import time
 
 
 def sleep_now(seconds: float):
     time.sleep(seconds)
+
+
+async def async_sleep_now(seconds: float):
+    """
+    sleep without blocking the event loop (use it in the coroutines)
+    """
+    await asyncio.sleep(seconds)
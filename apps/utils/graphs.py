@@ -3,7 +3,8 @@ contain functions to help with graphs
 """
 
 # Standard Library
-from typing import Optional
+from collections import deque
+from typing import Iterable, Optional
 
 # Libraries
 import numpy as np
@@ -38,7 +39,8 @@ def calculate_slope_linear_regression(
     :param len_window: is the length of the window to calculate the slope
     :return: tuple the slope and the intercept
     """
-    if not y:
+    # at least two points are needed to fit the line
+    if len(y) < 2:
         return -1, 0
     len_window = abs(len_window) * -1
     if len(y) > len_window:
@@ -49,3 +51,69 @@ def calculate_slope_linear_regression(
     slope = coefficients[0]
     intercept = coefficients[1]
     return float(slope), intercept
+
+
+class SlidingLinearRegression:
+    """
+    linear regression of the Y coordinates of the multipliers
+    (the same of convert_multipliers_to_coordinate) over a sliding window.
+    The sums of the window are updated with every multiplier,
+    the slope is calculated in O(1) without arrays.
+    x is the position in the window (0..n-1) like
+    calculate_slope_linear_regression
+    """
+
+    def __init__(
+        self, len_window: int, multipliers: Optional[Iterable[float]] = None
+    ):
+        """
+        :param len_window: length of the window (at least 2 points)
+        :param multipliers: initial multipliers
+        """
+        self.len_window = max(abs(len_window), 2)
+        self._y: deque[int] = deque(maxlen=self.len_window)
+        # last Y coordinate (cumulative sum of +1 / -1)
+        self.last_y = 0
+        self._sum_y = 0
+        self._sum_xy = 0
+        if multipliers is not None:
+            for multiplier in multipliers:
+                self.add_multiplier(multiplier)
+
+    @property
+    def y_coordinates(self) -> list[int]:
+        # Y coordinates of the window
+        return list(self._y)
+
+    def add_multiplier(self, multiplier: float):
+        self.last_y += 1 if multiplier >= 2 else -1
+        self.add_value(self.last_y)
+
+    def add_value(self, y: int):
+        n = len(self._y)
+        if n == self.len_window:
+            # the first value leaves the window and the rest move one
+            # position to the left
+            first_y = self._y[0]
+            self._sum_xy += (n - 1) * y - (self._sum_y - first_y)
+            self._sum_y += y - first_y
+        else:
+            self._sum_xy += n * y
+            self._sum_y += y
+        self._y.append(y)
+
+    def calculate_slope(self) -> tuple[float, float]:
+        """
+        the same result of calculate_slope_linear_regression
+        :return: tuple the slope and the intercept
+        """
+        n = len(self._y)
+        if n < 2:
+            return -1, 0
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        slope = (n * self._sum_xy - sum_x * self._sum_y) / (
+            n * sum_xx - sum_x**2
+        )
+        intercept = (self._sum_y - slope * sum_x) / n
+        return slope, intercept
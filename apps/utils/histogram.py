@@ -0,0 +1,142 @@
+"""
+latency histograms (fixed buckets) to measure the time of the services
+"""
+
+# Standard Library
+import bisect
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator, Optional
+
+# upper bound (ms) of every bucket, the last bucket is for the rest
+LATENCY_BUCKETS_MS = (
+    1,
+    2,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+
+class LatencyHistogram:
+    """
+    Count of latencies by bucket (O(log buckets) by observation),
+    the percentiles are estimated with the upper bound of the bucket
+    """
+
+    def __init__(self, buckets_ms: Optional[tuple[float]] = None):
+        self.buckets_ms = tuple(buckets_ms or LATENCY_BUCKETS_MS)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def observe(self, seconds: float):
+        milliseconds = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        if self.min_ms is None or milliseconds < self.min_ms:
+            self.min_ms = milliseconds
+        if self.max_ms is None or milliseconds > self.max_ms:
+            self.max_ms = milliseconds
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        :param percentile: 0 - 100
+        :return: upper bound (ms) of the bucket with the percentile,
+         the max latency for the last bucket
+        """
+        if not self.count:
+            return 0
+        rank = percentile / 100 * self.count
+        accumulated = 0
+        for index, count in enumerate(self.counts):
+            accumulated += count
+            if accumulated >= rank and count:
+                if index == len(self.buckets_ms):
+                    return self.max_ms
+                return min(self.buckets_ms[index], self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, any]:
+        return dict(
+            count=self.count,
+            average_ms=round(self.average_ms, 2),
+            min_ms=round(self.min_ms or 0, 2),
+            max_ms=round(self.max_ms or 0, 2),
+            p50_ms=round(self.percentile(50), 2),
+            p90_ms=round(self.percentile(90), 2),
+            p99_ms=round(self.percentile(99), 2),
+            buckets={
+                **{
+                    f"<={bucket}": count
+                    for bucket, count in zip(self.buckets_ms, self.counts)
+                },
+                f">{self.buckets_ms[-1]}": self.counts[-1],
+            },
+        )
+
+
+class LatencyHistograms:
+    """
+    Histograms by name (service, step...), safe to use from many threads
+    """
+
+    def __init__(self, buckets_ms: Optional[tuple[float]] = None):
+        self.buckets_ms = buckets_ms
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = Lock()
+
+    def __getitem__(self, name: str) -> LatencyHistogram:
+        return self._histograms[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._histograms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._histograms))
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = LatencyHistogram(self.buckets_ms)
+                self._histograms[name] = histogram
+            histogram.observe(seconds)
+
+    @contextmanager
+    def measure(self, name: str):
+        """
+        observe the time of the block (also when it raises an exception)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def to_dict(self) -> dict[str, dict[str, any]]:
+        with self._lock:
+            return {
+                name: histogram.to_dict()
+                for name, histogram in self._histograms.items()
+            }
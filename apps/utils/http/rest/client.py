@@ -1,9 +1,15 @@
 # Standard Library
 import logging
+from http import HTTPStatus
 from typing import Any, Callable, Dict, List, Optional, Union
 
 # Libraries
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Internal
+from apps.utils.histogram import LatencyHistograms
 
 # Current Folder
 from .response import Response
@@ -15,21 +21,75 @@ class RESTClient:
     """
     Rest client based in requests library, have basic method of http,
     and can save the credentials and header in every call.
+    The calls use the same session (pool of keep-alive connections),
+    so the TCP/TLS connection is not opened in every call.
 
     Attributes:
         TIMEOUT: An integer with the default timeout.
+        RETRIES: retries of a call (connection errors, and
+            RETRY_STATUS of the idempotent methods)
+        BACKOFF_FACTOR: the retry n waits BACKOFF_FACTOR * 2 ** (n - 1)
+        POOL_MAXSIZE: connections kept by host
     """
 
     TIMEOUT = 60
     VERIFY = True
+    RETRIES = 3
+    BACKOFF_FACTOR = 0.3
+    RETRY_STATUS = (502, 503, 504)
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 10
     auth = {}
 
     def __init__(
-        self, *, api_url: str, headers: Optional[Dict[str, Any]] = None
+        self,
+        *,
+        api_url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        pool_maxsize: Optional[int] = None,
     ):
         self.api_url = api_url
         if headers:
             self.headers = headers
+        # latencies by service: "<method> <service>"
+        self.latencies = LatencyHistograms()
+        # last response with ETag by url (conditional requests)
+        self._etag_responses: Dict[str, Response] = {}
+        self.session = self._create_session(
+            retries=self.RETRIES if retries is None else retries,
+            backoff_factor=(
+                self.BACKOFF_FACTOR
+                if backoff_factor is None
+                else backoff_factor
+            ),
+            pool_maxsize=(
+                self.POOL_MAXSIZE if pool_maxsize is None else pool_maxsize
+            ),
+        )
+
+    def _create_session(
+        self, *, retries: int, backoff_factor: float, pool_maxsize: int
+    ) -> requests.Session:
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        self.session.close()
 
     def delete(
         self,
@@ -41,7 +101,7 @@ class RESTClient:
         func_params = {"service": service}
         logger.info(f"delete_request :: start :: {func_params}")
         return self._send_request(
-            method=requests.delete,
+            method=self.session.delete,
             service=service,
             kwargs=kwargs,
             sensible_keys=sensible_keys,
@@ -53,15 +113,40 @@ class RESTClient:
         service: str,
         kwargs: Optional[Dict[str, Any]] = None,
         sensible_keys: Optional[List[str]] = (),
+        use_etag: Optional[bool] = False,
     ) -> Response:
+        """
+        :param use_etag: send If-None-Match with the ETag of the last
+            response, with 304 (not modified) the last response is returned
+        """
         func_params = {"service": service}
         logger.info(f"get_request :: start :: {func_params}")
-        return self._send_request(
-            method=requests.get,
+        last_response = None
+        if use_etag:
+            last_response = self._etag_responses.get(service)
+        if last_response:
+            kwargs = dict(kwargs or {})
+            kwargs["headers"] = {
+                **self.headers,
+                **kwargs.get("headers", {}),
+                "If-None-Match": last_response.headers["ETag"],
+            }
+        response = self._send_request(
+            method=self.session.get,
             service=service,
             kwargs=kwargs,
             sensible_keys=sensible_keys,
         )
+        if not use_etag:
+            return response
+        if last_response and response.status == HTTPStatus.NOT_MODIFIED:
+            return last_response
+        if response.status == HTTPStatus.OK and response.headers.get("ETag"):
+            self._etag_responses[service] = response
+        return response
+
+    def clear_etags(self):
+        self._etag_responses.clear()
 
     def put(
         self,
@@ -74,7 +159,7 @@ class RESTClient:
         func_params = {"service": service}
         logger.info(f"put_request :: start :: {func_params}")
         return self._send_request(
-            method=requests.put,
+            method=self.session.put,
             service=service,
             data=data,
             kwargs=kwargs,
@@ -92,7 +177,7 @@ class RESTClient:
         func_params = {"service": service}
         logger.info(f"post_request :: start :: {func_params}")
         return self._send_request(
-            method=requests.post,
+            method=self.session.post,
             service=service,
             data=data,
             kwargs=kwargs,
@@ -110,7 +195,7 @@ class RESTClient:
         func_params = {"service": service}
         logger.info(f"patch_request :: start :: {func_params}")
         return self._send_request(
-            method=requests.patch,
+            method=self.session.patch,
             service=service,
             data=data,
             kwargs=kwargs,
@@ -146,7 +231,9 @@ class RESTClient:
 
         if kwargs:
             args.update(**kwargs)
-        response = method(**args)
+        latency_name = f"{method.__name__} {service.split('?')[0]}"
+        with self.latencies.measure(latency_name):
+            response = method(**args)
         msg = f"response :: status {response.status_code}"
         logger.info(msg)
         response = Response(response)
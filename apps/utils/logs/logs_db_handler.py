@@ -1,27 +1,168 @@
 # Standard Library
+import atexit
+import logging
+import queue
+import sqlite3
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from threading import Event, Lock, Thread
+from typing import Iterator, Optional
 
 # Internal
 from apps.utils.patterns.singleton import Singleton
 from apps.utils.sqlite_engine import SQLiteEngine
 
+logger = logging.getLogger(__name__)
+
+
+class LogsWriter(Thread):
+    """
+    Write-behind queue of logs, the logs are inserted by a background
+    thread in batches (a transaction by batch), the batch is written
+    when it has batch_size logs, after flush_interval seconds,
+    on flush() and on close()
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        handler: "LogsDBHandler",
+        *,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+    ):
+        super().__init__(name="logs-writer", daemon=True)
+        self._handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._next_prune = 0
+
+    def put(self, log: dict[str, any]):
+        if self._closed:
+            return
+        self._queue.put(log)
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Wait until the logs in the queue are written
+        """
+        if self._closed or not self.is_alive():
+            return
+        event = Event()
+        self._queue.put(event)
+        event.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        if self.is_alive():
+            self.join()
+
+    def _write(self, batch: list[dict[str, any]]):
+        if not batch:
+            return
+        try:
+            self._handler.insert_logs(logs=batch)
+        except sqlite3.Error as exc:
+            logger.error(f"error saving {len(batch)} logs: {exc}")
+
+    def _prune(self):
+        """
+        delete the old logs (retention of the handler) every prune_interval
+        """
+        if time.monotonic() < self._next_prune:
+            return
+        self._next_prune = time.monotonic() + self._handler.PRUNE_INTERVAL
+        try:
+            self._handler.prune()
+        except sqlite3.Error as exc:
+            logger.error(f"error deleting old logs: {exc}")
+
+    def run(self):
+        while True:
+            self._prune()
+            batch = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is self._STOP:
+                    self._write(batch)
+                    return
+                if isinstance(item, Event):
+                    self._write(batch)
+                    item.set()
+                    break
+                batch.append(item)
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    self._write(batch)
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    self._write(batch)
+                    break
+
 
 class LogsDBHandler(SQLiteEngine, metaclass=Singleton):
-    def __init__(self):
-        super().__init__("data/logs.db")
+    DATABASE = "data/logs.db"
+    # days to keep the logs, None to keep all the logs
+    RETENTION_DAYS: Optional[int] = 7
+    # seconds between the deletions of the old logs
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self, database: Optional[str] = DATABASE):
+        # the writer thread uses the same connection (with the lock)
+        super().__init__(database, check_same_thread=False)
+        self._lock = Lock()
+        self.execute("PRAGMA journal_mode=WAL")
+        self.execute("PRAGMA synchronous=NORMAL")
         self.create_table()
+        self.writer = LogsWriter(self)
+        self.writer.start()
+        atexit.register(self.close)
 
     def create_table(self):
+        self.execute("PRAGMA table_info(Logs)")
+        columns = {column[1]: column[2] for column in self.fetchall()}
+        if columns.get("timestamp") == "TEXT":
+            # old table, the timestamps are saved as integers (epoch)
+            self.execute("ALTER TABLE Logs RENAME TO Logs_old")
         self.execute("""CREATE TABLE IF NOT EXISTS Logs(
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 message TEXT,
                 level TEXT,
                 app TEXT,
                 path TEXT NULL,
-                timestamp TEXT)""")
+                timestamp INTEGER)""")
+        if columns.get("timestamp") == "TEXT":
+            self.execute("""INSERT INTO Logs
+                (id, message, level, app, path, timestamp)
+                SELECT id, message, level, app, path,
+                CAST(strftime('%s', timestamp, 'utc') AS INTEGER)
+                FROM Logs_old""")
+            self.execute("DROP TABLE Logs_old")
+        self.execute("""CREATE INDEX IF NOT EXISTS idx_logs_app_level_timestamp
+                ON Logs(app, level, timestamp)""")
+        self.execute("""CREATE INDEX IF NOT EXISTS idx_logs_timestamp
+                ON Logs(timestamp)""")
         self.commit()
 
+    @classmethod
+    def to_epoch(cls, timestamp: datetime | str) -> int:
+        """
+        :param timestamp: datetime or str with TIMESTAMP_FORMAT
+        :return: seconds since epoch
+        """
+        if isinstance(timestamp, str):
+            timestamp = datetime.strptime(timestamp, cls.TIMESTAMP_FORMAT)
+        return int(timestamp.timestamp())
+
     def insert_log(
         self,
         *,
@@ -31,51 +172,135 @@ class LogsDBHandler(SQLiteEngine, metaclass=Singleton):
         timestamp: Optional[datetime] = None,
         path: Optional[str] = None,
     ):
-        if isinstance(message, dict):
-            message = str(message)
-        if not timestamp:
-            timestamp = datetime.now()
-        timestamp = timestamp.strftime(self.TIMESTAMP_FORMAT)
-        sql_ = (
-            "INSERT INTO Logs "
-            "(message, level, app, path, timestamp) "
-            "VALUES (?, ?, ?, ?, ?)"
+        """
+        the log is saved by the writer thread (see insert_logs)
+        """
+        self.writer.put(
+            dict(
+                message=message,
+                level=level,
+                app=app,
+                timestamp=timestamp or datetime.now(),
+                path=path,
+            )
         )
-        self.execute(sql_, (message, level, app, path, timestamp))
-        self.commit()
 
     def insert_logs(self, *, logs: list[dict[str, any]]):
         values = []
         for log in logs:
-            timestamp = log.get("timestamp", datetime.now())
+            message = log["message"]
+            if isinstance(message, dict):
+                message = str(message)
+            timestamp = log.get("timestamp") or datetime.now()
             values.append(
                 (
-                    log["message"],
+                    message,
                     log["level"],
                     log["app"],
                     log.get("path", None),
-                    timestamp.strftime(self.TIMESTAMP_FORMAT),
+                    self.to_epoch(timestamp),
                 )
             )
-        self.executemany(
-            "INSERT INTO Logs (message, level, timestamp) "
-            "VALUES (?, ?, ?, ?, ?)",
-            values,
-        )
-        self.commit()
+        with self._lock:
+            self.executemany(
+                "INSERT INTO Logs "
+                "(message, level, app, path, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                values,
+            )
+            self.commit()
 
-    def get_logs(self, *, timestamp: str = None):
+    def get_logs(self, *, timestamp: datetime | str = None):
+        self.writer.flush()
         params = None
         sql_ = "SELECT * FROM Logs"
         if timestamp:
-            params = (timestamp,)
+            params = (self.to_epoch(timestamp),)
             sql_ = "SELECT * FROM Logs WHERE timestamp = ?"
-        self.execute(sql_, params)
-        return self.fetchall()
+        with self._lock:
+            self.execute(sql_, params)
+            return self.fetchall()
+
+    def iter_logs(
+        self,
+        *,
+        app: Optional[str] = None,
+        levels: Optional[list[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        page_size: int = 500,
+        newest_first: bool = False,
+    ) -> Iterator[tuple]:
+        """
+        Read the logs by pages (fetchmany), without loading all the table
+        :param app: GAME or GUI
+        :param levels: levels to read
+        :param start: logs since this datetime (included)
+        :param end: logs until this datetime (excluded)
+        :param page_size: rows read by page
+        :param newest_first: order by the newest logs
+        :return: generator of rows
+        """
+        self.writer.flush()
+        filters = []
+        params = []
+        if app:
+            filters.append("app = ?")
+            params.append(app)
+        if levels:
+            filters.append(f"level IN ({', '.join('?' * len(levels))})")
+            params.extend(levels)
+        if start:
+            filters.append("timestamp >= ?")
+            params.append(self.to_epoch(start))
+        if end:
+            filters.append("timestamp < ?")
+            params.append(self.to_epoch(end))
+        sql_ = "SELECT * FROM Logs"
+        if filters:
+            sql_ += " WHERE " + " AND ".join(filters)
+        order = "DESC" if newest_first else "ASC"
+        sql_ += f" ORDER BY timestamp {order}, id {order}"
+        cursor = self.conn.cursor()
+        try:
+            with self._lock:
+                cursor.execute(sql_, params)
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(page_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
+
+    def _delete_logs_before(self, cutoff: datetime):
+        with self._lock:
+            self.execute(
+                "DELETE FROM Logs WHERE timestamp < ?",
+                (self.to_epoch(cutoff),),
+            )
+            self.commit()
 
     def delete_logs(self, days):
-        now = datetime.now()
-        delta = timedelta(days=days)
-        cutoff = (now - delta).strftime(self.TIMESTAMP_FORMAT)
-        self.execute("DELETE FROM Logs WHERE timestamp < ?", (cutoff,))
-        self.commit()
+        self.writer.flush()
+        self._delete_logs_before(datetime.now() - timedelta(days=days))
+
+    def prune(self):
+        """
+        delete the logs older than RETENTION_DAYS (called by the writer)
+        """
+        if self.RETENTION_DAYS is None:
+            return
+        self._delete_logs_before(
+            datetime.now() - timedelta(days=self.RETENTION_DAYS)
+        )
+
+    def close(self):
+        """
+        write the pending logs and close the database
+        """
+        if self.writer.is_alive():
+            self.writer.close()
+        atexit.unregister(self.close)
+        super().close()
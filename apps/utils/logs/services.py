@@ -1,5 +1,5 @@
 # Standard Library
-import inspect
+import sys
 from datetime import datetime
 from typing import Optional
 
@@ -8,15 +8,41 @@ from apps.globals import GlobalVars
 from apps.utils.logs.logs_db_handler import LogsDBHandler
 
 
+def get_caller_path(
+    stacklevel: int = 1, with_filename: Optional[bool] = False
+) -> str:
+    """
+    path of the caller of the function that calls get_caller_path
+    (only reads the frame, inspect.stack() reads the source of every frame)
+    :param stacklevel: 1 for the caller, 2 for the caller of the caller...
+    :param with_filename: add the filename to the path
+    :return: [filename::]function::lineno
+    """
+    frame = sys._getframe(stacklevel + 1)
+    code = frame.f_code
+    path = f"{code.co_name}::{frame.f_lineno}"
+    if with_filename:
+        path = f"{code.co_filename}::{path}"
+    return path
+
+
 def save_game_log(
-    *, message: str, level: str, timestamp: Optional[datetime] = None
+    *,
+    message: str,
+    level: str,
+    timestamp: Optional[datetime] = None,
+    stacklevel: int = 1,
 ) -> None:
+    """
+    :param stacklevel: frame saved as path, 1 for the caller of this function
+    """
     if GlobalVars.config.IGNORE_DB_LOGS:
         return
     log_handler = LogsDBHandler()
     timestamp = timestamp or datetime.now()
-    caller_frame = inspect.stack()[1]
-    path = f"{caller_frame.function}::{caller_frame.lineno}"
+    path = None
+    if GlobalVars.config.LOG_CALLER_PATH:
+        path = get_caller_path(stacklevel)
     log_handler.insert_log(
         message=message,
         level=level,
@@ -27,18 +53,22 @@ def save_game_log(
 
 
 def save_gui_log(
-    *, message: str, level: str, timestamp: Optional[datetime] = None
+    *,
+    message: str,
+    level: str,
+    timestamp: Optional[datetime] = None,
+    stacklevel: int = 1,
 ) -> None:
+    """
+    :param stacklevel: frame saved as path, 1 for the caller of this function
+    """
     if GlobalVars.config.IGNORE_DB_LOGS:
         return
     log_handler = LogsDBHandler()
     timestamp = timestamp or datetime.now()
-    caller_frame = inspect.stack()[1]
-    path = (
-        f"{caller_frame.filename}::"
-        f"{caller_frame.function}::"
-        f"{caller_frame.lineno}"
-    )
+    path = None
+    if GlobalVars.config.LOG_CALLER_PATH:
+        path = get_caller_path(stacklevel, with_filename=True)
     log_handler.insert_log(
         message=message, level=level, app="GUI", timestamp=timestamp, path=path
     )
@@ -0,0 +1,97 @@
+"""
+fixed-capacity history of values (multipliers) shared by the game layers
+"""
+
+# Standard Library
+import time
+from typing import Iterable, Iterator, Optional
+
+# Libraries
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Array-backed ring buffer of float values with the timestamp of
+    every value.
+    Every value is written twice (position and position + capacity),
+    so the last n values are always a contiguous slice of the array and
+    they are read as a numpy view (read-only) without copies.
+    NOTE: a view is valid until the next append, to keep the values
+    use view.copy() or to_list()
+    """
+
+    def __init__(
+        self, capacity: int, values: Optional[Iterable[float]] = None
+    ):
+        if capacity <= 0:
+            raise ValueError("the capacity must be greater than 0")
+        self.capacity = capacity
+        self._values = np.zeros(capacity * 2, dtype=np.float64)
+        self._timestamps = np.zeros(capacity * 2, dtype=np.float64)
+        # position of the next value
+        self._position = 0
+        self._size = 0
+        if values is not None:
+            self.extend(values)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values())
+
+    def __reversed__(self) -> Iterator[float]:
+        return iter(self.values()[::-1])
+
+    def __getitem__(self, index: int | slice) -> float | np.ndarray:
+        return self.values()[index]
+
+    def __repr__(self) -> str:
+        return f"RingBuffer({self.capacity}, {self.to_list()})"
+
+    def append(self, value: float, timestamp: Optional[float] = None):
+        if timestamp is None:
+            timestamp = time.time()
+        position = self._position
+        self._values[position] = value
+        self._values[position + self.capacity] = value
+        self._timestamps[position] = timestamp
+        self._timestamps[position + self.capacity] = timestamp
+        self._position = (position + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, values: Iterable[float]):
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        self._position = 0
+        self._size = 0
+
+    def _view(self, array: np.ndarray, n: Optional[int]) -> np.ndarray:
+        size = self._size if n is None else max(0, min(n, self._size))
+        end = self._position + self.capacity
+        view = array[end - size : end]  # noqa
+        view.flags.writeable = False
+        return view
+
+    def values(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Last n values (oldest first)
+        :param n: number of values, default all
+        :return: read-only view
+        """
+        return self._view(self._values, n)
+
+    def timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Timestamps (time.time()) of the last n values
+        :param n: number of values, default all
+        :return: read-only view
+        """
+        return self._view(self._timestamps, n)
+
+    def to_list(self, n: Optional[int] = None) -> list[float]:
+        return self.values(n).tolist()
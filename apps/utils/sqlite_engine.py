@@ -6,12 +6,14 @@ import sqlite3
 class SQLiteEngine:
     TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-    def __init__(self, database):
+    def __init__(self, database, check_same_thread=True):
         # validate dir path
         directory = os.path.dirname(database)
         if not os.path.exists(directory):
             os.makedirs(directory)
-        self.conn = sqlite3.connect(database)
+        self.conn = sqlite3.connect(
+            database, check_same_thread=check_same_thread
+        )
         self.cursor = self.conn.cursor()
 
     def execute(self, query, params=None):
@@ -0,0 +1,106 @@
+"""
+benchmark of BotConditionHelper.evaluate_conditions with many conditions
+usage: python -m benchmarks.bench_bot_conditions
+"""
+
+# Standard Library
+import random
+import timeit
+
+# Internal
+from apps.api.models import BotCondition, BotConditionAction
+from apps.game.bots.constants import ConditionAction, ConditionON
+from apps.game.bots.helpers import BotConditionHelper
+
+ROUNDS = 2000
+NUMBER_OF_CONDITIONS = (5, 20, 50, 100)
+
+
+def generate_conditions(
+    count: int, random_: random.Random
+) -> list[BotCondition]:
+    conditions = []
+    for i in range(count):
+        condition_on = random_.choice(ConditionON.to_list())
+        condition_on_value_2 = None
+        match condition_on:
+            case (
+                ConditionON.PROFIT_GREATER_THAN | ConditionON.PROFIT_LESS_THAN
+            ):
+                condition_on_value = round(random_.uniform(-50, 50), 2)
+            case (
+                ConditionON.STREAK_N_MULTIPLIER_LESS_THAN
+                | ConditionON.STREAK_N_MULTIPLIER_GREATER_THAN
+            ):
+                condition_on_value = random_.randint(1, 6)
+                condition_on_value_2 = random_.choice([1.5, 2, 3, 5])
+            case _:
+                condition_on_value = random_.randint(1, 6)
+        actions = [
+            BotConditionAction(
+                condition_action=condition_action,
+                action_value=(
+                    0
+                    if condition_action == ConditionAction.MAKE_BET
+                    else round(random_.uniform(0.1, 3), 2)
+                ),
+            )
+            for condition_action in random_.sample(
+                ConditionAction.to_list(), random_.randint(1, 3)
+            )
+        ]
+        conditions.append(
+            BotCondition(
+                id=i,
+                condition_on=condition_on,
+                condition_on_value=condition_on_value,
+                condition_on_value_2=condition_on_value_2,
+                actions=actions,
+                others={},
+            )
+        )
+    return conditions
+
+
+def run_rounds(
+    conditions: list[BotCondition], rounds: list[tuple[float, bool, float]]
+):
+    helper = BotConditionHelper(
+        bot_conditions=conditions,
+        min_multiplier_to_bet=2,
+        min_multiplier_to_recover_losses=2,
+        multipliers=[],
+    )
+    helper.set_bet_amount(bet_amount=10, user_change=True)
+    for multiplier, result_last_game, profit in rounds:
+        helper.evaluate_conditions(
+            multiplier_result=multiplier,
+            profit=profit,
+            result_last_game=result_last_game,
+        )
+
+
+def main():
+    random_ = random.Random(1)
+    rounds = [
+        (
+            round(max(1.0, 0.97 / (1 - random_.random())), 2),
+            random_.random() < 0.5,
+            round(random_.uniform(-60, 60), 2),
+        )
+        for _ in range(ROUNDS)
+    ]
+    for count in NUMBER_OF_CONDITIONS:
+        conditions = generate_conditions(count, random_)
+        seconds = min(
+            timeit.repeat(
+                lambda: run_rounds(conditions, rounds), number=1, repeat=3
+            )
+        )
+        print(
+            f"{count:>4} conditions: {seconds / ROUNDS * 1e6:>8.2f} us/round"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+benchmark of the bullish game detection (slope of the linear regression)
+- polyfit: convert_multipliers_to_coordinate and
+  calculate_slope_linear_regression over the history of the bot
+  (the previous BotBase.determine_bullish_game)
+- sliding: SlidingLinearRegression (one multiplier per round)
+usage: python -m benchmarks.bench_bullish_trend
+"""
+
+# Standard Library
+import random
+import timeit
+
+# Internal
+from apps.utils import graphs as utils_graphs
+
+ROUNDS = 5000
+LEN_HISTORY = 200
+LEN_WINDOWS = (6, 11, 50)
+
+
+def run_polyfit(multipliers: list[float], len_window: int):
+    history = []
+    for multiplier in multipliers:
+        history.append(multiplier)
+        if len(history) > LEN_HISTORY:
+            history = history[1:]
+        y_coordinates = utils_graphs.convert_multipliers_to_coordinate(history)
+        utils_graphs.calculate_slope_linear_regression(
+            y_coordinates, len_window
+        )
+
+
+def run_sliding(multipliers: list[float], len_window: int):
+    regression = utils_graphs.SlidingLinearRegression(len_window)
+    for multiplier in multipliers:
+        regression.add_multiplier(multiplier)
+        regression.calculate_slope()
+
+
+def main():
+    random_ = random.Random(1)
+    multipliers = [
+        round(max(1.0, 0.97 / (1 - random_.random())), 2)
+        for _ in range(ROUNDS)
+    ]
+    for len_window in LEN_WINDOWS:
+        for name, function in (
+            ("polyfit", run_polyfit),
+            ("sliding", run_sliding),
+        ):
+            seconds = min(
+                timeit.repeat(
+                    lambda: function(multipliers, len_window),
+                    number=1,
+                    repeat=3,
+                )
+            )
+            print(
+                f"window {len_window:>3} {name:>8}: "
+                f"{seconds / ROUNDS * 1e6:>8.2f} us/round"
+            )
+
+
+if __name__ == "__main__":
+    main()
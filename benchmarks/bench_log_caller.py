@@ -0,0 +1,63 @@
+"""
+benchmark of the caller path saved with every log
+(inspect.stack() vs sys._getframe vs disabled)
+usage: python -m benchmarks.bench_log_caller
+"""
+
+# Standard Library
+import inspect
+import timeit
+
+# Internal
+from apps.utils.logs.services import get_caller_path
+
+# inspect.stack() takes ~1.5 ms by log
+DECISIONS = 200
+LOG_LINES_BY_DECISION = (1, 2, 3, 4, 5)
+# frames between the game loop and the log call
+STACK_DEPTH = 15
+
+
+def _inspect_stack_path() -> str:
+    caller_frame = inspect.stack()[1]
+    return f"{caller_frame.function}::{caller_frame.lineno}"
+
+
+def _getframe_path() -> str:
+    return get_caller_path()
+
+
+def _disabled_path() -> None:
+    return None
+
+
+def _decision(capture, log_lines: int, depth: int = STACK_DEPTH):
+    if depth:
+        return _decision(capture, log_lines, depth - 1)
+    for _ in range(log_lines):
+        capture()
+
+
+def main():
+    captures = {
+        "inspect.stack": _inspect_stack_path,
+        "sys._getframe": _getframe_path,
+        "disabled": _disabled_path,
+    }
+    for log_lines in LOG_LINES_BY_DECISION:
+        results = []
+        for name, capture in captures.items():
+            seconds = min(
+                timeit.repeat(
+                    lambda: _decision(capture, log_lines),
+                    number=DECISIONS,
+                    repeat=3,
+                )
+            )
+            per_decision = seconds / DECISIONS * 1e6
+            results.append(f"{name}: {per_decision:>9.2f} us/decision")
+        print(f"{log_lines} logs/decision | " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
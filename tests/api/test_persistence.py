@@ -0,0 +1,249 @@
+# Standard Library
+import time
+from datetime import datetime
+from threading import Event
+
+# Libraries
+import pytest
+
+# Internal
+from apps.api.constants import PersistenceKind
+from apps.api.exceptions import BotAPIBadRequestException
+from apps.api.models import BetData, Multiplier
+from apps.api.persistence import PersistenceJournal, PersistenceWorker
+
+
+class _Backend:
+    def __init__(self):
+        self.available = True
+        # home bets with invalid bets (400)
+        self.rejected_home_bets: set[int] = set()
+        self.bets: list[tuple[int, list[BetData]]] = []
+        self.multipliers: list[tuple[int, list[Multiplier]]] = []
+
+    def create_bets(self, *, home_bet_id: int, bets: list[BetData]):
+        if not self.available:
+            raise ConnectionError("backend unreachable")
+        if home_bet_id in self.rejected_home_bets:
+            raise BotAPIBadRequestException("invalid bets", 400)
+        self.bets.append((home_bet_id, bets))
+
+    def add_multipliers(
+        self, *, home_bet_game_id: int, multipliers_data: list[Multiplier]
+    ):
+        if not self.available:
+            raise ConnectionError("backend unreachable")
+        self.multipliers.append((home_bet_game_id, multipliers_data))
+
+
+def _make_worker(tmp_path, backend: _Backend) -> PersistenceWorker:
+    worker = PersistenceWorker(
+        journal=PersistenceJournal(str(tmp_path / "persistence.db")),
+        create_bets=backend.create_bets,
+        add_multipliers=backend.add_multipliers,
+    )
+    worker.BACKOFF_FACTOR = 0.01
+    return worker
+
+
+def _bet(index: int) -> BetData:
+    return BetData(f"bet-{index}", 2, 2, 1, 2.5)
+
+
+def _multiplier(index: int) -> Multiplier:
+    return Multiplier(
+        multiplier=1 + index, multiplier_dt=datetime(2024, 1, 1, 0, index)
+    )
+
+
+@pytest.fixture
+def backend() -> _Backend:
+    return _Backend()
+
+
+class TestPersistenceWorker:
+    def test_batches(self, tmp_path, backend: _Backend):
+        worker = _make_worker(tmp_path, backend)
+        worker.save_bets(home_bet_id=1, bets=[_bet(0), _bet(1)])
+        worker.save_bets(home_bet_id=1, bets=[_bet(2)])
+        worker.save_multipliers(
+            home_bet_game_id=3, multipliers=[_multiplier(i) for i in range(5)]
+        )
+        worker.start()
+        worker.close()
+        # the records are sent in one call by home bet
+        assert backend.bets == [(1, [_bet(0), _bet(1), _bet(2)])]
+        assert len(backend.multipliers) == 1
+        assert backend.multipliers[0][0] == 3
+        assert len(backend.multipliers[0][1]) == 5
+
+    def test_journal(self, tmp_path, backend: _Backend):
+        backend.available = False
+        worker = _make_worker(tmp_path, backend)
+        worker.start()
+        worker.save_bets(home_bet_id=1, bets=[_bet(0)])
+        worker.save_multipliers(
+            home_bet_game_id=3, multipliers=[_multiplier(1)]
+        )
+        worker.close()
+        assert backend.bets == []
+        journal = PersistenceJournal(str(tmp_path / "persistence.db"))
+        assert journal.count() == 2
+        journal.close()
+        # the journal is sent when the backend is available
+        backend.available = True
+        worker = _make_worker(tmp_path, backend)
+        worker.start()
+        worker.save_bets(home_bet_id=1, bets=[_bet(1)])
+        worker.close()
+        assert [
+            bet.external_id for _, bets in backend.bets for bet in bets
+        ] == [
+            "bet-0",
+            "bet-1",
+        ]
+        assert backend.multipliers == [(3, [_multiplier(1)])]
+        journal = PersistenceJournal(str(tmp_path / "persistence.db"))
+        assert journal.count() == 0
+        journal.close()
+
+    def test_retries(self, tmp_path, backend: _Backend):
+        calls = []
+
+        def create_bets(**kwargs):
+            calls.append(kwargs)
+            if len(calls) < 3:
+                raise ConnectionError("timeout")
+
+        worker = PersistenceWorker(
+            journal=PersistenceJournal(str(tmp_path / "persistence.db")),
+            create_bets=create_bets,
+            add_multipliers=backend.add_multipliers,
+        )
+        worker.BACKOFF_FACTOR = 0.01
+        worker.FLUSH_INTERVAL = 0
+        worker.start()
+        worker.save_bets(home_bet_id=1, bets=[_bet(0)])
+        while len(calls) < 3:
+            worker.join(0.01)
+        worker.close()
+        assert len(calls) == 3
+
+    def test_full_queue(self, tmp_path, backend: _Backend):
+        worker = _make_worker(tmp_path, backend)
+        worker._queue.maxsize = 2
+        # the worker is not started, the queue is not consumed
+        worker.save_bets(home_bet_id=1, bets=[_bet(i) for i in range(5)])
+        assert worker._queue.qsize() == 2
+        assert worker.journal.count() == 3
+        worker.start()
+        worker.close()
+        assert sorted(
+            bet.external_id for _, bets in backend.bets for bet in bets
+        ) == [f"bet-{i}" for i in range(5)]
+
+    def test_rejected_records_in_the_journal(
+        self, tmp_path, backend: _Backend
+    ):
+        backend.rejected_home_bets = {1}
+        journal = PersistenceJournal(str(tmp_path / "persistence.db"))
+        # the rejected group is the oldest
+        journal.add([(PersistenceKind.BETS, 1, _bet(0))])
+        journal.add([(PersistenceKind.BETS, 2, _bet(1))])
+        journal.add([(PersistenceKind.MULTIPLIERS, 3, _multiplier(1))])
+        journal.close()
+        worker = _make_worker(tmp_path, backend)
+        worker.start()
+        worker.close()
+        assert backend.bets == [(2, [_bet(1)])]
+        assert backend.multipliers == [(3, [_multiplier(1)])]
+        journal = PersistenceJournal(str(tmp_path / "persistence.db"))
+        assert journal.count() == 0
+        assert journal.count("Quarantine") == 1
+        journal.close()
+
+    def test_rejected_records(self, tmp_path, backend: _Backend):
+        backend.rejected_home_bets = {1}
+        worker = _make_worker(tmp_path, backend)
+        worker.save_bets(home_bet_id=1, bets=[_bet(0), _bet(1)])
+        worker.save_bets(home_bet_id=2, bets=[_bet(2)])
+        worker.start()
+        worker.close()
+        # the rejected bets are not retried or saved in the journal
+        assert backend.bets == [(2, [_bet(2)])]
+        journal = PersistenceJournal(str(tmp_path / "persistence.db"))
+        assert journal.count() == 0
+        assert journal.count("Quarantine") == 2
+        journal.close()
+
+    def test_close_with_full_queue(self, tmp_path, backend: _Backend):
+        sending = Event()
+        release = Event()
+
+        def create_bets(**kwargs):
+            sending.set()
+            release.wait()
+            backend.create_bets(**kwargs)
+
+        worker = PersistenceWorker(
+            journal=PersistenceJournal(str(tmp_path / "persistence.db")),
+            create_bets=create_bets,
+            add_multipliers=backend.add_multipliers,
+        )
+        worker.FLUSH_INTERVAL = 0
+        worker.STOP_TIMEOUT = 0.01
+        worker._queue.maxsize = 2
+        worker.start()
+        worker.save_bets(home_bet_id=1, bets=[_bet(0)])
+        # the worker is stuck in the send and the queue is full
+        sending.wait()
+        worker.save_bets(home_bet_id=1, bets=[_bet(1), _bet(2)])
+        start = time.monotonic()
+        worker.close(timeout=0.1)
+        assert time.monotonic() - start < 1
+        # the worker stops when the queue is empty
+        release.set()
+        worker.join(5)
+        assert not worker.is_alive()
+        assert sorted(
+            bet.external_id for _, bets in backend.bets for bet in bets
+        ) == [f"bet-{i}" for i in range(3)]
+
+    def test_on_saved(self, tmp_path, backend: _Backend):
+        journal = PersistenceJournal(str(tmp_path / "persistence.db"))
+        # a multiplier of the same home bet game in the journal
+        journal.add([(PersistenceKind.MULTIPLIERS, 3, _multiplier(1))])
+        journal.close()
+        saved = []
+        worker = _make_worker(tmp_path, backend)
+        worker.save_multipliers(
+            home_bet_game_id=3,
+            multipliers=[_multiplier(2), _multiplier(3)],
+            on_saved=lambda: saved.append(list(backend.multipliers)),
+        )
+        worker.start()
+        worker.close()
+        # called once, when the multipliers of the save are in the backend
+        assert saved == [
+            [(3, [_multiplier(1)]), (3, [_multiplier(2), _multiplier(3)])]
+        ]
+
+    def test_on_saved_after_the_journal(self, tmp_path, backend: _Backend):
+        backend.available = False
+        saved = []
+        worker = _make_worker(tmp_path, backend)
+        worker.FLUSH_INTERVAL = 0
+        worker.start()
+        worker.save_multipliers(
+            home_bet_game_id=3,
+            multipliers=[_multiplier(1)],
+            on_saved=lambda: saved.append(list(backend.multipliers)),
+        )
+        while worker.journal.count() == 0:
+            worker.join(0.01)
+        assert saved == []
+        # the journal is sent with the next records
+        backend.available = True
+        worker.save_bets(home_bet_id=1, bets=[_bet(0)])
+        worker.close()
+        assert saved == [[(3, [_multiplier(1)])]]
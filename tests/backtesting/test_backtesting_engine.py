@@ -0,0 +1,105 @@
+# Internal
+from apps.api.models import Bot, BotCondition, BotConditionAction
+from apps.game.backtesting.constants import BacktestLimit
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.bots.constants import ConditionAction, ConditionON
+
+
+def _make_bot(**kwargs) -> Bot:
+    data = dict(
+        id=1,
+        name="backtest",
+        bot_type="aggressive",
+        number_of_min_bets_allowed_in_bank=10,
+        risk_factor=0.1,
+        min_multiplier_to_bet=2.0,
+        min_multiplier_to_recover_losses=2.0,
+        min_probability_to_bet=0.5,
+        min_category_percentage_to_bet=0.5,
+        max_recovery_percentage_on_max_bet=0.5,
+        min_average_model_prediction=0.5,
+        stop_loss_percentage=0.5,
+        take_profit_percentage=1.0,
+        conditions=[],
+        only_bullish_games=False,
+        make_second_bet=False,
+    )
+    data.update(kwargs)
+    return Bot(**data)
+
+
+class TestBacktestEngine:
+    def test_single_bet_balance(self):
+        engine = BacktestEngine(
+            bot=_make_bot(),
+            balance=100,
+            bet_amount=10,
+            minimum_bet=1,
+            maximum_bet=50,
+        )
+        # the first multiplier has no bet, then bet 10 to 2x every round
+        result = engine.run([1.5, 3.0, 1.2, 2.5], history=[1.1, 5.0])
+        assert result.rounds == 4
+        assert result.bets_placed == 3
+        assert result.bets_won == 2
+        # +10 -10 (recovery bet of 10 to 2x) +10
+        assert result.balances == [100, 110, 100, 110]
+        assert result.final_balance == 110
+        assert result.profit == 10
+        assert result.max_drawdown == 10
+        assert result.limit_reached is None
+
+    def test_conditions_make_bet(self):
+        conditions = [
+            BotCondition(
+                id=1,
+                condition_on=ConditionON.EVERY_LOSS,
+                condition_on_value=1,
+                condition_on_value_2=None,
+                actions=[
+                    BotConditionAction(
+                        condition_action=ConditionAction.MAKE_BET,
+                        action_value=0,
+                    ),
+                ],
+                others={},
+            ),
+        ]
+        engine = BacktestEngine(
+            bot=_make_bot(
+                conditions=[condition.dict() for condition in conditions],
+                min_multiplier_to_recover_losses=0,
+            ),
+            balance=100,
+            bet_amount=10,
+            minimum_bet=1,
+            maximum_bet=50,
+        )
+        result = engine.run([3.0, 1.2, 3.0, 3.0])
+        # after the loss the bot doesn't bet again
+        # (the last game is still a loss)
+        assert result.bets_placed == 1
+        assert result.bets_won == 0
+        assert result.final_balance == 90
+
+    def test_stop_loss(self):
+        engine = BacktestEngine(
+            bot=_make_bot(stop_loss_percentage=0.1),
+            balance=100,
+            bet_amount=10,
+            minimum_bet=1,
+            maximum_bet=50,
+        )
+        result = engine.run([1.0] * 20)
+        assert result.limit_reached == BacktestLimit.STOP_LOSS
+        assert result.rounds == result.limit_round
+        assert result.final_balance <= 90
+
+    def test_bot_instances_are_independent(self):
+        kwargs = dict(
+            balance=100, bet_amount=10, minimum_bet=1, maximum_bet=50
+        )
+        multipliers = [1.0, 1.0, 3.0, 1.0, 5.0, 1.0]
+        first = BacktestEngine(bot=_make_bot(), **kwargs).run(multipliers)
+        second = BacktestEngine(bot=_make_bot(), **kwargs).run(multipliers)
+        assert first.balances == second.balances
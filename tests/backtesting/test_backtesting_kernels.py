@@ -0,0 +1,139 @@
+# Standard Library
+import random
+
+# Libraries
+import numpy as np
+import pytest
+
+# Internal
+from apps.game.backtesting import kernels
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.bots.helpers import BotConditionHelper
+from apps.game.models import Bet
+
+
+class TestBacktestingKernels:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        random_ = random.Random(7)
+        # shared histories with the object path
+        self.histories = [
+            [round(1 / (1 - random_.random() * 0.97), 2) for _ in range(300)]
+            for _ in range(4)
+        ]
+        self.balance = 500.0
+
+    def _object_path(
+        self,
+        multipliers: list[float],
+        *,
+        multiplier: float,
+        amount: float,
+        stop_loss: float = 0,
+        take_profit: float = 0,
+    ) -> tuple[list[float], list[float]]:
+        profits = []
+        balances = []
+        balance = self.balance
+        stopped = False
+        for value in multipliers:
+            profit = 0.0
+            if not stopped:
+                bet = Bet(amount, multiplier)
+                profit = bet.evaluate(value)
+                assert profit == round(
+                    BacktestEngine.settle_bets([bet], value), 2
+                )
+            balance += profit
+            profits.append(profit)
+            balances.append(balance)
+            if stop_loss and balance - self.balance <= -stop_loss:
+                stopped = True
+            if take_profit and balance - self.balance >= take_profit:
+                stopped = True
+        return profits, balances
+
+    @pytest.mark.parametrize(
+        "multiplier, amount", [(1.5, 10), (2, 7.5), (2.37, 3)]
+    )
+    def test_single_bet_profits(self, multiplier: float, amount: float):
+        for history in self.histories:
+            expected_profits, expected_balances = self._object_path(
+                history, multiplier=multiplier, amount=amount
+            )
+            profits = kernels.single_bet_profits(
+                np.array(history), multiplier=multiplier, amount=amount
+            )
+            assert profits.tolist() == expected_profits
+            balances = kernels.balance_trajectory(
+                profits, balance=self.balance
+            )
+            assert np.allclose(balances, expected_balances)
+
+    def test_batch_histories(self):
+        profits = kernels.single_bet_profits(
+            np.array(self.histories), multiplier=2, amount=10
+        )
+        assert profits.shape == (len(self.histories), 300)
+        for i, history in enumerate(self.histories):
+            expected_profits, _ = self._object_path(
+                history, multiplier=2, amount=10
+            )
+            assert profits[i].tolist() == expected_profits
+
+    def test_limits(self):
+        multipliers = np.array(self.histories)
+        profits = kernels.single_bet_profits(
+            multipliers, multiplier=3, amount=20
+        )
+        balances = kernels.balance_trajectory(
+            profits, balance=self.balance, stop_loss=100, take_profit=150
+        )
+        stop_loss_rounds, take_profit_rounds = kernels.limit_rounds(
+            balances, balance=self.balance, stop_loss=100, take_profit=150
+        )
+        for i, history in enumerate(self.histories):
+            _, expected_balances = self._object_path(
+                history,
+                multiplier=3,
+                amount=20,
+                stop_loss=100,
+                take_profit=150,
+            )
+            assert np.allclose(balances[i], expected_balances)
+            # only one limit is reached, the balance is frozen after it
+            assert not (stop_loss_rounds[i] and take_profit_rounds[i])
+            limit_round = stop_loss_rounds[i] or take_profit_rounds[i]
+            if limit_round:
+                frozen = balances[i][limit_round - 1 :]  # noqa
+                assert np.all(frozen == balances[i, -1])
+
+    def test_max_drawdown(self):
+        balances = np.array([100, 110, 90, 95, 120, 80.0])
+        assert kernels.max_drawdown(balances, balance=100) == 40
+        assert kernels.max_drawdown(np.array([100, 105.0]), balance=100) == 0
+
+    def test_streak_mask(self):
+        history = self.histories[0]
+        lengths = kernels.multiplier_streak_lengths(
+            np.array(history), multiplier=2, is_less=True
+        )
+        mask = kernels.no_bet_streak_mask(
+            np.array(history), multiplier=2, count=3, is_less=True
+        )
+        helper = BotConditionHelper(
+            bot_conditions=[],
+            min_multiplier_to_bet=2,
+            min_multiplier_to_recover_losses=2,
+            multipliers=[],
+        )
+        for i, value in enumerate(history):
+            # the condition is evaluated before the round
+            in_streak = helper.calculate_multiplier_streak(
+                multiplier=2, count_multipliers=3, is_less=True
+            )
+            assert mask[i] == (not in_streak)
+            helper.add_multiplier(value)
+            assert (lengths[i] >= 3) == helper.calculate_multiplier_streak(
+                multiplier=2, count_multipliers=3, is_less=True
+            )
@@ -0,0 +1,86 @@
+# Standard Library
+import random
+
+# Libraries
+import numpy as np
+
+# Internal
+from apps.game.backtesting.constants import SeriesMethod
+from apps.game.backtesting.monte_carlo import (
+    CrashDistribution,
+    MonteCarloSimulator,
+    bootstrap_series,
+)
+from tests.backtesting.test_backtesting_engine import _make_bot
+
+random_ = random.Random(3)
+HISTORY = [
+    round(max(1.0, 0.97 / (1 - random_.random())), 2) for _ in range(500)
+]
+
+
+def _make_simulator(**kwargs) -> MonteCarloSimulator:
+    data = dict(
+        bot=_make_bot(stop_loss_percentage=0.2, take_profit_percentage=0.2),
+        history=HISTORY,
+        simulations=12,
+        rounds=150,
+        batch_size=5,
+        seed=10,
+        max_workers=1,
+        balance=100,
+        bet_amount=5,
+        minimum_bet=1,
+        maximum_bet=50,
+    )
+    data.update(kwargs)
+    return MonteCarloSimulator(**data)
+
+
+class TestMonteCarlo:
+    def test_fit_distribution(self):
+        distribution = CrashDistribution.fit(HISTORY)
+        assert 0.9 < distribution.p_continue <= 1
+        assert 0.8 < distribution.alpha < 1.3
+        rng = np.random.default_rng(1)
+        values = distribution.sample(rng, 1000)
+        assert len(values) == 1000
+        assert values.min() >= 1.0
+
+    def test_bootstrap_series(self):
+        rng = np.random.default_rng(1)
+        values = bootstrap_series(HISTORY, rounds=101, rng=rng, block_size=10)
+        assert len(values) == 101
+        assert set(values.tolist()) <= set(HISTORY)
+        # the blocks keep the consecutive multipliers
+        start = HISTORY.index(values[0])
+        assert values[:10].tolist() == HISTORY[start : start + 10]  # noqa
+
+    def test_progress(self):
+        progress = []
+        report = _make_simulator().run(
+            progress_callback=lambda done, total: progress.append(
+                (done, total)
+            )
+        )
+        assert progress == [(5, 12), (10, 12), (12, 12)]
+        assert report.simulations == 12
+        probability = (
+            report.bankruptcy_probability
+            + report.stop_loss_probability
+            + report.take_profit_probability
+        )
+        assert 0 < probability <= 1
+        assert len(report.stop_loss_rounds) + len(
+            report.take_profit_rounds
+        ) + len(report.bankruptcy_rounds) == round(probability * 12)
+        assert set(report.drawdown_percentiles) == {5, 25, 50, 75, 95}
+
+    def test_parallel(self):
+        for method in SeriesMethod:
+            report = _make_simulator(method=method).run()
+            parallel_report = _make_simulator(
+                method=method, max_workers=2
+            ).run()
+            # the results don't depend on the number of workers
+            assert report == parallel_report
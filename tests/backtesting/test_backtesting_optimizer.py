@@ -0,0 +1,137 @@
+# Standard Library
+import os
+
+# Internal
+from apps.api.models import BotCondition, BotConditionAction
+from apps.custom_bots.handlers import CustomBotsEncryptHandler
+from apps.game.backtesting.optimizer import BotOptimizer, apply_parameters
+from apps.game.bots.constants import ConditionAction, ConditionON
+from tests.backtesting.test_backtesting_engine import _make_bot
+
+MULTIPLIERS = [1.0, 2.5, 1.3, 1.9, 4.0, 1.1, 1.6, 2.2, 10.0, 1.0] * 5
+
+
+def _make_bot_with_conditions():
+    conditions = [
+        BotCondition(
+            id=1,
+            condition_on=ConditionON.EVERY_LOSS,
+            condition_on_value=1,
+            condition_on_value_2=None,
+            actions=[
+                BotConditionAction(
+                    condition_action=ConditionAction.UPDATE_MULTIPLIER,
+                    action_value=2.0,
+                ),
+            ],
+            others={},
+        ),
+    ]
+    return _make_bot(
+        conditions=[condition.dict() for condition in conditions],
+        stop_loss_percentage=1,
+    )
+
+
+class TestBotOptimizer:
+    def test_apply_parameters(self):
+        bot = _make_bot_with_conditions()
+        new_bot = apply_parameters(
+            bot,
+            {
+                "min_multiplier_to_bet": 1.5,
+                "conditions.1.update_multiplier": 3.0,
+            },
+        )
+        assert new_bot.min_multiplier_to_bet == 1.5
+        assert new_bot.conditions[0].actions[0].action_value == 3.0
+        # the original bot is not changed
+        assert bot.min_multiplier_to_bet == 2.0
+        assert bot.conditions[0].actions[0].action_value == 2.0
+
+    def test_apply_invalid_parameters(self):
+        bot = _make_bot_with_conditions()
+        for parameters in (
+            {"invalid_field": 1},
+            {"conditions.2.update_multiplier": 1},
+            {"conditions.1.make_bet": 1},
+        ):
+            try:
+                apply_parameters(bot, parameters)
+            except ValueError:
+                continue
+            raise AssertionError(f"{parameters} must raise ValueError")
+
+    def test_grid_search_ranked(self):
+        kwargs = dict(
+            bot=_make_bot_with_conditions(),
+            multipliers=MULTIPLIERS,
+            balance=100,
+            bet_amount=10,
+            minimum_bet=1,
+            maximum_bet=50,
+        )
+        parameters = {
+            "min_multiplier_to_bet": [1.5, 2.0, 3.0],
+            "conditions.1.update_multiplier": [1.5, 2.0],
+        }
+        results = BotOptimizer(max_workers=1, **kwargs).grid_search(parameters)
+        assert len(results) == 6
+        profits = [item.profit for item in results]
+        assert profits == sorted(profits, reverse=True)
+        # the processes return the same results
+        parallel_results = BotOptimizer(max_workers=2, **kwargs).grid_search(
+            parameters
+        )
+        assert [item.parameters for item in parallel_results] == [
+            item.parameters for item in results
+        ]
+        assert [item.profit for item in parallel_results] == profits
+
+    def test_random_search(self):
+        optimizer = BotOptimizer(
+            bot=_make_bot(),
+            multipliers=MULTIPLIERS,
+            max_workers=1,
+            balance=100,
+            bet_amount=10,
+            minimum_bet=1,
+            maximum_bet=50,
+        )
+        results = optimizer.random_search(
+            {"min_multiplier_to_bet": [1.5, 2.0, 3.0]}, iterations=10, seed=1
+        )
+        # only 3 different combinations
+        assert len(results) == 3
+
+    def test_random_combinations_with_repeated_values(self):
+        combinations = BotOptimizer.generate_random(
+            {"min_multiplier_to_bet": [1.5, 1.5, 2.0], "amount": [1, 1]},
+            iterations=10,
+            seed=1,
+        )
+        # only 2 different combinations, the loop ends
+        assert sorted(
+            (item["min_multiplier_to_bet"], item["amount"])
+            for item in combinations
+        ) == [(1.5, 1), (2.0, 1)]
+
+    def test_export(self, tmp_path):
+        optimizer = BotOptimizer(
+            bot=_make_bot(),
+            multipliers=MULTIPLIERS,
+            max_workers=1,
+            balance=100,
+            bet_amount=10,
+            minimum_bet=1,
+            maximum_bet=50,
+        )
+        results = optimizer.grid_search({"min_multiplier_to_bet": [1.5, 3.0]})
+        bot = optimizer.export(results[0], custom_bots_path=str(tmp_path))
+        assert os.listdir(tmp_path) == [f"{bot.name}.bot"]
+        bot_saved = CustomBotsEncryptHandler(str(tmp_path)).load_all()[0]
+        assert bot_saved.name == "backtest_optimized"
+        assert (
+            bot_saved.min_multiplier_to_bet
+            == results[0].parameters["min_multiplier_to_bet"]
+        )
@@ -0,0 +1,96 @@
+# Internal
+from apps.api.models import BotCondition, BotConditionAction
+from apps.game.bots.constants import ConditionAction, ConditionON
+from apps.game.bots.helpers import BotConditionHelper
+
+
+def _make_condition(
+    id_: int, condition_on: ConditionON, value: float, actions: list
+) -> BotCondition:
+    return BotCondition(
+        id=id_,
+        condition_on=condition_on,
+        condition_on_value=value,
+        condition_on_value_2=None,
+        actions=[
+            BotConditionAction(condition_action=action, action_value=value_)
+            for action, value_ in actions
+        ],
+        others={},
+    )
+
+
+class TestBotConditionPlan:
+    def _make_helper(self) -> BotConditionHelper:
+        conditions = [
+            _make_condition(
+                1,
+                ConditionON.EVERY_LOSS,
+                1,
+                [
+                    (ConditionAction.UPDATE_MULTIPLIER, 2.5),
+                    (ConditionAction.INCREASE_BET_AMOUNT, 0.5),
+                ],
+            ),
+            _make_condition(
+                2,
+                ConditionON.STREAK_LOSSES,
+                3,
+                [(ConditionAction.UPDATE_MULTIPLIER, 3)],
+            ),
+            _make_condition(
+                3,
+                ConditionON.STREAK_LOSSES,
+                5,
+                [(ConditionAction.INCREASE_BET_AMOUNT, 1)],
+            ),
+            _make_condition(
+                4,
+                ConditionON.PROFIT_LESS_THAN,
+                -10,
+                [(ConditionAction.IGNORE_MODEL, 1)],
+            ),
+            _make_condition(
+                5,
+                ConditionON.PROFIT_GREATER_THAN,
+                20,
+                [(ConditionAction.FORGET_LOSSES, 1)],
+            ),
+        ]
+        return BotConditionHelper(
+            bot_conditions=conditions,
+            min_multiplier_to_bet=2,
+            min_multiplier_to_recover_losses=2,
+            multipliers=[],
+        )
+
+    def test_plan(self):
+        helper = self._make_helper()
+        streak_losses = helper._plan[ConditionON.STREAK_LOSSES]
+        assert [item.condition.id for item in streak_losses] == [2, 3]
+        assert [item.streak_count for item in streak_losses] == [3, 5]
+        assert helper._plan[ConditionON.EVERY_WIN] == []
+
+    def test_fired_conditions(self):
+        helper = self._make_helper()
+        helper.last_games = [False] * 4
+        helper.profit = -20
+        conditions = helper._check_conditions()
+        # sorted by priority, the every loss condition loses the action
+        # of the streak condition
+        assert [condition.id for condition in conditions] == [2, 1, 4]
+        assert [
+            action.condition_action for action in conditions[1].actions
+        ] == [ConditionAction.INCREASE_BET_AMOUNT]
+        # the original condition is not changed
+        every_loss = helper._plan[ConditionON.EVERY_LOSS][0].condition
+        assert len(every_loss.actions) == 2
+
+        helper.last_games = [False] * 5
+        helper.profit = 30
+        conditions = helper._check_conditions()
+        # the streak of 5 replaces the streak of 3
+        assert [condition.id for condition in conditions] == [3, 1, 5]
+        assert [
+            action.condition_action for action in conditions[1].actions
+        ] == [ConditionAction.UPDATE_MULTIPLIER]
@@ -0,0 +1,100 @@
+# Standard Library
+import random
+
+# Internal
+from apps.api.models import BotCondition, BotConditionAction
+from apps.game.bots.constants import ConditionAction, ConditionON
+from apps.game.bots.helpers import BotConditionHelper
+
+
+def _make_helper(multipliers: list[float]) -> BotConditionHelper:
+    conditions = [
+        BotCondition(
+            id=i,
+            condition_on=condition_on,
+            condition_on_value=3,
+            condition_on_value_2=value_2,
+            actions=[
+                BotConditionAction(
+                    condition_action=ConditionAction.MAKE_BET,
+                    action_value=0,
+                )
+            ],
+            others={},
+        )
+        for i, (condition_on, value_2) in enumerate(
+            [
+                (ConditionON.STREAK_N_MULTIPLIER_LESS_THAN, 2),
+                (ConditionON.STREAK_N_MULTIPLIER_LESS_THAN, 1.5),
+                (ConditionON.STREAK_N_MULTIPLIER_GREATER_THAN, 2),
+            ]
+        )
+    ]
+    return BotConditionHelper(
+        bot_conditions=conditions,
+        min_multiplier_to_bet=2,
+        min_multiplier_to_recover_losses=2,
+        multipliers=multipliers,
+    )
+
+
+def _walk_streak(values: list, is_in_streak) -> int:
+    streak = 0
+    for value in reversed(values):
+        if not is_in_streak(value):
+            break
+        streak += 1
+    return streak
+
+
+class TestBotConditionStreaks:
+    def test_incremental_streaks(self):
+        random_ = random.Random(2)
+        multipliers = [1.2, 1.3, 1.1]
+        helper = _make_helper(multipliers)
+        helper.MAX_HISTORY_LENGTH = 20
+        helper.multipliers = multipliers
+        helper.last_games = []
+        last_games = []
+        for _ in range(300):
+            multiplier = round(random_.choice([1.1, 1.7, 2.5]), 2)
+            last_game = random_.random() < 0.4
+            multipliers.append(multiplier)
+            last_games.append(last_game)
+            helper.add_multiplier(multiplier)
+            helper.add_last_game(last_game)
+            for outcome in (True, False):
+                assert helper.calculate_streak(outcome) == _walk_streak(
+                    last_games, lambda x: x == outcome
+                )
+            for threshold, is_less in ((2, True), (1.5, True), (2, False)):
+                streak = _walk_streak(
+                    multipliers,
+                    lambda x: x < threshold if is_less else x > threshold,
+                )
+                assert helper.calculate_multiplier_streak(
+                    multiplier=threshold,
+                    count_multipliers=streak,
+                    is_less=is_less,
+                )
+                assert not helper.calculate_multiplier_streak(
+                    multiplier=threshold,
+                    count_multipliers=streak + 1,
+                    is_less=is_less,
+                )
+        # the history is bounded
+        assert len(helper.multipliers) == 20
+        assert len(helper.last_games) == 20
+        assert list(helper.multipliers) == multipliers[-20:]
+
+    def test_assign_history(self):
+        helper = _make_helper([2.5, 1.2, 1.1, 1.4])
+        assert helper.calculate_multiplier_streak(
+            multiplier=2, count_multipliers=3, is_less=True
+        )
+        helper.last_games = [True, False, False]
+        assert helper.calculate_streak(False) == 2
+        assert helper.calculate_streak(True) == 0
+        helper.add_last_game(True)
+        assert helper.calculate_streak(True) == 1
+        assert helper.calculate_streak(False) == 0
@@ -0,0 +1,59 @@
+# Internal
+from apps.game.backtesting.bots import ReplayBotStrategy
+from apps.game.backtesting.engine import BacktestEngine
+from apps.gui.gui_events import disable_gui_events
+from apps.utils.ring_buffer import RingBuffer
+from tests.backtesting.test_backtesting_engine import _make_bot
+
+
+def _make_replay_bot(multipliers) -> ReplayBotStrategy:
+    BacktestEngine.install_translation()
+    bot = ReplayBotStrategy(bot_name="backtest", minimum_bet=1, maximum_bet=50)
+    with disable_gui_events():
+        bot.initialize(balance=100, multipliers=multipliers, bot=_make_bot())
+    return bot
+
+
+class TestBotHistory:
+    def test_shared_history(self):
+        history = RingBuffer(500, [1.5, 2.5, 1.2])
+        bot = _make_replay_bot(history)
+        helper = bot.bot_condition_helper
+        # the bot and the helper read the same history
+        assert helper.multipliers is history
+        # the owner adds the multiplier before the bot
+        history.append(3.0)
+        with disable_gui_events():
+            bot.evaluate_bets(3.0)
+            bot.add_multiplier(3.0)
+        assert bot.multipliers.tolist() == [1.5, 2.5, 1.2, 3.0]
+        assert len(history) == 4
+
+    def test_own_history(self):
+        bot = _make_replay_bot([1.5, 2.5])
+        bot.MAX_MULTIPLIERS_IN_MEMORY = 3
+        with disable_gui_events():
+            for multiplier in (1.1, 4.0, 1.3):
+                bot.evaluate_bets(multiplier)
+                bot.add_multiplier(multiplier)
+        assert bot.multipliers.tolist() == [1.1, 4.0, 1.3]
+        assert bot.bot_condition_helper.multipliers.to_list() == [
+            1.5,
+            2.5,
+            1.1,
+            4.0,
+            1.3,
+        ]
+
+    def test_last_positions(self):
+        bot = _make_replay_bot([15.0, 1.2, 2.5])
+        index = bot._last_positions
+        assert index.get_position(10, bot.multipliers) == 3
+        assert index.get_position(20, bot.multipliers) == -1
+        with disable_gui_events():
+            for multiplier in (1.1, 25.0, 1.3):
+                bot.evaluate_bets(multiplier)
+                bot.add_multiplier(multiplier)
+        # the positions are updated without reading the history
+        assert index.get_position(10, []) == 2
+        assert index.get_position(20, []) == 2
@@ -0,0 +1,237 @@
+# Standard Library
+import asyncio
+import time
+
+# Internal
+from apps.api import services as api_services
+from apps.api.persistence import PersistenceJournal, PersistenceWorker
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.games.game_base import GameBase
+from apps.globals import GlobalVars
+from apps.gui.gui_events import disable_gui_events
+from apps.utils.histogram import LatencyHistograms
+from apps.utils.ring_buffer import RingBuffer
+
+
+class _Bot:
+    @staticmethod
+    def get_last_position_of_multipliers():
+        return [], 0
+
+
+class _Game(GameBase):
+    """
+    game without browser and backend, the requests take REQUEST_TIME
+    """
+
+    REQUEST_TIME = 0.05
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+        self.round = 0
+        self.initialized = True
+        self.bot = _Bot()
+        self.bets = []
+        self.events: list[tuple[str, int, float]] = []
+
+    def initialize_bot(self, *, bot_name: str):
+        pass
+
+    def _event(self, name: str):
+        self.events.append((name, self.round, time.perf_counter()))
+
+    async def _request(self, name: str):
+        self._event(f"{name}:start")
+        await asyncio.sleep(self.REQUEST_TIME)
+        self._event(f"{name}:end")
+
+    async def wait_next_game(self):
+        self.round += 1
+        self.initialized = self.round < self.rounds
+
+    async def request_customer_live(self, **kwargs):
+        await self._request("customer_live")
+
+    def request_save_bets(self, bets: list):
+        assert bets == [f"bet-{self.round - 1}"]
+        self._event("save_bets")
+
+    def request_save_multipliers(self) -> bool:
+        self._event("save_multipliers")
+        return True
+
+    def read_multiplier_positions(self):
+        self._event("read_positions")
+
+    async def get_next_bet(self):
+        await self._request("prediction")
+        self.bets = [f"bet-{self.round}"]
+        return self.bets
+
+    async def send_bets_to_aviator(self):
+        self._event("send_bets")
+
+
+class _GamePage:
+    """
+    game page without browser, the balance is read in READ_TIME
+    """
+
+    READ_TIME = 0.05
+
+    def __init__(self):
+        self.multipliers = RingBuffer(10, [1.5, 2.0])
+        self.balance_read_at = None
+        self.bets = None
+
+    async def wait_next_game(self):
+        self.multipliers.append(3.0)
+
+    async def read_balance(self):
+        await asyncio.sleep(self.READ_TIME)
+        self.balance_read_at = time.perf_counter()
+        return 100
+
+    async def bet(self, *, bets: list, use_auto_cash_out: bool):
+        self.bets = bets
+
+
+class _PrefetchGame(_Game):
+    """
+    game with the wait_next_game and send_bets_to_aviator of GameBase
+    """
+
+    wait_next_game = GameBase.wait_next_game
+    send_bets_to_aviator = GameBase.send_bets_to_aviator
+
+    def __init__(self):
+        super().__init__(rounds=1)
+        self.game_page = _GamePage()
+        self.latencies = LatencyHistograms()
+        self.prefetched: list[float] = []
+        self.prefetch_task = None
+        self.bot.update_balance = lambda balance: None
+
+    def add_multiplier(self, multiplier: float):
+        self._event("add_multiplier")
+
+    def prefetch_next_bet(self):
+        self.prefetched = self.game_page.multipliers.to_list()
+        self.prefetch_task = asyncio.create_task(self._request("prediction"))
+
+
+class _SaveGame(_Game):
+    """
+    game with the saves of GameBase, the backend saves the multipliers
+    """
+
+    request_save_bets = GameBase.request_save_bets
+    request_save_multipliers = GameBase.request_save_multipliers
+    MAX_MULTIPLIERS_TO_SAVE = 2
+
+    def __init__(self, *, journal: PersistenceJournal):
+        super().__init__(rounds=1)
+        self.game_page = _GamePage()
+        self.multipliers_to_save = 2
+        self.persistence = PersistenceWorker(
+            journal=journal,
+            create_bets=lambda **kwargs: None,
+            add_multipliers=lambda **kwargs: self._event("add_multipliers"),
+        )
+
+
+class TestGameLoop:
+    def test_round_data_out_of_the_critical_path(self):
+        BacktestEngine.install_translation()
+        game = _Game(rounds=3)
+        game.bets = ["bet-0"]
+        start = time.perf_counter()
+        with disable_gui_events():
+            asyncio.run(game.play())
+        elapsed = time.perf_counter() - start
+        # the requests of every round run concurrently
+        assert elapsed < 3 * 2 * game.REQUEST_TIME
+        for round_ in (1, 2, 3):
+            events = {
+                name: timestamp
+                for name, event_round, timestamp in game.events
+                if event_round == round_
+            }
+            # the bets are sent after the prediction, without waiting
+            # the other requests
+            assert events["send_bets"] >= events["prediction:end"]
+            # the bets and multipliers are only queued and the positions
+            # are read from memory
+            for name in (
+                "save_bets",
+                "save_multipliers",
+                "read_positions",
+            ):
+                assert events[name] < events["prediction:start"]
+            assert events["customer_live:start"] < events["prediction:end"]
+            assert events["send_bets"] <= events["customer_live:end"]
+
+    def test_prefetch_while_the_balance_is_read(self):
+        BacktestEngine.install_translation()
+        game = _PrefetchGame()
+
+        async def wait_next_game():
+            await game.wait_next_game()
+            await game.prefetch_task
+
+        with disable_gui_events():
+            asyncio.run(wait_next_game())
+        # the request uses the new multiplier and it starts before the
+        # balance is read
+        assert game.prefetched == [1.5, 2.0, 3.0]
+        events = {name: timestamp for name, _, timestamp in game.events}
+        assert events["prediction:start"] < game.game_page.balance_read_at
+        assert events["prediction:start"] < events["add_multiplier"]
+        assert game.balance == 100
+
+    def test_crash_to_bet(self):
+        BacktestEngine.install_translation()
+        game = _PrefetchGame()
+        with disable_gui_events():
+            asyncio.run(game.send_bets_to_aviator())
+            # without bets nothing is sent
+            assert "crash_to_bet" not in game.latencies
+            game.bets = ["bet-1"]
+            asyncio.run(game.send_bets_to_aviator())
+        assert game.game_page.bets == ["bet-1"]
+        assert game.latencies["crash_to_bet"].count == 1
+
+    def test_positions_refreshed_after_the_save(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            GlobalVars, "get_allowed_to_save_multipliers", lambda: True
+        )
+        monkeypatch.setattr(GlobalVars, "get_home_bet_game_id", lambda: 3)
+        game = _SaveGame(
+            journal=PersistenceJournal(str(tmp_path / "persistence.db"))
+        )
+        refreshed = []
+
+        def refresh_multiplier_positions(**kwargs):
+            refreshed.append(kwargs)
+            game._event("refresh_positions")
+
+        monkeypatch.setattr(
+            api_services,
+            "refresh_multiplier_positions",
+            refresh_multiplier_positions,
+        )
+        game.persistence.start()
+
+        async def request_round_data():
+            await game.request_round_data([])
+
+        with disable_gui_events():
+            asyncio.run(request_round_data())
+        # the multipliers are only queued (FLUSH_INTERVAL)
+        assert refreshed == []
+        game.persistence.close()
+        assert refreshed == [dict(home_bet_game_id=3)]
+        events = [name for name, *_ in game.events]
+        assert events.index("refresh_positions") > events.index(
+            "add_multipliers"
+        )
@@ -0,0 +1,38 @@
+# Standard Library
+import random
+
+# Libraries
+import pytest
+
+# Internal
+from apps.game import utils as game_utils
+
+THRESHOLDS = [1.5, 2, 10, 50]
+
+
+class TestLastPositionIndex:
+    @pytest.mark.parametrize("max_length", [1, 5, 40])
+    def test_same_position(self, max_length: int):
+        random_ = random.Random(9)
+        multipliers = [2.5, 1.1]
+        index = game_utils.LastPositionIndex(max_length, len(multipliers))
+        for _ in range(300):
+            multiplier = round(random_.choice([1.1, 1.7, 2.5, 12, 60]), 2)
+            multipliers.append(multiplier)
+            index.add_multiplier(multiplier)
+            history = multipliers[-max_length:]
+            for threshold in THRESHOLDS:
+                expected = game_utils.get_last_position_multiplier(
+                    multiplier=threshold, last_multipliers=history
+                )
+                assert index.get_position(threshold, history) == expected
+
+    def test_new_threshold(self):
+        index = game_utils.LastPositionIndex(10, 4)
+        multipliers = [12.0, 1.1, 3.0, 1.2]
+        assert index.get_position(10, multipliers) == 4
+        assert index.get_position(100, multipliers) == -1
+        multipliers.append(150.0)
+        index.add_multiplier(150.0)
+        assert index.get_position(10, multipliers) == 1
+        assert index.get_position(100, multipliers) == 1
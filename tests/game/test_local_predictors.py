@@ -0,0 +1,218 @@
+# Standard Library
+import asyncio
+import time
+
+# Libraries
+import numpy as np
+import pytest
+
+# Internal
+from apps.api.models import Prediction
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.games.game_ai import GameAI
+from apps.game.prediction_core import PredictionModel
+from apps.game.predictors import (
+    FrequencyPredictor,
+    LogisticPredictor,
+    MarkovPredictor,
+)
+from apps.game.predictors.constants import PredictorType
+from apps.game.predictors.predictor_base import LocalPredictor
+from apps.game.predictors.services import (
+    load_local_predictor,
+    train_local_predictor,
+)
+from apps.game.utils import get_multiplier_category
+from apps.gui.gui_events import disable_gui_events
+from apps.utils import csv as utils_csv
+from apps.utils.histogram import LatencyHistograms
+
+
+def _multipliers(count: int, seed: int = 1) -> np.ndarray:
+    random_ = np.random.default_rng(seed)
+    return np.maximum(1, 0.97 / random_.random(count)).round(2)
+
+
+def _alternating(count: int) -> np.ndarray:
+    # category 1, 1, 2, 1, 1, 2...
+    return np.array([1.2, 1.1, 3.5] * (count // 3))
+
+
+@pytest.mark.parametrize("predictor_type", list(PredictorType))
+class TestLocalPredictors:
+    def test_prediction(self, predictor_type):
+        multipliers = _multipliers(2000)
+        predictor = LocalPredictor(configuration=predictor_type.value)
+        assert predictor.TYPE == predictor_type
+        assert predictor.predict(multipliers) is None
+        predictor.fit(multipliers)
+        prediction = predictor.predict(multipliers)
+        assert isinstance(prediction, Prediction)
+        assert prediction.id == predictor.ID < 0
+        assert prediction.prediction_round in (1, 2)
+        assert 0.5 <= prediction.probability <= 1
+        assert prediction.average_predictions == predictor.accuracy
+        # not enough history
+        start = len(multipliers) - predictor.min_history + 1
+        history = multipliers[start:]
+        assert predictor.predict(history) is None
+
+    def test_categories(self, predictor_type):
+        multipliers = _multipliers(500)
+        categories = LocalPredictor.categories(multipliers).tolist()
+        assert categories == [
+            get_multiplier_category(multiplier) for multiplier in multipliers
+        ]
+
+    def test_save_and_load(self, predictor_type, tmp_path):
+        multipliers = _multipliers(1000)
+        predictor = LocalPredictor(configuration=predictor_type.value)
+        predictor.fit(multipliers)
+        file_name = str(tmp_path / "predictor.json")
+        predictor.save(file_name)
+        loaded = LocalPredictor.load(file_name)
+        assert type(loaded) is type(predictor)
+        assert loaded.to_dict() == predictor.to_dict()
+        assert loaded.predict(multipliers) == predictor.predict(multipliers)
+
+    def test_predict_time(self, predictor_type):
+        multipliers = _multipliers(5000)
+        predictor = LocalPredictor(configuration=predictor_type.value)
+        predictor.fit(multipliers)
+        history = multipliers[-100:]
+        rounds = 1000
+        start = time.perf_counter()
+        for _ in range(rounds):
+            predictor.predict(history)
+            predictor.update(history)
+        # less than 1 ms by round
+        assert (time.perf_counter() - start) / rounds < 0.001
+
+
+class TestMarkovPredictor:
+    def test_learn_the_sequence(self):
+        predictor = MarkovPredictor(order=2).fit(_alternating(300))
+        assert predictor.accuracy == 1
+        assert predictor.predict([1.2, 1.1]).prediction_round == 2
+        assert predictor.predict([1.1, 3.5]).prediction_round == 1
+        assert predictor.predict([3.5, 1.2]).prediction_round == 1
+
+    def test_update(self):
+        predictor = MarkovPredictor(order=1).fit([1.1, 3.0, 1.1, 3.0])
+        assert predictor.predict([1.1]).prediction_round == 2
+        # the category 2 follows the category 2 from now
+        history = [3.0, 3.0]
+        for _ in range(10):
+            predictor.update(history)
+        assert predictor.predict([3.0]).prediction_round == 2
+        assert predictor.transitions[1].tolist() == [2, 11]
+
+    def test_accuracy_of_the_held_out_history(self):
+        # the category 2 alternates and then it repeats (held out)
+        history = [1.1, 3.0] * 35 + [3.0] * 30
+        predictor = MarkovPredictor(order=1, smoothing=0).fit(history)
+        # the learned history predicts the held out history badly
+        assert predictor.accuracy < 0.1
+        # all the history is learned after the evaluation (2 -> 2)
+        assert predictor.transitions[1, 1] == 30
+
+    def test_history_without_held_out(self):
+        predictor = MarkovPredictor(order=2).fit([1.1, 3.0, 1.1])
+        assert predictor.trained
+        assert predictor.accuracy == 0
+
+
+class TestFrequencyPredictor:
+    def test_frequency(self):
+        predictor = FrequencyPredictor(window=4, smoothing=0)
+        predictor.fit(_multipliers(100))
+        prediction = predictor.predict([1.1, 2.0, 3.0, 4.0])
+        assert prediction.prediction_round == 2
+        assert prediction.probability == 0.75
+
+
+class TestLogisticPredictor:
+    def test_learn_the_sequence(self):
+        predictor = LogisticPredictor(lags=3).fit(_alternating(300))
+        assert predictor.accuracy == 1
+        assert predictor.predict([1.2, 1.1]) is None
+        assert predictor.predict([3.5, 1.2, 1.1]).prediction_round == 2
+        assert predictor.predict([1.2, 1.1, 3.5]).prediction_round == 1
+
+
+class TestServices:
+    def test_train_local_predictor(self, tmp_path):
+        file_name = str(tmp_path / "history.csv")
+        utils_csv.write_data(
+            file_name=file_name,
+            data=[{"multiplier": value} for value in _multipliers(300)],
+        )
+        output = str(tmp_path / "markov.json")
+        predictor = train_local_predictor(
+            file_name=file_name,
+            predictor_type=PredictorType.MARKOV.value,
+            output=output,
+            order=2,
+        )
+        loaded = LocalPredictor.load(output)
+        assert loaded.order == 2
+        assert loaded.accuracy == predictor.accuracy
+
+    def test_load_local_predictor(self):
+        assert load_local_predictor("") is None
+        assert load_local_predictor("unknown") is None
+
+
+class _Game(GameAI):
+    """
+    GameAI without browser and backend
+    """
+
+    PREDICTION_TIMEOUT = 0.05
+
+    def __init__(self, *, history: np.ndarray):
+        self._prediction_model = PredictionModel()
+        self._local_predictor = MarkovPredictor(order=2)
+        self._history = history
+        self.latencies = LatencyHistograms()
+
+    @property
+    def multipliers(self) -> np.ndarray:
+        return self._history
+
+
+class TestGameAIFallback:
+    @staticmethod
+    def _get_prediction(game: _Game, response) -> any:
+        async def request_predictions():
+            if response is None:
+                # the backend doesn't respond in time
+                await asyncio.sleep(1)
+            return response
+
+        async def request_get_prediction():
+            game._prediction_task = asyncio.create_task(request_predictions())
+            return await game.request_get_prediction()
+
+        with disable_gui_events():
+            return asyncio.run(request_get_prediction())
+
+    def test_local_prediction(self):
+        BacktestEngine.install_translation()
+        # the next multiplier is category 2
+        game = _Game(history=_alternating(30)[:-1])
+        game.update_local_predictor()
+        assert game._local_predictor.trained
+        start = time.perf_counter()
+        prediction = self._get_prediction(game, None)
+        assert time.perf_counter() - start < 0.5
+        assert prediction.id == MarkovPredictor.ID
+        assert prediction.get_prediction_round_value() == 2
+
+    def test_backend_prediction(self):
+        BacktestEngine.install_translation()
+        game = _Game(history=_alternating(30))
+        game.update_local_predictor()
+        response = [Prediction(1, 2.0, 2, 0.8, 0.7, 0.7)]
+        prediction = self._get_prediction(game, response)
+        assert prediction.id == 1
@@ -0,0 +1,153 @@
+# Standard Library
+import random
+
+# Internal
+from apps.api.models import Prediction
+from apps.game.prediction_core import PredictionCore, PredictionModel
+
+
+def _category(multiplier: float) -> float:
+    round_multiplier = round(multiplier, 0)
+    return 2 if round_multiplier >= 2 else round_multiplier
+
+
+def _accuracy(rounds: list[tuple[float, int, float]]) -> dict:
+    """
+    accuracy calculated with all the rounds: (prediction, round, result)
+    """
+    correct = [
+        value_round == _category(result) for _, value_round, result in rounds
+    ]
+    categories = {}
+    for i in (1, 2):
+        rounds_i = [item for item in rounds if item[1] == i]
+        hits = sum(_category(result) == i for _, _, result in rounds_i)
+        if not hits:
+            continue
+        in_live = sum(value <= result for value, _, result in rounds_i)
+        categories[i] = (
+            round(hits / len(rounds_i), 2),
+            round(in_live / len(rounds_i), 2),
+        )
+    return {
+        "average": round(sum(correct) / len(correct), 2),
+        "categories": categories,
+    }
+
+
+def _random_round(random_: random.Random) -> tuple[float, int, float]:
+    value_round = random_.choice([1, 2])
+    value = round(random_.uniform(1, 3), 2)
+    result = round(random_.choice([1.1, 1.4, 1.6, 2.2, 5]), 2)
+    return value, value_round, result
+
+
+class TestPredictionCore:
+    def test_incremental_accuracy(self):
+        random_ = random.Random(5)
+        core = PredictionCore(id=1, average_predictions=0.5)
+        rounds = []
+        for _ in range(600):
+            value, value_round, result = _random_round(random_)
+            rounds.append((value, value_round, result))
+            core.add_prediction(value, value_round, 0.7, 0.5, 0.4)
+            core.add_multiplier_result(result)
+            expected = _accuracy(rounds)
+            assert core.average_predictions_of_model == expected["average"]
+            for i, (hits, in_live) in expected["categories"].items():
+                assert core.category_percentages[i] == hits
+                assert core.category_percentages_values_in_live[i] == in_live
+        assert core.results_count == 600
+        # the lists are bounded
+        assert len(core.prediction_values) == core.MAX_LENGTH
+        assert len(core.multiplier_results) == core.MAX_LENGTH
+
+    def test_sliding_window(self):
+        random_ = random.Random(6)
+        core = PredictionCore(id=1, average_predictions=0.5, window=20)
+        rounds = []
+        for _ in range(200):
+            value, value_round, result = _random_round(random_)
+            rounds.append((value, value_round, result))
+            core.add_prediction(value, value_round, 0.7, 0.5, 0.4)
+            core.add_multiplier_result(result)
+            expected = _accuracy(rounds[-20:])
+            assert core.average_predictions_of_model == expected["average"]
+        assert core.results_count == 200
+
+    def test_result_without_prediction(self):
+        core = PredictionCore(id=1, average_predictions=0.5)
+        core.add_multiplier_result(2.5)
+        assert core.results_count == 0
+        assert core.average_predictions_of_model == 0.5
+
+
+class TestPredictionModel:
+    def test_evaluate_models(self):
+        model = PredictionModel()
+        model.MAX_RESULTS_TO_EVALUATE = 3
+        for _ in range(3):
+            model.add_predictions(
+                [
+                    Prediction(1, 2, 2, 0.6, 0.5, 0.5),
+                    Prediction(2, 1.2, 1, 0.6, 0.5, 0.5),
+                ]
+            )
+            model.add_multiplier_result(2.5)
+            # only one result by prediction
+            model.add_multiplier_result(2.5)
+        assert [p.results_count for p in model.predictions] == [3, 3]
+        assert model.get_best_prediction().id == 1
+        model.evaluate_models(0.5)
+        assert [p.id for p in model.predictions] == [1]
+
+    def test_best_prediction(self):
+        random_ = random.Random(8)
+        model = PredictionModel()
+        for _ in range(100):
+            ids = random_.sample(range(10), random_.randint(1, 6))
+            model.add_predictions(
+                [
+                    Prediction(
+                        id_,
+                        2,
+                        random_.choice([1, 2]),
+                        0.6,
+                        random_.choice([0.3, 0.5, 0.7]),
+                        0.5,
+                    )
+                    for id_ in ids
+                ]
+            )
+            expected = max(
+                model.predictions,
+                key=lambda p: p.average_predictions_of_model,
+            )
+            assert model.get_best_prediction() is expected
+            model.add_multiplier_result(random_.choice([1.2, 2.5]))
+            expected = max(
+                model.predictions,
+                key=lambda p: p.average_predictions_of_model,
+            )
+            assert model.get_best_prediction() is expected
+
+    def test_retention(self):
+        model = PredictionModel(max_missing_responses=1)
+        model.add_predictions([Prediction(1, 2, 2, 0.6, 0.5, 0.5)])
+        model.add_multiplier_result(2.5)
+        core = model.models[1]
+        # the model is kept one response with its history
+        model.add_predictions([Prediction(2, 2, 2, 0.6, 0.4, 0.5)])
+        assert [p.id for p in model.predictions] == [2]
+        assert model.get_best_prediction().id == 2
+        model.add_predictions([Prediction(1, 2, 2, 0.6, 0.5, 0.5)])
+        assert model.models[1] is core
+        assert core.results_count == 1
+        # the model is discarded after two responses
+        model.add_predictions([Prediction(2, 2, 2, 0.6, 0.4, 0.5)])
+        model.add_predictions([Prediction(2, 2, 2, 0.6, 0.4, 0.5)])
+        assert list(model.models) == [2]
+        model = PredictionModel(max_missing_responses=0)
+        model.add_predictions([Prediction(1, 2, 2, 0.6, 0.5, 0.5)])
+        model.add_predictions([Prediction(2, 2, 2, 0.6, 0.4, 0.5)])
+        assert list(model.models) == [2]
@@ -0,0 +1,294 @@
+# Standard Library
+import asyncio
+import time
+
+# Libraries
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Internal
+from apps.game.backtesting.engine import BacktestEngine
+from apps.game.models import Bet
+from apps.gui.gui_events import disable_gui_events
+from apps.scrappers.aviator.aviator_base import AviatorBase
+from apps.scrappers.aviator.bet_control import BetControl
+from apps.scrappers.game_base import Control, ControlState
+
+# seconds of every action in the page
+ACTION_TIME = 0.02
+# actions that use the focus or the mouse of the page
+INPUT_ACTIONS = {"click", "fill", "type"}
+
+
+class _Locator:
+    """
+    element of a control, the actions take ACTION_TIME
+    """
+
+    def __init__(self, name: str, events: list, value: str = "0"):
+        self.name = name
+        self.events = events
+        self.value = value
+        self.accepted = True
+
+    @property
+    def first(self) -> "_Locator":
+        return self
+
+    def locator(self, selector: str) -> "_Locator":
+        # the bet button of the control in the state of bet accepted
+        self.accepted_selector = selector
+        return self
+
+    async def wait_for(self, **kwargs):
+        await self._action("wait_for")
+        if not self.accepted:
+            raise PlaywrightTimeoutError("bet not accepted")
+
+    async def _action(self, action: str):
+        start = time.perf_counter()
+        await asyncio.sleep(ACTION_TIME)
+        self.events.append((action, self.name, start, time.perf_counter()))
+
+    async def is_enabled(self) -> bool:
+        await self._action("is_enabled")
+        return True
+
+    async def input_value(self, **kwargs) -> str:
+        await self._action("input_value")
+        return self.value
+
+    async def fill(self, value: str, **kwargs):
+        await self._action("fill")
+        self.value = value
+
+    async def type(self, text: str, **kwargs):
+        await self._action("type")
+        self.value += text
+
+    async def click(self, **kwargs):
+        await self._action("click")
+
+
+def _game(events: list) -> AviatorBase:
+    controls = BetControl(None)
+    for control in (1, 2):
+        for name in (
+            "bet_control",
+            "amount_input",
+            "auto_cash_out_switcher",
+            "auto_cash_out_multiplier",
+            "bet_button",
+        ):
+            locator = _Locator(f"{name}_{control}", events)
+            setattr(controls, f"_{name}_{control}", locator)
+    game = AviatorBase(url="https://crash.game")
+    game._controls = controls
+    return game
+
+
+async def _max_blocking(coroutine) -> float:
+    """
+    run the coroutine and measure the longest time that the event loop
+    doesn't run other tasks (a task that ticks every millisecond)
+    """
+    gaps = []
+
+    async def tick():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticker = asyncio.create_task(tick())
+    await coroutine
+    ticker.cancel()
+    return max(gaps)
+
+
+class TestBetDispatch:
+    def test_event_loop_is_responsive(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        bets = [Bet(10, 2), Bet(5, 3)]
+        start = time.perf_counter()
+        with disable_gui_events():
+            max_blocking = asyncio.run(
+                _max_blocking(game.bet(bets=bets, use_auto_cash_out=True))
+            )
+        elapsed = time.perf_counter() - start
+        # no blocking sleeps between the controls
+        assert max_blocking < 0.05
+        # the bets of the controls are sent concurrently
+        assert elapsed < len(events) * ACTION_TIME
+        assert game._controls._amount_input_1.value == "10"
+        assert game._controls._amount_input_2.value == "5"
+        assert game._controls._auto_cash_out_multiplier_2.value == "3"
+        clicks = [name for action, name, *_ in events if action == "click"]
+        assert sorted(clicks) == ["bet_button_1", "bet_button_2"]
+
+    def test_input_actions_are_not_mixed(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        bets = [Bet(10, 2), Bet(5, 3)]
+        with disable_gui_events():
+            asyncio.run(game.bet(bets=bets, use_auto_cash_out=True))
+        input_events = sorted(
+            (start, end, action, name)
+            for action, name, start, end in events
+            if action in INPUT_ACTIONS
+        )
+        # one input action at a time
+        for previous, event in zip(input_events, input_events[1:]):
+            assert event[0] >= previous[1]
+        # the input is typed after it is cleared (fill)
+        for previous, event in zip(input_events, input_events[1:]):
+            if previous[2] == "fill":
+                assert event[2:] == ("type", previous[3])
+
+    def test_latencies(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        game.multipliers.append(2.5)
+        # the bet of the control 2 is not accepted
+        game._controls._bet_control_2.accepted = False
+        bets = [Bet(10, 2), Bet(5, 3)]
+        with disable_gui_events():
+            asyncio.run(game.bet(bets=bets, use_auto_cash_out=True))
+        latencies = game.bet_latencies
+        for step in ("set_auto_cash_out", "update_amount", "click"):
+            assert latencies[step].count == 2
+            # the lock of the inputs is not waited in the click
+            if step == "click":
+                assert latencies[step].max_ms < ACTION_TIME * 1000 * 2
+        assert latencies["accepted"].count == 1
+        assert latencies["round_end_to_accepted"].count == 1
+        last_latencies = game._controls.last_latencies
+        assert set(last_latencies[Control.Control1]) == {
+            "set_auto_cash_out",
+            "update_amount",
+            "click",
+            "accepted",
+            "round_end_to_accepted",
+        }
+        assert "accepted" not in last_latencies[Control.Control2]
+        assert game._controls._bet_control_1.accepted_selector == (
+            "button.btn-danger.bet"
+        )
+
+    def test_last_latencies_by_bet(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        game.multipliers.append(2.5)
+        # the steps of a bet before any bet
+        assert game._controls.last_latencies == {}
+        bets = [Bet(10, 2), Bet(5, 3)]
+
+        async def bet():
+            await game.bet(bets=bets, use_auto_cash_out=True)
+            # the next bets are not accepted
+            game._controls._bet_control_1.accepted = False
+            game._controls._bet_control_2.accepted = False
+            await game.bet(bets=bets, use_auto_cash_out=True)
+
+        with disable_gui_events():
+            asyncio.run(bet())
+        assert game.bet_latencies["accepted"].count == 2
+        # the steps of the previous bets are not kept
+        for control in Control:
+            assert set(game._controls.last_latencies[control]) == {
+                "set_auto_cash_out",
+                "update_amount",
+                "click",
+            }
+
+
+class TestControlState:
+    @staticmethod
+    def _bet(game: AviatorBase, events: list, *rounds: list[Bet]):
+        """
+        send the rounds of bets, the events are of the last round
+        """
+
+        async def bet():
+            for bets in rounds:
+                events.clear()
+                await game.bet(bets=bets, use_auto_cash_out=True)
+
+        with disable_gui_events():
+            asyncio.run(bet())
+
+    def test_unchanged_inputs_are_skipped(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        bets = [Bet(10, 2), Bet(5, 3)]
+        self._bet(game, events, bets, bets)
+        # the inputs are not read or written in the same bets, only the
+        # bet buttons are used
+        assert sorted((action, name) for action, name, *_ in events) == [
+            ("click", "bet_button_1"),
+            ("click", "bet_button_2"),
+            ("wait_for", "bet_control_1"),
+            ("wait_for", "bet_control_2"),
+        ]
+
+    def test_changed_inputs_without_human_typing(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        game._controls.human_typing = False
+        self._bet(
+            game, events, [Bet(10, 2), Bet(5, 3)], [Bet(20, 2), Bet(5, 3)]
+        )
+        writes = [
+            (action, name)
+            for action, name, *_ in events
+            if action in ("fill", "type")
+        ]
+        # a single fill
+        assert writes == [("fill", "amount_input_1")]
+        # the changed input is not read before it is written
+        assert ("input_value", "amount_input_1") not in [
+            (action, name) for action, name, *_ in events
+        ]
+        assert game._controls._amount_input_1.value == "20"
+
+    def test_reset_state_reads_the_page(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        bets = [Bet(10, 2), Bet(5, 3)]
+
+        async def bet():
+            await game.bet(bets=bets, use_auto_cash_out=True)
+            # the frame was reloaded with the default amount
+            game._controls._amount_input_1.value = "1"
+            game._controls.reset_state()
+            events.clear()
+            await game.bet(bets=bets, use_auto_cash_out=True)
+
+        with disable_gui_events():
+            asyncio.run(bet())
+        reads = [
+            name for action, name, *_ in events if action == "input_value"
+        ]
+        assert len(reads) == 4
+        writes = [name for action, name, *_ in events if action == "type"]
+        assert writes == ["amount_input_1"]
+        assert game._controls._amount_input_1.value == "10"
+
+    def test_bet_not_accepted_resets_the_state(self):
+        BacktestEngine.install_translation()
+        events = []
+        game = _game(events)
+        game._controls._bet_control_2.accepted = False
+        self._bet(game, events, [Bet(10, 2), Bet(5, 3)])
+        assert game._controls.get_state(Control.Control1).amount == 10
+        # the control 2 is read from the page in the next bet
+        assert game._controls.get_state(Control.Control2) == ControlState()
@@ -0,0 +1,135 @@
+# Standard Library
+import asyncio
+
+# Internal
+from apps.scrappers.browser_profile import (
+    DISABLE_ANIMATIONS_SCRIPT,
+    BrowserProfile,
+)
+
+
+class _Request:
+    def __init__(self, resource_type: str, url: str):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class _Route:
+    def __init__(self, resource_type: str, url: str):
+        self.request = _Request(resource_type, url)
+        self.result = None
+
+    async def abort(self):
+        self.result = "abort"
+
+    async def continue_(self):
+        self.result = "continue"
+
+
+class _Context:
+    def __init__(self, pages: list):
+        self.pages = pages
+        self.routes = []
+        self.init_scripts = []
+
+    async def route(self, url: str, handler):
+        self.routes.append((url, handler))
+
+    async def add_init_script(self, script: str):
+        self.init_scripts.append(script)
+
+    async def new_page(self) -> str:
+        self.pages.append("new page")
+        return "new page"
+
+
+class _Browser:
+    def __init__(self):
+        self.context_options = None
+
+    async def new_context(self, **kwargs) -> _Context:
+        self.context_options = kwargs
+        self.context = _Context([])
+        return self.context
+
+
+class _Chromium:
+    def __init__(self):
+        self.launches = []
+
+    async def launch(self, **kwargs) -> _Browser:
+        self.launches.append(("launch", None, kwargs))
+        self.browser = _Browser()
+        return self.browser
+
+    async def launch_persistent_context(
+        self, user_data_dir: str, **kwargs
+    ) -> _Context:
+        self.launches.append(("persistent", user_data_dir, kwargs))
+        return _Context(["blank page"])
+
+
+class _Playwright:
+    def __init__(self):
+        self.chromium = _Chromium()
+
+
+def _route(profile: BrowserProfile, resource_type: str, url: str) -> str:
+    route = _Route(resource_type, url)
+    asyncio.run(profile.route(route))
+    return route.result
+
+
+class TestBrowserProfile:
+    def test_default_profile(self):
+        playwright = _Playwright()
+        browser, context, page = asyncio.run(
+            BrowserProfile().open_page(playwright)
+        )
+        # the window of the browser as before
+        assert playwright.chromium.launches == [
+            ("launch", None, dict(headless=False, args=[]))
+        ]
+        assert browser.context_options == dict(no_viewport=True)
+        assert context.routes == []
+        assert context.init_scripts == []
+        assert page == "new page"
+
+    def test_light_profile(self):
+        profile = BrowserProfile(
+            headless=True,
+            block_resources=["image", "font"],
+            block_domains=["analytics.com"],
+            disable_gpu=True,
+            disable_animations=True,
+            user_data_dir="data/browser",
+        )
+        playwright = _Playwright()
+        browser, context, page = asyncio.run(profile.open_page(playwright))
+        assert browser is None
+        [(launch, user_data_dir, options)] = playwright.chromium.launches
+        assert (launch, user_data_dir) == ("persistent", "data/browser")
+        assert options["headless"] is True
+        assert options["no_viewport"] is False
+        assert "--disable-gpu" in options["args"]
+        assert options["reduced_motion"] == "reduce"
+        assert context.init_scripts == [DISABLE_ANIMATIONS_SCRIPT]
+        assert context.routes == [("**/*", profile.route)]
+        # the page opened with the persistent context
+        assert page == "blank page"
+
+    def test_blocked_requests(self):
+        profile = BrowserProfile(
+            block_resources=["image", "media"],
+            block_domains=["analytics.com"],
+        )
+        url = "https://game.com/app.js"
+        assert _route(profile, "script", url) == "continue"
+        assert _route(profile, "image", url) == "abort"
+        assert _route(profile, "media", url) == "abort"
+        url = "https://www.analytics.com/collect"
+        assert _route(profile, "xhr", url) == "abort"
+        url = "https://analytics.com/collect"
+        assert _route(profile, "xhr", url) == "abort"
+        url = "https://myanalytics.com/app.js"
+        assert _route(profile, "script", url) == "continue"
@@ -0,0 +1,119 @@
+# Standard Library
+import asyncio
+import time
+
+# Internal
+from apps.game.backtesting.engine import BacktestEngine
+from apps.gui.gui_events import disable_gui_events
+from apps.scrappers.aviator.aviator_base import AviatorBase
+from apps.scrappers.aviator.bet_control import BetControl
+from apps.scrappers.game_base import (
+    HISTORY_OBSERVER_SCRIPT,
+    Control,
+    ControlState,
+)
+from apps.scrappers.to_the_moon.to_the_moon_base import ToTheMoonBase
+
+
+class _Page:
+    def __init__(self):
+        self.bindings = {}
+
+    async def expose_binding(self, name: str, callback):
+        assert name not in self.bindings
+        self.bindings[name] = callback
+
+    def push(self, content: str):
+        # the browser calls the binding (source, *args)
+        for callback in self.bindings.values():
+            callback({"frame": None}, content)
+
+
+class _History:
+    """
+    history element, the observer is installed with evaluate
+    """
+
+    def __init__(self, last_content: str):
+        self.last_content = last_content
+        self.observers = []
+
+    @property
+    def first(self) -> "_History":
+        return self
+
+    async def evaluate(self, script: str, arg: dict) -> str:
+        self.observers.append((script, arg))
+        return self.last_content
+
+
+def _game(game_class=AviatorBase, last_content: str = "2.50x"):
+    game = game_class(url="https://crash.game")
+    game.multipliers.extend([1.5, 2.5])
+    game._page = _Page()
+    game._history_game = _History(last_content)
+    return game
+
+
+def _wait_next_game(game, *pushes):
+    """
+    wait a game for every push (the multiplier is pushed after 10 ms)
+    """
+
+    async def wait_next_games():
+        for push in pushes or [None]:
+            if push:
+                asyncio.get_running_loop().call_later(0.01, push)
+            await game.wait_next_game()
+
+    BacktestEngine.install_translation()
+    with disable_gui_events():
+        asyncio.run(wait_next_games())
+
+
+class TestHistoryObserver:
+    def test_push_multiplier(self):
+        game = _game()
+        pushed_at = []
+
+        def push():
+            pushed_at.append(time.time())
+            game._page.push("3.15x")
+
+        _wait_next_game(game, push, lambda: game._page.push("1.00x"))
+        assert game.multipliers.to_list() == [1.5, 2.5, 3.15, 1.0]
+        # the time when the multiplier was pushed
+        assert game.multipliers.timestamps(2)[0] - pushed_at[0] < 0.005
+        # the observer is installed once
+        assert len(game._history_game.observers) == 1
+        script, arg = game._history_game.observers[0]
+        assert script == HISTORY_OBSERVER_SCRIPT
+        assert arg == {
+            "binding": AviatorBase.HISTORY_BINDING,
+            "selector": ".payout",
+        }
+
+    def test_multiplier_before_the_observer(self):
+        game = _game(ToTheMoonBase, last_content="4.00x")
+        _wait_next_game(game)
+        assert game.multipliers.to_list() == [1.5, 2.5, 4.0]
+        assert game._history_game.observers[0][1]["selector"] == (
+            ".history-item"
+        )
+
+    def test_observe_again(self):
+        game = _game()
+        game.HISTORY_OBSERVER_TIMEOUT = 0.002
+        # the frame is reloaded, the observer is installed again
+        _wait_next_game(game, lambda: game._page.push("5.00x"))
+        assert game.multipliers.to_list() == [1.5, 2.5, 5.0]
+        assert len(game._history_game.observers) >= 2
+
+    def test_observe_again_resets_the_controls(self):
+        game = _game()
+        game.HISTORY_OBSERVER_TIMEOUT = 0.002
+        game._controls = BetControl(None)
+        game._controls.get_state(Control.Control1).amount = 10
+        _wait_next_game(game, lambda: game._page.push("5.00x"))
+        # the inputs are read from the reloaded frame in the next bet
+        assert game._controls.get_state(Control.Control1) == ControlState()
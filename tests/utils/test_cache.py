@@ -0,0 +1,69 @@
+# Standard Library
+import time
+from threading import Event
+
+# Internal
+from apps.utils.cache import TTLCache
+
+
+class _Loader:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.loaded = Event()
+
+    def __call__(self) -> int:
+        self.calls += 1
+        self.loaded.set()
+        if self.fail:
+            raise ConnectionError("backend unreachable")
+        return self.calls
+
+
+def _wait_refresh(cache: TTLCache, loader: _Loader):
+    assert loader.loaded.wait(1)
+    while cache._refreshing:
+        time.sleep(0.001)
+
+
+class TestTTLCache:
+    def test_fresh_value(self):
+        cache = TTLCache(ttl=60)
+        loader = _Loader()
+        assert cache.get("key", loader) == 1
+        assert cache.get("key", loader) == 1
+        assert loader.calls == 1
+
+    def test_stale_while_revalidate(self):
+        cache = TTLCache(ttl=0)
+        loader = _Loader()
+        assert cache.get("key", loader) == 1
+        loader.loaded.clear()
+        # the stale value is returned and it is loaded in background
+        assert cache.get("key", loader) == 1
+        _wait_refresh(cache, loader)
+        assert cache.peek("key") == 2
+        # the last value is kept when the load fails
+        loader.fail = True
+        loader.loaded.clear()
+        assert cache.get("key", loader) == 2
+        _wait_refresh(cache, loader)
+        assert cache.peek("key") == 2
+
+    def test_max_stale(self):
+        cache = TTLCache(ttl=0, max_stale=0)
+        loader = _Loader()
+        assert cache.get("key", loader) == 1
+        time.sleep(0.001)
+        assert cache.get("key", loader) == 2
+
+    def test_peek(self):
+        cache = TTLCache(ttl=60)
+        loader = _Loader()
+        # never waits the loader
+        assert cache.peek("key", loader) is None
+        _wait_refresh(cache, loader)
+        assert cache.peek("key", loader) == 1
+        assert "key" in cache
+        cache.clear()
+        assert cache.peek("key") is None
@@ -0,0 +1,41 @@
+# Standard Library
+import random
+
+# Libraries
+import pytest
+
+# Internal
+from apps.utils import graphs as utils_graphs
+
+
+class TestSlidingLinearRegression:
+    @pytest.mark.parametrize("len_window", [2, 6, -11, 30])
+    def test_same_slope(self, len_window: int):
+        random_ = random.Random(4)
+        multipliers = []
+        regression = utils_graphs.SlidingLinearRegression(len_window)
+        for _ in range(200):
+            multiplier = round(random_.choice([1.2, 1.8, 2.0, 5.3]), 2)
+            multipliers.append(multiplier)
+            regression.add_multiplier(multiplier)
+            y_coordinates = utils_graphs.convert_multipliers_to_coordinate(
+                multipliers
+            )
+            slope, intercept = regression.calculate_slope()
+            expected = utils_graphs.calculate_slope_linear_regression(
+                y_coordinates, len_window
+            )
+            assert slope == pytest.approx(expected[0], abs=1e-9)
+            assert intercept == pytest.approx(expected[1], abs=1e-9)
+            window = regression.y_coordinates
+            assert window == y_coordinates[-len(window) :]  # noqa
+
+    def test_initial_multipliers(self):
+        regression = utils_graphs.SlidingLinearRegression(3, [2.5])
+        assert regression.calculate_slope() == (-1, 0)
+        regression = utils_graphs.SlidingLinearRegression(
+            3, [2.5, 1.1, 3.0, 4.0]
+        )
+        assert regression.y_coordinates == [0, 1, 2]
+        assert regression.last_y == 2
+        assert regression.calculate_slope() == (1, 0)
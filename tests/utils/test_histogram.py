@@ -0,0 +1,41 @@
+# Libraries
+import pytest
+
+# Internal
+from apps.utils.histogram import LatencyHistogram, LatencyHistograms
+
+
+class TestLatencyHistogram:
+    def test_observe(self):
+        histogram = LatencyHistogram((1, 10, 100))
+        for milliseconds in (0.5, 3, 4, 8, 50, 300):
+            histogram.observe(milliseconds / 1000)
+        assert histogram.counts == [1, 3, 1, 1]
+        assert histogram.count == 6
+        assert histogram.min_ms == pytest.approx(0.5)
+        assert histogram.max_ms == pytest.approx(300)
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(80) == 100
+        assert histogram.percentile(100) == pytest.approx(300)
+        data = histogram.to_dict()
+        assert data["buckets"] == {"<=1": 1, "<=10": 3, "<=100": 1, ">100": 1}
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) == 0
+        assert histogram.to_dict()["count"] == 0
+
+
+class TestLatencyHistograms:
+    def test_measure(self):
+        histograms = LatencyHistograms()
+        with histograms.measure("click"):
+            pass
+        with pytest.raises(ValueError):
+            with histograms.measure("click"):
+                raise ValueError()
+        assert histograms["click"].count == 2
+        assert "click" in histograms
+        assert list(histograms) == ["click"]
+        histograms.clear()
+        assert histograms.to_dict() == {}
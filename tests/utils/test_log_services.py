@@ -0,0 +1,24 @@
+# Internal
+from apps.utils.logs.services import get_caller_path
+
+
+def _save_log(stacklevel: int = 1):
+    return get_caller_path(stacklevel, with_filename=True)
+
+
+def _send_log():
+    return _save_log(stacklevel=2)
+
+
+def _caller():
+    return _send_log()
+
+
+class TestCallerPath:
+    def test_stacklevel(self):
+        filename, function, lineno = _save_log().split("::")
+        assert filename == __file__
+        assert function == "test_stacklevel"
+        assert int(lineno) > 0
+        # the caller of the function that sends the log
+        assert _caller().split("::")[1] == "_caller"
@@ -0,0 +1,149 @@
+# Standard Library
+import sqlite3
+from datetime import datetime, timedelta
+
+# Libraries
+import pytest
+
+# Internal
+from apps.utils.logs.logs_db_handler import LogsDBHandler
+from apps.utils.patterns.singleton import Singleton
+
+
+@pytest.fixture
+def handler(tmp_path):
+    Singleton._instances.pop(LogsDBHandler, None)
+    handler = LogsDBHandler(str(tmp_path / "logs.db"))
+    yield handler
+    handler.close()
+    Singleton._instances.pop(LogsDBHandler, None)
+
+
+class TestLogsDBHandler:
+    def test_pragmas(self, handler: LogsDBHandler):
+        conn = handler.conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # NORMAL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_insert_logs(self, handler: LogsDBHandler):
+        timestamp = datetime(2024, 1, 2, 3, 4, 5)
+        handler.insert_logs(
+            logs=[
+                dict(message="a", level="info", app="GAME"),
+                dict(
+                    message={"b": 1},
+                    level="error",
+                    app="GUI",
+                    path="main::1",
+                    timestamp=timestamp,
+                ),
+            ]
+        )
+        logs = handler.get_logs(timestamp="2024-01-02 03:04:05")
+        assert [log[1:] for log in logs] == [
+            ("{'b': 1}", "error", "GUI", "main::1", int(timestamp.timestamp()))
+        ]
+        assert len(handler.get_logs()) == 2
+
+    def test_write_behind(self, handler: LogsDBHandler):
+        handler.writer.batch_size = 7
+        for i in range(50):
+            handler.insert_log(message=str(i), level="info", app="GAME")
+        # get_logs waits for the pending logs
+        logs = handler.get_logs()
+        assert [log[1] for log in logs] == [str(i) for i in range(50)]
+
+    def test_close_writes_pending_logs(self, tmp_path):
+        Singleton._instances.pop(LogsDBHandler, None)
+        path = str(tmp_path / "logs.db")
+        handler = LogsDBHandler(path)
+        handler.writer.flush_interval = 60
+        handler.insert_log(message="last", level="info", app="GAME")
+        handler.close()
+        Singleton._instances.pop(LogsDBHandler, None)
+        handler = LogsDBHandler(path)
+        assert [log[1] for log in handler.get_logs()] == ["last"]
+        handler.close()
+        Singleton._instances.pop(LogsDBHandler, None)
+
+    def test_iter_logs(self, handler: LogsDBHandler):
+        start = datetime(2024, 1, 1)
+        handler.insert_logs(
+            logs=[
+                dict(
+                    message=str(i),
+                    level=["info", "error"][i % 2],
+                    app=["GAME", "GUI"][i % 3 == 0],
+                    timestamp=start + timedelta(minutes=i),
+                )
+                for i in range(100)
+            ]
+        )
+        logs = handler.iter_logs(
+            app="GAME",
+            levels=["error"],
+            start=start + timedelta(minutes=10),
+            end=start + timedelta(minutes=50),
+            page_size=3,
+        )
+        expected = [str(i) for i in range(10, 50) if i % 2 == 1 and i % 3 != 0]
+        assert [log[1] for log in logs] == expected
+        logs = handler.iter_logs(newest_first=True, page_size=7)
+        assert next(logs)[1] == "99"
+        # the pages are read while the writer saves new logs
+        handler.insert_log(message="new", level="info", app="GAME")
+        assert len(list(logs)) == 99
+        plan = handler.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM Logs "
+            "WHERE app = ? AND level = ? AND timestamp >= ?",
+            ("GAME", "info", 0),
+        ).fetchall()
+        assert "idx_logs_app_level_timestamp" in str(plan)
+
+    def test_prune(self, handler: LogsDBHandler):
+        now = datetime.now()
+        handler.insert_logs(
+            logs=[
+                dict(
+                    message=str(days),
+                    level="info",
+                    app="GAME",
+                    timestamp=now - timedelta(days=days, minutes=1),
+                )
+                for days in range(10)
+            ]
+        )
+        handler.prune()
+        assert [log[1] for log in handler.get_logs()] == [
+            str(days) for days in range(handler.RETENTION_DAYS)
+        ]
+
+    def test_migrate_text_timestamps(self, tmp_path):
+        path = str(tmp_path / "logs.db")
+        conn = sqlite3.connect(path)
+        conn.execute("""CREATE TABLE Logs(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message TEXT,
+                level TEXT,
+                app TEXT,
+                path TEXT NULL,
+                timestamp TEXT)""")
+        timestamp = datetime.now().replace(microsecond=0)
+        conn.execute(
+            "INSERT INTO Logs (message, level, app, timestamp) "
+            "VALUES (?, ?, ?, ?)",
+            ("old", "info", "GAME", timestamp.strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        conn.commit()
+        conn.close()
+        Singleton._instances.pop(LogsDBHandler, None)
+        handler = LogsDBHandler(path)
+        try:
+            logs = handler.get_logs(timestamp=timestamp)
+            assert [log[1:] for log in logs] == [
+                ("old", "info", "GAME", None, int(timestamp.timestamp()))
+            ]
+        finally:
+            handler.close()
+            Singleton._instances.pop(LogsDBHandler, None)
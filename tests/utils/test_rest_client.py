@@ -0,0 +1,137 @@
+# Standard Library
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+# Libraries
+import pytest
+
+# Internal
+from apps.utils.http.rest.client import RESTClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: dict, etag: str = None):
+        self.server.client_ports.add(self.client_address[1])
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        if self.path.startswith("/etag"):
+            self.server.etag_calls += 1
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send(200, {"version": 1}, etag='"v1"')
+            return
+        if self.path.startswith("/unavailable"):
+            self.server.unavailable_calls += 1
+            if self.server.unavailable_calls < 3:
+                self._send(503, {"detail": "unavailable"})
+                return
+        self._send(200, {"path": self.path})
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self._send(200, json.loads(self.rfile.read(length)))
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.client_ports = set()
+    server.unavailable_calls = 0
+    server.etag_calls = 0
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _make_client(server, **kwargs) -> RESTClient:
+    host, port = server.server_address
+    return RESTClient(
+        api_url=f"http://{host}:{port}",
+        headers={"Content-Type": "application/json"},
+        backoff_factor=0.01,
+        **kwargs,
+    )
+
+
+class TestRESTClient:
+    def test_keep_alive(self, server):
+        client = _make_client(server)
+        for i in range(5):
+            response = client.get(service=f"api/items/?page={i}")
+            assert response.status == 200
+            assert response.body == {"path": f"/api/items/?page={i}"}
+        response = client.post(service="api/bets/", data={"amount": 1})
+        assert response.body == {"amount": 1}
+        # all the calls use the same connection
+        assert len(server.client_ports) == 1
+        client.close()
+
+    def test_latencies(self, server):
+        client = _make_client(server)
+        for _ in range(3):
+            client.get(service="api/items/?page=1")
+        client.post(service="api/bets/", data={"amount": 1})
+        latencies = client.latencies.to_dict()
+        assert set(latencies) == {"get api/items/", "post api/bets/"}
+        assert latencies["get api/items/"]["count"] == 3
+        assert latencies["post api/bets/"]["count"] == 1
+        client.close()
+
+    def test_retries(self, server):
+        client = _make_client(server)
+        response = client.get(service="unavailable/")
+        assert response.status == 200
+        assert server.unavailable_calls == 3
+        server.unavailable_calls = 0
+        client = _make_client(server, retries=0)
+        response = client.get(service="unavailable/")
+        assert response.status == 503
+
+    def test_session_options(self, server):
+        host, port = server.server_address
+        client = RESTClient(
+            api_url=f"http://{host}:{port}", backoff_factor=0, pool_maxsize=1
+        )
+        adapter = client.session.get_adapter(client.api_url)
+        # an explicit 0 disables the backoff
+        assert adapter.max_retries.backoff_factor == 0
+        assert adapter._pool_maxsize == 1
+        client.close()
+        client = RESTClient(api_url=f"http://{host}:{port}")
+        adapter = client.session.get_adapter(client.api_url)
+        assert adapter.max_retries.backoff_factor == RESTClient.BACKOFF_FACTOR
+        assert adapter._pool_maxsize == RESTClient.POOL_MAXSIZE
+        client.close()
+
+    def test_etag(self, server):
+        client = _make_client(server)
+        first = client.get(service="etag/", use_etag=True)
+        assert first.body == {"version": 1}
+        # 304: the last response is returned
+        assert client.get(service="etag/", use_etag=True) is first
+        assert server.etag_calls == 2
+        # without use_etag the request is not conditional
+        response = client.get(service="etag/")
+        assert response.status == 200
+        client.clear_etags()
+        assert client.get(service="etag/", use_etag=True) is not first
@@ -0,0 +1,45 @@
+# Libraries
+import numpy as np
+import pytest
+
+# Internal
+from apps.utils.ring_buffer import RingBuffer
+
+
+class TestRingBuffer:
+    def test_append(self):
+        buffer = RingBuffer(5, [1.0, 2.0, 3.0])
+        assert len(buffer) == 3
+        assert buffer.to_list() == [1.0, 2.0, 3.0]
+        for value in range(4, 12):
+            buffer.append(float(value))
+        assert len(buffer) == 5
+        assert buffer.to_list() == [7.0, 8.0, 9.0, 10.0, 11.0]
+        assert buffer[-1] == 11.0
+        assert buffer[0] == 7.0
+        assert list(reversed(buffer)) == [11.0, 10.0, 9.0, 8.0, 7.0]
+        assert buffer.to_list(2) == [10.0, 11.0]
+        assert buffer.to_list(10) == buffer.to_list()
+
+    def test_views(self):
+        buffer = RingBuffer(4, [1.0, 2.0, 3.0, 4.0, 5.0])
+        view = buffer.values(3)
+        # the view shares the memory of the buffer
+        assert np.shares_memory(view, buffer.values())
+        assert view.tolist() == [3.0, 4.0, 5.0]
+        with pytest.raises(ValueError):
+            view[0] = 10
+
+    def test_timestamps(self):
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(float(i), timestamp=100.0 + i)
+        assert buffer.timestamps().tolist() == [102.0, 103.0, 104.0]
+        assert buffer.timestamps(1).tolist() == [104.0]
+        buffer.clear()
+        assert len(buffer) == 0
+        assert buffer.to_list() == []
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            RingBuffer(0)